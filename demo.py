@@ -9,6 +9,8 @@ from services.transcription import transcribe_audio, get_audio_duration
 from services.dynamic_skills_analysis import dynamic_skills_analysis
 from frontend_elements import CircularProgress, get_color
 from services.nlp_analysis import analyze_lemmas_and_frequency
+from services.table_cache import table_cache
+from services.user_directory import UserDirectory
 import random
 
 # Load environment variables
@@ -27,17 +29,22 @@ DEMO_SKILLS_TABLE = "grid-65LBjWjbiz"  # Demo Skills table
 DEMO_CONVERSATIONS_TABLE = "grid-orpcEMrGPD"  # Demo Conversation Sessions table
 DEMO_SKILL_SESSIONS_TABLE = "grid-orpcEMrGPD"  # Demo Skill Sessions table
 
-def get_table_rows(doc_id: str, table_id: str):
-    """Get all rows from a Coda table"""
+def fetch_table_rows(doc_id: str, table_id: str):
+    """Download all rows of a Coda table (bypasses the cache)"""
     doc = Document(doc_id, coda=coda)
     table = doc.get_table(table_id)
     rows = table.rows()
     return [row.to_dict() for row in rows]
 
+def get_table_rows(doc_id: str, table_id: str):
+    """Get all rows from a Coda table"""
+    return table_cache.get(doc_id, table_id, fetch_table_rows)
+
+demo_users = UserDirectory(DEMO_DOC_ID, DEMO_USERS_TABLE, fetch_table_rows)
+
 def get_user_data(username: str):
     """Get user data from demo users table"""
-    rows = get_table_rows(DEMO_DOC_ID, DEMO_USERS_TABLE)
-    user_row = next((row for row in rows if row.get('username') == username), None)
+    user_row = demo_users.get(username)
     
     if user_row:
         return {
@@ -372,6 +379,10 @@ def main():
                 tb_str = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
                 st.error("Traceback details:")
                 st.error(tb_str)
+            finally:
+                # The session tables changed (maybe partially), so the cached copies are stale
+                table_cache.invalidate(DEMO_DOC_ID, DEMO_CONVERSATIONS_TABLE)
+                table_cache.invalidate(DEMO_DOC_ID, DEMO_SKILL_SESSIONS_TABLE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
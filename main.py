@@ -1,17 +1,29 @@
 import streamlit as st
 import os
 import datetime
+import io
 import uuid
 from dotenv import load_dotenv
 from codaio import Coda, Document, Table, Cell
 import pandas as pd
 from services.transcription import transcribe_audio, get_audio_duration
+from services.audio_clip import AudioClip
+from services.vad import VAD_ENABLED, detect_speech
+from services.audio_quality import require_audio_quality
+from services.recording_store import RECORDINGS_ENABLED, recording_store
+from services.acoustic_features import extract_acoustic_features
 from services.dynamic_skills_analysis import dynamic_skills_analysis
 from services.phonetic_analysis import phonetic_analysis_skill
 from frontend_elements import CircularProgress, get_color
 from services.nlp_analysis import analyze_lemmas_and_frequency
 from services.learning_plan import analyze_user_progress, format_progress_data
 from services.learning_plan_service import generate_learning_plan_data, format_learning_plan_for_display, generate_90_day_progress_data
+from services.table_cache import table_cache
+from services.user_directory import UserDirectory
+from services.skill_registry import SkillRegistry
+from services.pipeline import Pipeline
+from services.audio_service import LIVE_RECORDING_AVAILABLE, live_recording
+from services.tts_generator import prompt_audio_url
 import ast
 import random
 from typing import List, Dict, Any
@@ -32,23 +44,114 @@ DEMO_SKILLS_TABLE = "grid-65LBjWjbiz"  # Demo Skills table
 DEMO_CONVERSATIONS_TABLE = "grid-orpcEMrGPD"  # Demo Conversation Sessions table
 DEMO_SKILL_SESSIONS_TABLE = "grid-orpcEMrGPD"  # Demo Skill Sessions table
 
-def get_prompts_table_rows(doc_id: str, table_id: str):
+# Central users table mapping each username to their own document and tables
+CENTRAL_DOC_ID = "jPJTMi7bJR"
+CENTRAL_USERS_TABLE = "grid-qqR8f6GhaA"
+
+def fetch_table_rows(doc_id: str, table_id: str):
+    """Download all rows of a Coda table (bypasses the cache)"""
     doc = Document(doc_id, coda=coda)
     table = doc.get_table(table_id)
     rows = table.rows()
     # Each row is a codaio Row object; convert to dict for easier access
     return [row.to_dict() for row in rows]
 
+def get_prompts_table_rows(doc_id: str, table_id: str):
+    return table_cache.get(doc_id, table_id, fetch_table_rows)
+
 def get_table_rows(doc_id: str, table_id: str):
     """Get all rows from a Coda table"""
-    doc = Document(doc_id, coda=coda)
-    table = doc.get_table(table_id)
-    rows = table.rows()
-    return [row.to_dict() for row in rows]
+    return table_cache.get(doc_id, table_id, fetch_table_rows)
+
+# Username lookups for the central and demo users tables
+central_users = UserDirectory(CENTRAL_DOC_ID, CENTRAL_USERS_TABLE, fetch_table_rows)
+demo_users = UserDirectory(DEMO_DOC_ID, DEMO_USERS_TABLE, fetch_table_rows)
+
+# skill_id lookups for every user's skills table
+skill_registry = SkillRegistry(fetch_table_rows)
+
+def build_assessment_pipeline(audio_data, load_skills, question: str, context: str, transcript=None) -> Pipeline:
+    """
+    Wire the post-recording analysis as a stage graph.
+
+    The recording is decoded once into an AudioClip, checked locally (silent,
+    clipped or too-short takes stop here, before any paid API call) and trimmed
+    of the silence around the speech; every audio stage reads the trimmed clip.
+    Whisper, the audio duration, Azure pronunciation and the skills lookup do not
+    depend on each other and start together; the LLM skill evaluation starts as
+    soon as the transcript, duration and skills are all available. A transcript
+    already made while recording (live mode) is used instead of calling Whisper.
+    """
+    audio_bytes = audio_data.getvalue()
+
+    def find_speech(audio, quality):
+        # Leading and trailing silence is neither uploaded, assessed nor counted in the duration
+        return detect_speech(audio).clip if VAD_ENABLED else audio
+
+    def archive_recording(audio, quality):
+        # Kept (once per distinct take) so sessions can be re-scored without re-recording
+        return recording_store.put(audio) if RECORDINGS_ENABLED else None
+
+    live_transcript = transcript
+
+    def transcribe(speech):
+        # Word timings come back with the text, so pause-aware WPM needs no extra pass
+        transcript = live_transcript or transcribe_audio(openai_api_key, speech, word_timestamps=True)
+        if not transcript or not transcript.text:
+            raise ValueError("Failed to transcribe audio")
+        return transcript
+
+    def measure_duration(speech):
+        duration = get_audio_duration(speech)
+        if not duration:
+            raise ValueError("Failed to get audio duration")
+        return duration
+
+    def analyze_skills(transcription, duration, skills):
+        return dynamic_skills_analysis(
+            text=transcription.text,
+            skills=[{'name': skill['skill_name'], 'prompt': skill['skill_ai_prompt']} for skill in skills],
+            audio_duration=duration,
+            question=question,
+            context=context,
+            openai_api_key=openai_api_key
+        )
+
+    return (
+        Pipeline()
+        .add('audio', lambda: AudioClip.load(audio_bytes), label="✅ Recording decoded!")
+        .add('quality', require_audio_quality, inputs=('audio',), label="✅ Recording checked!")
+        .add('speech', find_speech, inputs=('audio', 'quality'), label="✅ Silence trimmed!")
+        .add('transcription', transcribe, inputs=('speech',), label="✅ Transcription complete!")
+        .add('duration', measure_duration, inputs=('speech',), label="✅ Audio duration measured!")
+        .add('pronunciation', phonetic_analysis_skill, inputs=('speech',), label="✅ Pronunciation analyzed!")
+        .add('acoustics', extract_acoustic_features, inputs=('speech',), label="✅ Fluency features measured!")
+        .add('archive', archive_recording, inputs=('audio', 'quality'), label="✅ Recording saved!")
+        .add('skills', load_skills, label="✅ Skills loaded!")
+        .add('skills_analysis', analyze_skills, inputs=('transcription', 'duration', 'skills'), label="✅ Skills evaluated!")
+    )
+
+def pipeline_progress(progress_bar, progress_text, start: int = 0, end: int = 100):
+    """Progress callback mapping completed pipeline stages onto a slice of the progress bar"""
+    def on_stage_done(stage, completed, total):
+        progress_text.text(stage.label or f"✅ {stage.name} done")
+        progress_bar.progress(start + round((end - start) * completed / total))
+    return on_stage_done
+
+def fluency_feedback(wpm, acoustic_features=None) -> str:
+    """WPM feedback, with the pause and phonation measures when they are available"""
+    feedback = f"User spoke at {wpm} words per minute"
+    if acoustic_features:
+        feedback += (
+            f" ({acoustic_features.articulation_rate} syllables/s while speaking, "
+            f"{acoustic_features.pause_count} pauses, longest {acoustic_features.max_pause_seconds}s, "
+            f"sound {round(acoustic_features.phonation_time_ratio * 100)}% of the time)"
+        )
+    return feedback
+
 def get_user_data(username: str):
     """Get user data from demo users table"""
-    rows = get_table_rows(DEMO_DOC_ID, DEMO_USERS_TABLE)
-    user_row = next((row for row in rows if row.get('username') == username), None)
+    user_row = demo_users.get(username)
     
     if user_row:
         return {
@@ -101,12 +204,7 @@ def run_main_app():
         # Show spinner while loading user data
         with st.spinner("Loading user data..."):
             # Fetch the user-specific document and table IDs from the central table
-            central_doc_id = "jPJTMi7bJR"
-            central_table_id = "grid-qqR8f6GhaA"
-            central_rows = get_prompts_table_rows(central_doc_id, central_table_id)
-            
-            # Find the row matching the username
-            user_row = next((row for row in central_rows if row['username'] == username), None)
+            user_row = central_users.get(username)
         
         if user_row:
             doc_id = user_row['user_document_id']
@@ -185,6 +283,9 @@ def run_main_app():
             audio_url = prompt_row['prompt_audio_url_txt']            
             if audio_url and not pd.isna(audio_url):
                 st.audio(audio_url)
+            elif prompt_row.get('prompt_text'):
+                # Synthesized on the fly and streamed, so playback starts on the first chunk
+                st.audio(prompt_audio_url(prompt_row['prompt_text']))
             else:
                 st.warning("No audio available for this prompt")
             
@@ -194,16 +295,25 @@ def run_main_app():
             # Add instructional text
             st.info("💡 **Recording Tips:** Speak normally, as if this was a natural conversation. Don't read from any text or get help from reading materials. Try to listen to the audio only once and respond naturally. Avoid long silences at the beginning and end of your recording, as these are interpreted as drops in fluency.")
             
-            audio_data = st.audio_input(
-                label="Click to record",
-                key=None,
-                help=None,
-                on_change=None,
-                args=None,
-                kwargs=None,
-                disabled=False,
-                label_visibility="visible"
+            # Live mode transcribes while the learner speaks; the recorder below is the fallback
+            live_transcript = None
+            live_mode = LIVE_RECORDING_AVAILABLE and st.toggle(
+                "🗣️ Live transcription", help="See your words and speaking rate while you record"
             )
+            if live_mode:
+                live_transcript, live_clip = live_recording(key="live_recording")
+                audio_data = io.BytesIO(live_clip.wav_bytes()) if live_clip is not None else None
+            else:
+                audio_data = st.audio_input(
+                    label="Click to record",
+                    key=None,
+                    help=None,
+                    on_change=None,
+                    args=None,
+                    kwargs=None,
+                    disabled=False,
+                    label_visibility="visible"
+                )
             
             
         if audio_data is not None:            
@@ -220,113 +330,86 @@ def run_main_app():
                 st.subheader("📝 Original Prompt")
                 st.write(prompt_row['prompt_text'])
                 
-                # Update progress - Starting transcription (10%)
+                # Now fetch the skills and display them
+                skills_id_str = prompt_row['conversation_skills_id']
+                
+                # Create a default comprehension prompt
+                comprehension_prompt = {
+                    'skill_name': 'comprehension',
+                    'skill_ai_prompt': 'evaluate the relevancy of the answer provided given the question was: '
+                }
+                comprehension_prompt['skill_ai_prompt'] += "Question: " + prompt_row['prompt_text'] + ". And context: " + prompt_row['prompt_context']
+
+                # Skill lookup problems are reported after the pipeline, on the script thread
+                missing_skill_ids = []
+                skill_errors = []
+
+                def load_skills():
+                    # Get skills from the Skills table
+                    skills_list = []
+                    if skills_id_str:
+                        # Split the IDs and look them up in the user's skills table
+                        skill_ids = [id_str.strip() for id_str in skills_id_str.split(',') if id_str.strip()]
+                        try:
+                            skill_rows, missing = skill_registry.resolve(doc_id, user_skills_table, skill_ids)
+                            missing_skill_ids.extend(missing)
+                            for skill_data in skill_rows:
+                                skills_list.append({
+                                    'skill_name': skill_data['skill_name'],
+                                    'skill_ai_prompt': skill_data['skill_ai_prompt']
+                                })
+                        except Exception as e:
+                            skill_errors.append(f"Error fetching skills {skills_id_str}: {e}")
+                    # Add the comprehension prompt to the list of skills
+                    skills_list.append(comprehension_prompt)
+                    return skills_list
+
+                # Transcription, pronunciation and the skills lookup run concurrently;
+                # the skills are evaluated as soon as the transcript lands
                 progress_text.text("🎙️ Transcribing your audio...")
                 progress_bar.progress(10)
-                
-                # Transcribe the audio
-                transcription = transcribe_audio(openai_api_key, audio_data)
-                
-                # Get audio duration
-                duration = get_audio_duration(audio_data)  
+                pipeline = build_assessment_pipeline(audio_data, load_skills, prompt_row['prompt_text'], prompt_row['prompt_context'],
+                                                    transcript=live_transcript)
+                pipeline_result = pipeline.run(on_stage_done=pipeline_progress(progress_bar, progress_text, start=10, end=75))
+
+                if 'quality' in pipeline_result.errors:
+                    st.error(str(pipeline_result.errors.get('audio', pipeline_result.errors['quality'])))
+                    return
+                for warning in pipeline_result.values['quality'].warnings:
+                    st.warning(warning)
 
+                transcript = pipeline_result.values.get('transcription')
+                transcription = transcript.text if transcript else None
+                duration = pipeline_result.values.get('duration')
                 if transcription and duration:
-                    # Update progress - Transcription complete (30%)
-                    progress_text.text("✅ Transcription complete! Analyzing your response...")
-                    progress_bar.progress(30)
-                    
                     st.subheader("Transcription")
                     st.text_area("Transcription", transcription, height=200, help="This is the transcribed text from your audio input.")
                 else:
                     st.error("Failed to transcribe or get audio duration")
                     return
 
-                # Update progress - Starting phonetic analysis (35%)
-                progress_text.text("🎤 Analyzing pronunciation...")
-                progress_bar.progress(35)
+                for skill_id in missing_skill_ids:
+                    st.warning(f"Skill ID {skill_id} not found in skills table")
+                for error in skill_errors:
+                    st.error(error)
 
-                # Run phonetic analysis directly with audio bytes
-                phonetic_results = None
-                try:
-                    phonetic_results = phonetic_analysis_skill(audio_data)
-                except Exception as e:
-                    st.warning(f"Phonetic analysis failed: {str(e)}")
+                phonetic_results = pipeline_result.values.get('pronunciation')
+                if 'pronunciation' in pipeline_result.errors:
+                    st.warning(f"Phonetic analysis failed: {str(pipeline_result.errors['pronunciation'])}")
 
-                # Update progress - Phonetic analysis complete (40%)
-                progress_text.text("✅ Pronunciation analyzed! Calculating speaking rate...")
-                progress_bar.progress(40)
-
-                # Update progress - Starting WPM analysis (45%)
-                progress_text.text("📊 Calculating speaking rate and vocabulary...")
-                progress_bar.progress(45)
+                skills_analysis_results = pipeline_result.values.get('skills_analysis', [])
+                if 'skills_analysis' in pipeline_result.errors:
+                    st.error(f"Skill analysis failed: {str(pipeline_result.errors['skills_analysis'])}")
 
                 # Calculate WPM                
-                analysis_results = analyze_lemmas_and_frequency(transcription, duration)
+                progress_text.text("📊 Calculating speaking rate and vocabulary...")
+                analysis_results = analyze_lemmas_and_frequency(transcription, duration, timed_words=transcript.words)
                 wpm = analysis_results['wpm']
                 wpm_score = min(round(wpm), 100)
                 fluency_score = analysis_results['fluency_score']
                 vocabulary_score = analysis_results['vocabulary_score']
                 total_lemmas = analysis_results['total_lemmas']
                 unique_lemmas = analysis_results['unique_lemmas']
-                
-                # Update progress - WPM analysis complete (50%)
-                progress_text.text("✅ Speaking rate calculated! Analyzing skills...")
-                progress_bar.progress(50)
-                
-                # Now fetch the skills and display them
-                skills_id_str = prompt_row['conversation_skills_id']
-                
-                # Create a default comprehension prompt
-                comprehension_prompt = {
-                    'skill_name': 'comprehension',
-                    'skill_ai_prompt': 'evaluate the relevancy of the answer provided given the question was: '
-                }
-                comprehension_prompt['skill_ai_prompt'] += "Question: " + prompt_row['prompt_text'] + ". And context: " + prompt_row['prompt_context']
-
-                # Get skills from the Skills table
-                skills_list = []
-                if skills_id_str:
-                    # Get the skills table
-                    user_doc = Document(doc_id, coda=coda)
-                    skills_table = user_doc.get_table(user_skills_table)
-                    
-                    # Split the IDs and fetch each skill
-                    skill_ids = [id_str.strip() for id_str in skills_id_str.split(',') if id_str.strip()]
-                    
-                    # Fetch each skill from the table
-                    for skill_id in skill_ids:
-                        try:
-                            # Find the row with matching skill_id
-                            skill_row = next((row for row in skills_table.rows() 
-                                           if str(row.to_dict().get('skill_id')) == skill_id), None)
-                            if skill_row:
-                                skill_data = skill_row.to_dict()
-                                skills_list.append({
-                                    'skill_name': skill_data['skill_name'],
-                                    'skill_ai_prompt': skill_data['skill_ai_prompt']
-                                })
-                            else:
-                                st.warning(f"Skill ID {skill_id} not found in skills table")
-                        except Exception as e:
-                            st.error(f"Error fetching skill {skill_id}: {e}")
-
-                # Add the comprehension prompt to the list of skills
-                skills_list.append(comprehension_prompt)
-
-                # Update progress - Skills fetched (60%)
-                progress_text.text("🎯 Evaluating your skills...")
-                progress_bar.progress(60)
-
-                # Analyze the skills
-                if skills_list:
-                    skills_analysis_results = dynamic_skills_analysis(
-                        text=transcription,
-                        skills=[{'name': skill['skill_name'], 'prompt': skill['skill_ai_prompt']} for skill in skills_list],
-                        audio_duration=duration,
-                        question=prompt_row['prompt_text'],
-                        context=prompt_row['prompt_context'],
-                        openai_api_key=openai_api_key
-                    )
 
                 # Add phonetic analysis results if available
                 if phonetic_results:
@@ -358,7 +441,7 @@ def run_main_app():
                 all_scores.append({
                     'name': 'Fluency (WPM)',
                     'score': wpm_score,
-                    'feedback': f"User spoke at {wpm} words per minute",
+                    'feedback': fluency_feedback(wpm, pipeline_result.values.get('acoustics')),
                     'color': get_color(wpm_score)
                 })
                 
@@ -456,6 +539,13 @@ def run_main_app():
                             
                             skill_table.upsert_row([Cell(column=key, value_storage=value) for key, value in skill_row.items()])
                     
+                    archived = pipeline_result.values.get('archive')
+                    if archived:
+                        try:
+                            recording_store.annotate(archived.key, session_id=session_id, username=username, prompt=prompt, date_time=current_time)
+                        except OSError as e:
+                            print(f"Error annotating archived recording: {e}")
+                    
                     st.success(f"Results successfully saved! Session ID: {session_id}")
                     
                     # Update progress - Complete (100%)
@@ -473,6 +563,10 @@ def run_main_app():
                     
                 except Exception as e:
                     st.error(f"Error saving results: {str(e)}")
+                finally:
+                    # The session tables changed (maybe partially), so the cached copies are stale
+                    table_cache.invalidate(doc_id, user_prompt_session_table)
+                    table_cache.invalidate(doc_id, user_skill_session_table)
     
     except Exception as e:
         import traceback
@@ -571,6 +665,9 @@ def run_demo_app():
     audio_url = prompt_row.get('prompt_audio_url_txt', '')
     if audio_url and not pd.isna(audio_url):
         st.audio(audio_url)
+    elif prompt_row.get('prompt_text'):
+        # Synthesized on the fly and streamed, so playback starts on the first chunk
+        st.audio(prompt_audio_url(prompt_row['prompt_text']))
     else:
         st.warning("No audio available for this prompt")
     # Step 3: Record user's voice
@@ -593,46 +690,6 @@ def run_demo_app():
             progress_text = st.empty()
             st.subheader("📝 Original Prompt")
             st.write(prompt_row.get('prompt_text', 'No prompt text available'))
-            progress_text.text("🎙️ Transcribing your audio...")
-            progress_bar.progress(10)
-            transcription = transcribe_audio(openai_api_key, audio_data)
-            duration = get_audio_duration(audio_data)
-            if transcription and duration:
-                progress_text.text("✅ Transcription complete! Analyzing your response...")
-                progress_bar.progress(30)
-                st.subheader("Transcription")
-                st.text_area("Transcription", transcription, height=200, help="This is the transcribed text from your audio input.")
-            else:
-                st.error("Failed to transcribe or get audio duration")
-                return
-
-            # Update progress - Starting phonetic analysis (35%)
-            progress_text.text("🎤 Analyzing pronunciation...")
-            progress_bar.progress(35)
-
-            # Run phonetic analysis directly with audio bytes
-            phonetic_results = None
-            try:
-                phonetic_results = phonetic_analysis_skill(audio_data)
-            except Exception as e:
-                st.warning(f"Phonetic analysis failed: {str(e)}")
-
-            # Update progress - Phonetic analysis complete (40%)
-            progress_text.text("✅ Pronunciation analyzed! Calculating speaking rate...")
-            progress_bar.progress(40)
-
-            progress_text.text("📊 Calculating speaking rate and vocabulary...")
-            progress_bar.progress(45)
-
-            analysis_results = analyze_lemmas_and_frequency(transcription, duration)
-            wpm = analysis_results['wpm']
-            wpm_score = min(round(wpm), 100)
-            fluency_score = analysis_results['fluency_score']
-            vocabulary_score = analysis_results['vocabulary_score']
-            total_lemmas = analysis_results['total_lemmas']
-            unique_lemmas = analysis_results['unique_lemmas']
-            progress_text.text("✅ Speaking rate calculated! Analyzing skills...")
-            progress_bar.progress(50)
             # Prepare skills list for analysis
             skills_list = []
             for skill_row in user_skills:
@@ -693,17 +750,45 @@ Explain briefly why the score was given. Was the student off-topic? Did they mis
             comprehension_prompt['skill_ai_prompt'] += "Question: " + prompt_row.get('prompt_text', '') + ". And context: " + prompt_row.get('prompt_context', '')
             comprehension_prompt['skill_ai_prompt'] += "\n\nProvide feedback in English."
             skills_list.append(comprehension_prompt)
-            progress_text.text("🎯 Evaluating your skills...")
-            progress_bar.progress(60)
-            if skills_list:
-                skills_analysis_results = dynamic_skills_analysis(
-                    text=transcription,
-                    skills=[{'name': skill['skill_name'], 'prompt': skill['skill_ai_prompt']} for skill in skills_list],
-                    audio_duration=duration,
-                    question=prompt_row.get('prompt_text', ''),
-                    context=prompt_row.get('prompt_context', ''),
-                    openai_api_key=openai_api_key
-                )
+
+            # Transcription, pronunciation and skill evaluation share one pipeline
+            progress_text.text("🎙️ Transcribing your audio...")
+            progress_bar.progress(10)
+            pipeline = build_assessment_pipeline(audio_data, lambda: skills_list, prompt_row.get('prompt_text', ''), prompt_row.get('prompt_context', ''))
+            pipeline_result = pipeline.run(on_stage_done=pipeline_progress(progress_bar, progress_text, start=10, end=75))
+
+            if 'quality' in pipeline_result.errors:
+                st.error(str(pipeline_result.errors.get('audio', pipeline_result.errors['quality'])))
+                return
+            for warning in pipeline_result.values['quality'].warnings:
+                st.warning(warning)
+
+            transcript = pipeline_result.values.get('transcription')
+            transcription = transcript.text if transcript else None
+            duration = pipeline_result.values.get('duration')
+            if transcription and duration:
+                st.subheader("Transcription")
+                st.text_area("Transcription", transcription, height=200, help="This is the transcribed text from your audio input.")
+            else:
+                st.error("Failed to transcribe or get audio duration")
+                return
+
+            phonetic_results = pipeline_result.values.get('pronunciation')
+            if 'pronunciation' in pipeline_result.errors:
+                st.warning(f"Phonetic analysis failed: {str(pipeline_result.errors['pronunciation'])}")
+
+            skills_analysis_results = pipeline_result.values.get('skills_analysis', [])
+            if 'skills_analysis' in pipeline_result.errors:
+                st.error(f"Skill analysis failed: {str(pipeline_result.errors['skills_analysis'])}")
+
+            progress_text.text("📊 Calculating speaking rate and vocabulary...")
+            analysis_results = analyze_lemmas_and_frequency(transcription, duration, timed_words=transcript.words)
+            wpm = analysis_results['wpm']
+            wpm_score = min(round(wpm), 100)
+            fluency_score = analysis_results['fluency_score']
+            vocabulary_score = analysis_results['vocabulary_score']
+            total_lemmas = analysis_results['total_lemmas']
+            unique_lemmas = analysis_results['unique_lemmas']
 
             # Add phonetic analysis results if available
             if phonetic_results:
@@ -720,7 +805,7 @@ Explain briefly why the score was given. Was the student off-topic? Did they mis
             all_scores.append({
                 'name': 'Fluency (WPM)',
                 'score': wpm_score,
-                'feedback': f"User spoke at {wpm} words per minute",
+                'feedback': fluency_feedback(wpm, pipeline_result.values.get('acoustics')),
                 'color': get_color(wpm_score)
             })
             for result in skills_analysis_results:
@@ -798,12 +883,7 @@ def run_my_progress_app():
         # Show spinner while loading user data
         with st.spinner("Loading your learning data..."):
             # Fetch the user-specific document and table IDs from the central table
-            central_doc_id = "jPJTMi7bJR"
-            central_table_id = "grid-qqR8f6GhaA"
-            central_rows = get_prompts_table_rows(central_doc_id, central_table_id)
-            
-            # Find the row matching the username
-            user_row = next((row for row in central_rows if row['username'] == username), None)
+            user_row = central_users.get(username)
             
             if not user_row:
                 st.warning("Username not found. Please check your username.")
@@ -815,15 +895,8 @@ def run_my_progress_app():
             user_skill_session_table = user_row['user_skill_session_table']
             
             # Fetch user's session data
-            user_doc = Document(doc_id, coda=coda)
-            
-            # Get prompt sessions
-            prompt_table = user_doc.get_table(user_prompt_session_table)
-            prompt_sessions = [row.to_dict() for row in prompt_table.rows()]
-            
-            # Get skill sessions
-            skill_table = user_doc.get_table(user_skill_session_table)
-            skill_sessions = [row.to_dict() for row in skill_table.rows()]
+            prompt_sessions = get_table_rows(doc_id, user_prompt_session_table)
+            skill_sessions = get_table_rows(doc_id, user_skill_session_table)
 
         # Analyze user progress
         progress_data = analyze_user_progress(skill_sessions, prompt_sessions)
@@ -9,6 +9,9 @@ from services.transcription import transcribe_audio, get_audio_duration
 from services.dynamic_skills_analysis import dynamic_skills_analysis
 from frontend_elements import CircularProgress, get_color
 from services.nlp_analysis import analyze_lemmas_and_frequency
+from services.table_cache import table_cache
+from services.user_directory import UserDirectory
+from services.skill_registry import SkillRegistry
 import ast
 
 # Load environment variables
@@ -18,13 +21,20 @@ load_dotenv()
 coda = Coda(os.getenv("CODA_API_KEY"))
 openai_api_key = os.getenv("OPENAI_API_KEY")
 
-def get_prompts_table_rows(doc_id: str, table_id: str):
+def fetch_table_rows(doc_id: str, table_id: str):
     doc = Document(doc_id, coda=coda)
     table = doc.get_table(table_id)
     rows = table.rows()
     # Each row is a codaio Row object; convert to dict for easier access
     return [row.to_dict() for row in rows]
 
+def get_prompts_table_rows(doc_id: str, table_id: str):
+    return table_cache.get(doc_id, table_id, fetch_table_rows)
+
+# Central users table mapping each username to their own document and tables
+central_users = UserDirectory("jPJTMi7bJR", "grid-qqR8f6GhaA", fetch_table_rows)
+skill_registry = SkillRegistry(fetch_table_rows)
+
 def main():
     st.title("Language Assessment MVP")
     
@@ -33,12 +43,7 @@ def main():
 
     if username:
         # Fetch the user-specific document and table IDs from the central table
-        central_doc_id = "jPJTMi7bJR"
-        central_table_id = "grid-qqR8f6GhaA"
-        central_rows = get_prompts_table_rows(central_doc_id, central_table_id)
-        
-        # Find the row matching the username
-        user_row = next((row for row in central_rows if row['username'] == username), None)
+        user_row = central_users.get(username)
         
         if user_row:
             doc_id = user_row['user_document_id']
@@ -195,10 +200,6 @@ def main():
                 # Get skills from the Skills table
                 skills_list = []
                 if skills_id_str:
-                    # Get the skills table
-                    user_doc = Document(doc_id, coda=coda)
-                    skills_table = user_doc.get_table(user_skills_table)
-                    
                     # Split the IDs and fetch each skill
                     skill_ids = [id_str.strip() for id_str in skills_id_str.split(',') if id_str.strip()]
                     
@@ -209,14 +210,11 @@ def main():
                             st.write("## Debug: Skills Fetch")
                             st.write("Skill IDs from prompt:", skill_ids)
                     
-                    # Fetch each skill from the table
+                    # Fetch each skill from the user's (cached) skills table
                     for skill_id in skill_ids:
                         try:
-                            # Find the row with matching skill_id
-                            skill_row = next((row for row in skills_table.rows() 
-                                           if str(row.to_dict().get('skill_id')) == skill_id), None)
-                            if skill_row:
-                                skill_data = skill_row.to_dict()
+                            skill_data = skill_registry.get(doc_id, user_skills_table, skill_id)
+                            if skill_data:
                                 skills_list.append({
                                     'skill_name': skill_data['skill_name'],
                                     'skill_ai_prompt': skill_data['skill_ai_prompt']
@@ -410,6 +408,10 @@ def main():
                         import traceback
                         st.write("Full traceback:")
                         st.write(traceback.format_exc())
+                finally:
+                    # The session tables changed (maybe partially), so the cached copies are stale
+                    table_cache.invalidate(doc_id, user_prompt_session_table)
+                    table_cache.invalidate(doc_id, user_skill_session_table)
     
     except Exception as e:
         import traceback
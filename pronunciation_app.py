@@ -3,6 +3,7 @@ import os
 import tempfile
 import azure.cognitiveservices.speech as speechsdk
 import json
+from services.speech_pool import get_speech_pool
 
 # Azure Speech Services credentials
 AZURE_SPEECH_KEY = "6Nk0XGWtuEsmRfGzBhJ2CGUseiZ9NKNCY8QIwukSxzZBkRq1a5CcJQQJ99BFAC5RqLJXJ3w3AAAYACOGUOFg"
@@ -50,8 +51,9 @@ def call_azure_speech_api(audio_file_path: str, reference_text: str = "", langua
         speech_key = AZURE_SPEECH_KEY
         service_region = AZURE_SPEECH_REGION
         
-        # 2) Configure speech
-        speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
+        # 2) Configure speech (the config is built once per language and reused across reruns)
+        speech_pool = get_speech_pool(speech_key, service_region)
+        speech_config = speech_pool.speech_config(language)
         audio_config = speechsdk.audio.AudioConfig(filename=audio_file_path)
         
         # DEBUG: Log speech config
@@ -71,29 +73,14 @@ def call_azure_speech_api(audio_file_path: str, reference_text: str = "", langua
         st.write(f"  - Speech recognizer created: {speech_recognizer is not None}")
         st.write(f"  - Language set to: {language}")
         
-        # 4) Set up Pronunciation Assessment
+        # 4) Set up Pronunciation Assessment (reused for the same reference text)
+        # Prosody assessment is enabled for en-US
+        pronunciation_config = speech_pool.assessment_config(reference_text, prosody=language == "en-US")
         if reference_text:
-            # Scripted assessment (with reference text)
-            pronunciation_config = speechsdk.PronunciationAssessmentConfig(
-                reference_text=reference_text,
-                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-                granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-                enable_miscue=True
-            )
             st.write("  - Assessment type: Scripted (with reference text)")
         else:
-            # Unscripted assessment (no reference text)
-            pronunciation_config = speechsdk.PronunciationAssessmentConfig(
-                reference_text="",
-                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-                granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-                enable_miscue=False
-            )
             st.write("  - Assessment type: Unscripted (free speech)")
-        
-        # Enable prosody assessment for en-US
         if language == "en-US":
-            pronunciation_config.enable_prosody_assessment()
             st.write("  - Prosody assessment enabled for en-US")
         
         # DEBUG: Log pronunciation config
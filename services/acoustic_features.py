@@ -0,0 +1,97 @@
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from services.audio_clip import AudioClip
+from services.vad import VAD_FRAME_SECONDS, _runs, frame_features, speech_mask
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the peak picker runs as plain Python over ~50 frames per second
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# Silences inside speech at least this long count as pauses
+PAUSE_MIN_SECONDS = 0.25
+# A syllable nucleus must rise this many dB above the dip since the previous one
+SYLLABLE_MIN_RISE_DB = 2.0
+
+
+@dataclass
+class AcousticFeatures:
+    """Fluency measures taken from the audio alone (no transcript needed)."""
+    duration_seconds: float        # from the first to the last speech frame
+    phonation_seconds: float       # time spent producing sound
+    phonation_time_ratio: float    # phonation_seconds / duration_seconds
+    syllable_count: int            # estimated from energy peaks
+    speech_rate: float             # syllables per second over duration_seconds
+    articulation_rate: float       # syllables per second over phonation_seconds
+    pause_count: int
+    pauses_per_minute: float
+    mean_pause_seconds: float
+    max_pause_seconds: float
+    energy_variance_db: float      # variance of the frame level over speech frames
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@njit(cache=True)
+def _count_syllable_peaks(energy_db, speech, min_rise_db):
+    count = 0
+    valley = np.inf
+    for i in range(1, len(energy_db) - 1):
+        if not speech[i]:
+            valley = np.inf  # a pause ends the current syllable
+            continue
+        valley = min(valley, energy_db[i])
+        if energy_db[i] >= energy_db[i - 1] and energy_db[i] > energy_db[i + 1] and energy_db[i] - valley >= min_rise_db:
+            count += 1
+            valley = energy_db[i]
+    return count
+
+
+def extract_acoustic_features(clip: AudioClip) -> AcousticFeatures:
+    """
+    Compute speech rate, pause and phonation measures from a clip's PCM.
+
+    Syllables are counted as level peaks in voiced frames (after light smoothing)
+    that rise at least SYLLABLE_MIN_RISE_DB above the preceding dip; pauses are
+    non-speech runs of PAUSE_MIN_SECONDS or more between the first and last
+    speech frame.
+    """
+    energy_db, zcr = frame_features(clip.samples, clip.sample_rate)
+    speech = speech_mask(energy_db, zcr)
+    voiced = np.flatnonzero(speech)
+    if len(voiced) == 0:
+        return AcousticFeatures(0.0, 0.0, 0.0, 0, 0.0, 0.0, 0, 0.0, 0.0, 0.0, 0.0)
+
+    # Only look between the first and the last speech frame
+    first, last = voiced[0], voiced[-1] + 1
+    energy_db, speech = energy_db[first:last], speech[first:last]
+    duration = (last - first) * VAD_FRAME_SECONDS
+    phonation = int(np.count_nonzero(speech)) * VAD_FRAME_SECONDS
+
+    silences = _runs(~speech)
+    pause_lengths = (silences[:, 1] - silences[:, 0]) * VAD_FRAME_SECONDS if len(silences) else np.zeros(0)
+    pause_lengths = pause_lengths[pause_lengths >= PAUSE_MIN_SECONDS]
+
+    smoothed = np.convolve(energy_db, np.ones(3) / 3, mode='same')
+    syllables = int(_count_syllable_peaks(smoothed.astype(np.float64), speech, SYLLABLE_MIN_RISE_DB))
+
+    return AcousticFeatures(
+        duration_seconds=round(duration, 2),
+        phonation_seconds=round(phonation, 2),
+        phonation_time_ratio=round(phonation / duration, 3) if duration else 0.0,
+        syllable_count=syllables,
+        speech_rate=round(syllables / duration, 2) if duration else 0.0,
+        articulation_rate=round(syllables / phonation, 2) if phonation else 0.0,
+        pause_count=len(pause_lengths),
+        pauses_per_minute=round(len(pause_lengths) / (duration / 60), 2) if duration else 0.0,
+        mean_pause_seconds=round(float(pause_lengths.mean()), 2) if len(pause_lengths) else 0.0,
+        max_pause_seconds=round(float(pause_lengths.max()), 2) if len(pause_lengths) else 0.0,
+        energy_variance_db=round(float(np.var(energy_db[speech])), 2)
+    )
@@ -3,6 +3,7 @@ import os
 from dotenv import load_dotenv
 import streamlit as st
 import re
+from services.llm_cache import llm_cache
 
 
 # Load environment variables
@@ -39,16 +40,21 @@ def evaluate_score(prompts, transcription):
     print(f"Debug: Final prompts passed to API: {prompts}")
 
     try:
-        # Call the OpenAI chat completion API
-        response = openai.chat.completions.create(
-            model="gpt-4",
-            messages=prompts
-        )
-        
-        print(f"Debug: API response received: {response}")
-        
-        # Extract the content from the response
-        content = response.choices[0].message.content
+        # Identical prompts + transcription are answered from the evaluation cache
+        cache_key = llm_cache.make_key(model="gpt-4", messages=prompts)
+        content = llm_cache.get(cache_key)
+        if content is None:
+            # Call the OpenAI chat completion API
+            response = openai.chat.completions.create(
+                model="gpt-4",
+                messages=prompts
+            )
+            
+            print(f"Debug: API response received: {response}")
+            
+            # Extract the content from the response
+            content = response.choices[0].message.content
+            llm_cache.set(cache_key, content)
         print(f"Debug: Content extracted from API response: {content}")
 
         # Separate the evaluation details and total score
@@ -0,0 +1,121 @@
+import os
+import re
+from typing import Callable, List, Tuple, TypeVar
+
+import numpy as np
+
+from services.audio_clip import AudioClip
+
+# Long recordings are transcribed as chunks of about this length, sent concurrently
+TRANSCRIPTION_CHUNK_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "30"))
+
+# Audio shared by neighbouring chunks so words cut at a boundary are heard whole at least once
+TRANSCRIPTION_CHUNK_OVERLAP_SECONDS = float(os.getenv("TRANSCRIPTION_CHUNK_OVERLAP_SECONDS", "1"))
+
+# How far before each nominal boundary to look for a quiet point to cut at
+SPLIT_SEARCH_SECONDS = 5.0
+ENERGY_FRAME_SECONDS = 0.02
+
+T = TypeVar("T")
+
+
+def frame_energy(samples: np.ndarray, sample_rate: int, frame_seconds: float = ENERGY_FRAME_SECONDS) -> np.ndarray:
+    """RMS energy of consecutive non-overlapping frames (the last partial frame is ignored)."""
+    frame = max(1, int(sample_rate * frame_seconds))
+    count = len(samples) // frame
+    frames = samples[:count * frame].reshape(count, frame).astype(np.float32)
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame)
+
+
+def find_split_points(
+    samples: np.ndarray,
+    sample_rate: int,
+    chunk_seconds: float = TRANSCRIPTION_CHUNK_SECONDS,
+    search_seconds: float = SPLIT_SEARCH_SECONDS
+) -> List[int]:
+    """
+    Pick where to cut a recording into chunks of at most `chunk_seconds`.
+
+    Each cut is moved back to the quietest frame within `search_seconds` of the
+    nominal boundary, so it lands in a pause rather than mid-word when possible.
+
+    Returns:
+        Sample indices of the cuts, in increasing order (empty if no cut is needed).
+    """
+    frame = max(1, int(sample_rate * ENERGY_FRAME_SECONDS))
+    energy = frame_energy(samples, sample_rate)
+    chunk_frames = max(1, int(chunk_seconds / ENERGY_FRAME_SECONDS))
+    search_frames = min(int(search_seconds / ENERGY_FRAME_SECONDS), chunk_frames - 1)
+
+    cuts = []
+    previous = 0
+    while len(energy) - previous > chunk_frames:
+        window_start = previous + chunk_frames - search_frames
+        window = energy[window_start:previous + chunk_frames + 1]
+        # argmin returns the first minimum; prefer the latest one to keep chunks long
+        quietest = len(window) - 1 - int(np.argmin(window[::-1]))
+        previous = window_start + quietest
+        cuts.append(previous * frame)
+    return cuts
+
+
+def split_clip(
+    clip: AudioClip,
+    chunk_seconds: float = TRANSCRIPTION_CHUNK_SECONDS,
+    overlap_seconds: float = TRANSCRIPTION_CHUNK_OVERLAP_SECONDS
+) -> List[AudioClip]:
+    """Cut a clip at quiet points into overlapping chunks (views, no copy)."""
+    bounds = chunk_bounds(
+        clip.num_samples,
+        find_split_points(clip.samples, clip.sample_rate, chunk_seconds),
+        int(overlap_seconds * clip.sample_rate)
+    )
+    return [clip.slice(start, end) for start, end in bounds]
+
+
+def chunk_bounds(total: int, cuts: List[int], overlap: int) -> List[Tuple[int, int]]:
+    """(start, end) sample ranges between cuts, each extended by `overlap` on both sides."""
+    edges = [0] + list(cuts) + [total]
+    return [
+        (max(0, start - overlap), min(total, end + overlap))
+        for start, end in zip(edges, edges[1:])
+    ]
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch_words(
+    word_lists: List[List[T]],
+    text_of: Callable[[T], str] = str,
+    max_overlap_words: int = 12,
+    min_overlap_words: int = 2
+) -> List[T]:
+    """
+    Concatenate per-chunk word lists, dropping words repeated because of the audio overlap.
+
+    The longest run of words (ignoring case and punctuation) that ends one chunk
+    and starts the next is kept only once. Runs shorter than `min_overlap_words`
+    are left alone, as a single repeated word is often genuine.
+    """
+    words: List[T] = []
+    for next_words in word_lists:
+        longest = min(max_overlap_words, len(words), len(next_words))
+        tail = [_normalize_word(text_of(word)) for word in words[len(words) - longest:]]
+        head = [_normalize_word(text_of(word)) for word in next_words[:longest]]
+        for size in range(longest, min_overlap_words - 1, -1):
+            if tail[len(tail) - size:] == head[:size]:
+                next_words = next_words[size:]
+                break
+        words.extend(next_words)
+    return words
+
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int = 12, min_overlap_words: int = 2) -> str:
+    """Join chunk transcripts with stitch_words."""
+    return " ".join(stitch_words(
+        [(text or "").split() for text in texts],
+        max_overlap_words=max_overlap_words,
+        min_overlap_words=min_overlap_words
+    ))
@@ -0,0 +1,234 @@
+import io
+import struct
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+# Format every downstream service (Whisper, Azure, analysis) works with
+TARGET_SAMPLE_RATE = 16000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class AudioFormatError(ValueError):
+    """Raised when a recording cannot be parsed or decoded."""
+
+
+def parse_wav_header(data: bytes) -> Tuple[dict, int, int]:
+    """
+    Read the fmt and data chunks of a RIFF/WAVE file without decoding it.
+
+    Returns:
+        (format dict with audio_format, channels, sample_rate, bits_per_sample,
+         offset of the sample data, size of the sample data in bytes)
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise AudioFormatError("Not a RIFF/WAVE file")
+
+    fmt = None
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id = data[position:position + 4]
+        chunk_size = struct.unpack_from('<I', data, position + 4)[0]
+        body = position + 8
+        if chunk_id == b'fmt ':
+            audio_format, channels, sample_rate, _, block_align, bits = struct.unpack_from('<HHIIHH', data, body)
+            if audio_format == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40:
+                # The real format code is the first two bytes of the SubFormat GUID
+                audio_format = struct.unpack_from('<H', data, body + 24)[0]
+            fmt = {
+                'audio_format': audio_format,
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'block_align': block_align,
+                'bits_per_sample': bits
+            }
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise AudioFormatError("WAV data chunk before fmt chunk")
+            # Streaming writers (browsers included) may leave the size as 0 or 0xFFFFFFFF
+            available = len(data) - body
+            size = chunk_size if 0 < chunk_size <= available else available
+            size -= size % max(fmt['block_align'], 1)
+            return fmt, body, size
+        position = body + chunk_size + (chunk_size & 1)  # chunks are word aligned
+
+    raise AudioFormatError("WAV file has no data chunk")
+
+
+def _pcm_to_float(raw: memoryview, audio_format: int, bits: int) -> np.ndarray:
+    """Convert interleaved little-endian samples to float32 in [-1, 1]."""
+    if audio_format == WAVE_FORMAT_IEEE_FLOAT:
+        if bits == 32:
+            return np.frombuffer(raw, dtype='<f4').astype(np.float32)
+        if bits == 64:
+            return np.frombuffer(raw, dtype='<f8').astype(np.float32)
+    elif audio_format == WAVE_FORMAT_PCM:
+        if bits == 8:
+            return (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+        if bits == 16:
+            return np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+        if bits == 24:
+            b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            values = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+            values = np.where(values & 0x800000, values - 0x1000000, values)
+            return values.astype(np.float32) / 8388608.0
+        if bits == 32:
+            return np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    raise AudioFormatError(f"Unsupported WAV encoding (format {audio_format}, {bits} bits)")
+
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """Resample a mono float signal, using a polyphase filter when scipy is available."""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    try:
+        from math import gcd
+        from scipy.signal import resample_poly
+        divisor = gcd(source_rate, target_rate)
+        return resample_poly(samples, target_rate // divisor, source_rate // divisor).astype(np.float32)
+    except ImportError:
+        target_length = int(round(len(samples) * target_rate / source_rate))
+        positions = np.arange(target_length) * (source_rate / target_rate)
+        return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def encode_wav(pcm: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE) -> bytes:
+    """Wrap 16-bit mono PCM samples in a WAV header."""
+    data_size = pcm.nbytes
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, WAVE_FORMAT_PCM, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', data_size
+    )
+    return header + memoryview(pcm).cast('B')
+
+
+class AudioClip:
+    """
+    A recording decoded once to 16 kHz mono 16-bit PCM.
+
+    WAV input is parsed natively (no ffmpeg); anything else is decoded once
+    through pydub. Every consumer reads from the same buffer: `duration_*`
+    for fluency, `wav_file()` for Whisper, `pcm_bytes` / `wav_bytes()` for
+    Azure.
+    """
+
+    def __init__(self, samples: np.ndarray, source: Optional[bytes] = None, source_format: Optional[dict] = None):
+        self.samples = samples
+        self.samples.flags.writeable = False
+        self.sample_rate = TARGET_SAMPLE_RATE
+        self.source = source
+        self.source_format = source_format or {}
+        self._wav_bytes: Optional[bytes] = None
+        # Where this clip starts within the recording it was sliced from
+        self.offset_seconds = 0.0
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "AudioClip":
+        """Decode a recording (WAV natively, other containers through pydub)."""
+        data = bytes(data)
+        try:
+            fmt, offset, size = parse_wav_header(data)
+        except AudioFormatError:
+            return cls._from_ffmpeg(data)
+
+        raw = memoryview(data)[offset:offset + size]
+        if fmt['audio_format'] == WAVE_FORMAT_PCM and fmt['bits_per_sample'] == 16 \
+                and fmt['channels'] == 1 and fmt['sample_rate'] == TARGET_SAMPLE_RATE:
+            # Already in the target format: a view over the original bytes, no copy
+            return cls(np.frombuffer(raw, dtype='<i2'), source=data, source_format=fmt)
+
+        samples = _pcm_to_float(raw, fmt['audio_format'], fmt['bits_per_sample'])
+        if fmt['channels'] > 1:
+            samples = samples.reshape(-1, fmt['channels']).mean(axis=1)
+        samples = resample(samples, fmt['sample_rate'])
+        return cls(_float_to_int16(samples), source=data, source_format=fmt)
+
+    @classmethod
+    def from_pcm(cls, data: Any, sample_rate: int = TARGET_SAMPLE_RATE, channels: int = 1) -> "AudioClip":
+        """Build a clip from headerless 16-bit PCM bytes, or an int16 / float32 sample array."""
+        if isinstance(data, np.ndarray):
+            if data.dtype == np.int16 and sample_rate == TARGET_SAMPLE_RATE and channels == 1:
+                return cls(data)
+            samples = data.astype(np.float32) / 32768.0 if data.dtype != np.float32 else data
+        else:
+            raw = memoryview(bytes(data))
+            raw = raw[:len(raw) - len(raw) % (2 * channels)]
+            if sample_rate == TARGET_SAMPLE_RATE and channels == 1:
+                return cls(np.frombuffer(raw, dtype='<i2'))
+            samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        fmt = {'audio_format': None, 'channels': channels, 'sample_rate': sample_rate, 'bits_per_sample': 16}
+        return cls(_float_to_int16(resample(samples, sample_rate)), source_format=fmt)
+
+    @classmethod
+    def _from_ffmpeg(cls, data: bytes) -> "AudioClip":
+        from pydub import AudioSegment
+        try:
+            segment = AudioSegment.from_file(io.BytesIO(data))
+        except Exception as e:
+            raise AudioFormatError(f"Could not decode audio: {e}") from e
+        # What the recording was before conversion (the quality gate checks its sample rate)
+        fmt = {'audio_format': None, 'channels': segment.channels, 'sample_rate': segment.frame_rate,
+               'bits_per_sample': segment.sample_width * 8}
+        segment = segment.set_channels(1).set_frame_rate(TARGET_SAMPLE_RATE).set_sample_width(2)
+        return cls(np.frombuffer(segment.raw_data, dtype='<i2'), source=data, source_format=fmt)
+
+    @classmethod
+    def load(cls, audio: Any) -> "AudioClip":
+        """Accept an AudioClip, raw bytes or a file-like object (e.g. st.audio_input)."""
+        if isinstance(audio, AudioClip):
+            return audio
+        if hasattr(audio, 'getvalue'):
+            return cls.from_bytes(audio.getvalue())
+        if hasattr(audio, 'read'):
+            return cls.from_bytes(audio.read())
+        return cls.from_bytes(audio)
+
+    @property
+    def num_samples(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    @property
+    def duration_minutes(self) -> float:
+        return self.duration_seconds / 60
+
+    @property
+    def pcm_bytes(self) -> memoryview:
+        """Raw 16 kHz mono 16-bit PCM, without copying the buffer."""
+        return memoryview(self.samples).cast('B')
+
+    def slice(self, start: int, end: int) -> "AudioClip":
+        """A clip over samples [start, end), sharing this clip's buffer."""
+        clip = AudioClip(self.samples[start:end], source_format=self.source_format)
+        clip.offset_seconds = self.offset_seconds + start / self.sample_rate
+        return clip
+
+    def float_samples(self) -> np.ndarray:
+        """Samples scaled to float32 in [-1, 1] (a new array)."""
+        return self.samples.astype(np.float32) / 32768.0
+
+    def wav_bytes(self) -> bytes:
+        """16 kHz mono 16-bit WAV of the clip, built once."""
+        if self._wav_bytes is None:
+            self._wav_bytes = encode_wav(self.samples, self.sample_rate)
+        return self._wav_bytes
+
+    def wav_file(self, name: str = 'audio.wav') -> io.BytesIO:
+        """A fresh named file object for uploads (each caller gets its own read position)."""
+        audio_bio = io.BytesIO(self.wav_bytes())
+        audio_bio.name = name
+        return audio_bio
+
+
+def _float_to_int16(samples: np.ndarray) -> np.ndarray:
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
@@ -0,0 +1,93 @@
+import io
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from services.audio_clip import AudioClip
+
+# Codec used for recordings before they leave the machine: "opus", "mp3" or "wav" (no compression)
+UPLOAD_AUDIO_CODEC = os.getenv("UPLOAD_AUDIO_CODEC", "opus").lower()
+
+# Speech stays intelligible for Whisper well below music bitrates
+UPLOAD_AUDIO_BITRATE = os.getenv("UPLOAD_AUDIO_BITRATE", "24k")
+
+# codec -> (container format, ffmpeg encoder, file extension)
+CODECS = {
+    "opus": ("ogg", "libopus", "ogg"),
+    "mp3": ("mp3", "libmp3lame", "mp3"),
+}
+
+
+@dataclass
+class EncodingReport:
+    """What an encode cost and saved."""
+    codec: str
+    original_bytes: int
+    encoded_bytes: int
+    encode_seconds: float
+    duration_seconds: float
+    request_seconds: Optional[float] = None  # filled in by callers that time the upload
+
+    @property
+    def ratio(self) -> float:
+        return self.original_bytes / self.encoded_bytes if self.encoded_bytes else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.codec}: {self.original_bytes / 1024:.0f} KB -> {self.encoded_bytes / 1024:.0f} KB "
+            f"({self.ratio:.1f}x smaller) for {self.duration_seconds:.1f}s of audio, "
+            f"encoded in {self.encode_seconds * 1000:.0f} ms"
+            + (f", request took {self.request_seconds:.2f}s" if self.request_seconds is not None else "")
+        )
+
+
+def encode_clip(
+    clip: AudioClip,
+    codec: str = UPLOAD_AUDIO_CODEC,
+    bitrate: str = UPLOAD_AUDIO_BITRATE,
+    name: str = "audio"
+) -> Tuple[io.BytesIO, EncodingReport]:
+    """
+    Encode a 16 kHz mono clip to a compact codec for upload or storage.
+
+    Falls back to WAV when the codec is "wav", unknown, or ffmpeg cannot
+    encode it, so callers always get something they can send.
+
+    Returns:
+        (named file object positioned at 0, EncodingReport)
+    """
+    original_bytes = len(clip.source) if clip.source else len(clip.wav_bytes())
+    start = time.perf_counter()
+    encoded: Optional[io.BytesIO] = None
+
+    if codec in CODECS:
+        container, encoder, extension = CODECS[codec]
+        try:
+            from pydub import AudioSegment
+            segment = AudioSegment(
+                data=bytes(clip.pcm_bytes),
+                sample_width=2,
+                frame_rate=clip.sample_rate,
+                channels=1
+            )
+            encoded = io.BytesIO()
+            segment.export(encoded, format=container, codec=encoder, bitrate=bitrate)
+            encoded.name = f"{name}.{extension}"
+        except Exception as e:
+            print(f"Error encoding audio as {codec}, sending WAV instead: {e}")
+            encoded = None
+
+    if encoded is None:
+        codec = "wav"
+        encoded = clip.wav_file(f"{name}.wav")
+
+    encoded.seek(0)
+    report = EncodingReport(
+        codec=codec,
+        original_bytes=original_bytes,
+        encoded_bytes=len(encoded.getbuffer()),
+        encode_seconds=time.perf_counter() - start,
+        duration_seconds=clip.duration_seconds
+    )
+    return encoded, report
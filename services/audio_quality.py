@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from services.audio_clip import AudioClip
+from services.vad import VAD_DIGITAL_SILENCE_DB, VAD_FRAME_SECONDS, frame_features, speech_mask
+
+# Below these a take is rejected before anything is sent to Whisper, Azure or the LLM
+MIN_SPEECH_SECONDS = 1.0
+MIN_RMS_DB = -55.0
+MIN_SOURCE_SAMPLE_RATE = 8000
+MAX_CLIPPING_RATIO = 0.05
+
+# Below these the take is scored, with a warning
+LOW_RMS_DB = -40.0
+LOW_SNR_DB = 10.0
+WARN_CLIPPING_RATIO = 0.005
+WARN_SOURCE_SAMPLE_RATE = 16000
+
+CLIPPING_LEVEL = 32000  # |sample| at or above this counts as clipped
+
+
+class AudioQualityError(ValueError):
+    """Raised when a recording is not worth sending for analysis."""
+
+
+@dataclass
+class QualityReport:
+    """Outcome of check_audio_quality: problems that reject the take, problems worth mentioning, and the numbers behind them."""
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def check_audio_quality(clip: AudioClip) -> QualityReport:
+    """
+    Cheap local checks on the decoded PCM (a few milliseconds per minute of audio).
+
+    Measures the overall level, the share of clipped samples, a signal-to-noise
+    estimate (loud vs. quiet frames, leaving out digital silence), how much
+    speech there is, and the sample rate of the original recording.
+    """
+    report = QualityReport()
+    samples = clip.samples
+    if len(samples) == 0:
+        report.errors.append("The recording is empty.")
+        return report
+
+    energy_db, zcr = frame_features(samples, clip.sample_rate)
+    speech = speech_mask(energy_db, zcr)
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64)))) / 32768.0
+    rms_db = 20 * np.log10(max(rms, 1e-10))
+    clipping_ratio = float(np.count_nonzero(np.abs(samples.astype(np.int32)) >= CLIPPING_LEVEL)) / len(samples)
+    # Digital silence (zero padding) is not background noise
+    audible = energy_db[energy_db > VAD_DIGITAL_SILENCE_DB]
+    snr_db = float(np.percentile(audible, 95) - np.percentile(audible, 10)) if len(audible) else 0.0
+    speech_seconds = float(np.count_nonzero(speech)) * VAD_FRAME_SECONDS
+    source_rate = clip.source_format.get('sample_rate') or clip.sample_rate
+
+    report.metrics = {
+        'duration_seconds': round(clip.duration_seconds, 2),
+        'speech_seconds': round(speech_seconds, 2),
+        'rms_db': round(rms_db, 1),
+        'snr_db': round(snr_db, 1),
+        'clipping_ratio': round(clipping_ratio, 4),
+        'source_sample_rate': source_rate
+    }
+
+    if source_rate < MIN_SOURCE_SAMPLE_RATE:
+        report.errors.append(f"The recording's sample rate ({source_rate} Hz) is too low to analyse.")
+    elif source_rate < WARN_SOURCE_SAMPLE_RATE:
+        report.warnings.append(f"The recording's sample rate ({source_rate} Hz) is low; results may be less accurate.")
+
+    if rms_db < MIN_RMS_DB:
+        report.errors.append("The recording is silent. Please check your microphone and try again.")
+    elif speech_seconds < MIN_SPEECH_SECONDS:
+        report.errors.append("We could not hear enough speech. Please record a longer answer.")
+    elif rms_db < LOW_RMS_DB:
+        report.warnings.append("The recording is very quiet. Speak closer to the microphone for better results.")
+
+    if clipping_ratio > MAX_CLIPPING_RATIO:
+        report.errors.append("The recording is heavily distorted (too loud). Move away from the microphone and try again.")
+    elif clipping_ratio > WARN_CLIPPING_RATIO:
+        report.warnings.append("Parts of the recording are distorted (too loud).")
+
+    if report.ok and snr_db < LOW_SNR_DB:
+        report.warnings.append("There is a lot of background noise; results may be less accurate.")
+
+    return report
+
+
+def require_audio_quality(clip: AudioClip) -> QualityReport:
+    """check_audio_quality, raising AudioQualityError when the take should be rejected."""
+    report = check_audio_quality(clip)
+    if not report.ok:
+        raise AudioQualityError(" ".join(report.errors))
+    return report
@@ -1,25 +1,273 @@
-from io import BytesIO
+from concurrent.futures import Future, ThreadPoolExecutor
+import importlib.util
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
 import numpy as np
 import os
-from openai import OpenAI
+from services.audio_clip import AudioClip
+from services.transcription_backends import TimedWord, Transcript, TranscriptionBackend, get_transcription_backend
+from services.vad import VAD_DIGITAL_SILENCE_DB, VAD_FRAME_SECONDS, VAD_MAX_NOISE_FLOOR_DB, VAD_START_DB
+
+# How much audio the live recorder keeps: the whole take for the analyses that run after it
+# (longer takes keep their last LIVE_BUFFER_SECONDS)
+LIVE_BUFFER_SECONDS = float(os.getenv("LIVE_BUFFER_SECONDS", "180"))
+
+# A segment is closed and sent for transcription after this much silence...
+LIVE_SEGMENT_SILENCE_SECONDS = float(os.getenv("LIVE_SEGMENT_SILENCE_SECONDS", "0.6"))
+# ...or once it gets this long, whichever comes first
+LIVE_SEGMENT_MAX_SECONDS = float(os.getenv("LIVE_SEGMENT_MAX_SECONDS", "15"))
+LIVE_SEGMENT_MIN_SECONDS = 0.3
+
+# dB per VAD frame the noise floor estimate may rise, so it follows a noisier room
+NOISE_FLOOR_RISE_DB = 0.05
+
+# Live recording needs streamlit-webrtc; pages fall back to st.audio_input without it
+LIVE_RECORDING_AVAILABLE = importlib.util.find_spec("streamlit_webrtc") is not None
+
+
+class AudioRingBuffer:
+    """
+    Fixed-size circular buffer of mono int16 samples, allocated once.
+
+    Positions are absolute sample counts since the start of the recording, so a
+    segment can be read back as long as it is still within the last `capacity`
+    samples.
+    """
+
+    def __init__(self, capacity: int):
+        self.buffer = np.zeros(capacity, dtype=np.int16)
+        self.capacity = capacity
+        self.written = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        if len(samples) > self.capacity:
+            # Only the tail can be kept; account for what is skipped
+            self.written += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        start = self.written % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self.buffer[start:start + first] = samples[:first]
+        self.buffer[:len(samples) - first] = samples[first:]
+        self.written += len(samples)
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """Copy of samples [start, end) (absolute positions)."""
+        if start < self.written - self.capacity or end > self.written or start > end:
+            raise IndexError(f"Samples {start}-{end} are not in the buffer")
+        first, last = start % self.capacity, end % self.capacity
+        if end - start == 0:
+            return np.zeros(0, dtype=np.int16)
+        if first < last:
+            return self.buffer[first:last].copy()
+        return np.concatenate((self.buffer[first:], self.buffer[:last]))
+
+
+def frame_to_mono(frame) -> Tuple[np.ndarray, int]:
+    """Convert an av.AudioFrame (as delivered by streamlit-webrtc) to mono int16 and its sample rate."""
+    samples = frame.to_ndarray()
+    channels = len(frame.layout.channels)
+    if frame.format.is_planar:
+        samples = samples.reshape(channels, -1)
+    else:
+        samples = samples.reshape(-1, channels).T
+    if samples.dtype.kind == 'f':
+        samples = samples * 32768.0
+    mono = samples.mean(axis=0) if channels > 1 else samples[0]
+    return np.clip(mono, -32768, 32767).astype(np.int16), frame.sample_rate
+
+
+class LiveTranscriber:
+    """
+    Transcribes a recording while it is being made.
+
+    Incoming audio goes into a ring buffer and through a small online voice
+    activity detector. Whenever a pause ends a speech segment (or it reaches
+    LIVE_SEGMENT_MAX_SECONDS) the segment is sent for transcription in the
+    background, so by the time the learner stops, only the last segment is
+    still being processed.
+    """
+
+    def __init__(self, backend: Optional[TranscriptionBackend] = None, language: Optional[str] = None,
+                 buffer_seconds: float = LIVE_BUFFER_SECONDS, max_workers: int = 2):
+        self.backend = backend or get_transcription_backend()
+        self.language = language
+        self.buffer_seconds = buffer_seconds
+        self.sample_rate: Optional[int] = None
+        self.ring: Optional[AudioRingBuffer] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._segments: List[Tuple[float, float, Future]] = []
+        self._lock = threading.Lock()
+        self._pending = np.zeros(0, dtype=np.int16)  # samples not yet covering a whole VAD frame
+        self._noise_floor = VAD_MAX_NOISE_FLOOR_DB
+        self._segment_start: Optional[int] = None
+        self._last_voice: Optional[int] = None
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.ring.written / self.sample_rate if self.ring else 0.0
+
+    def add_frame(self, frame) -> None:
+        """Feed one av.AudioFrame."""
+        samples, sample_rate = frame_to_mono(frame)
+        self.add_samples(samples, sample_rate)
+
+    def add_samples(self, samples: np.ndarray, sample_rate: int) -> None:
+        """Feed mono int16 samples; the first call fixes the sample rate."""
+        if self.ring is None:
+            self.sample_rate = sample_rate
+            self.ring = AudioRingBuffer(int(self.buffer_seconds * sample_rate))
+        elif sample_rate != self.sample_rate:
+            raise ValueError(f"Sample rate changed from {self.sample_rate} to {sample_rate}")
+
+        position = self.ring.written - len(self._pending)
+        self.ring.write(samples)
+        block = max(1, int(self.sample_rate * VAD_FRAME_SECONDS))
+        pending = np.concatenate((self._pending, samples)) if len(self._pending) else samples
+        count = len(pending) // block
+        if count:
+            frames = pending[:count * block].reshape(count, block).astype(np.float32) / 32768.0
+            levels = 10 * np.log10(np.maximum(np.einsum('ij,ij->i', frames, frames) / block, 1e-20))
+            for i, level in enumerate(levels):
+                self._on_level(float(level), position + i * block, position + (i + 1) * block)
+        self._pending = pending[count * block:].copy()
+
+    def _on_level(self, level: float, start: int, end: int) -> None:
+        # The floor drops straight to quiet frames and creeps up slowly otherwise; digital
+        # silence (mic warm-up zeros) is not room noise and would pin it far below the pauses
+        if level > VAD_DIGITAL_SILENCE_DB:
+            self._noise_floor = min(level, self._noise_floor + NOISE_FLOOR_RISE_DB, VAD_MAX_NOISE_FLOOR_DB)
+        if level > self._noise_floor + VAD_START_DB:
+            if self._segment_start is None:
+                self._segment_start = start
+            self._last_voice = end
+        if self._segment_start is None:
+            return
+        silence = (end - self._last_voice) / self.sample_rate
+        length = (end - self._segment_start) / self.sample_rate
+        if silence >= LIVE_SEGMENT_SILENCE_SECONDS or length >= LIVE_SEGMENT_MAX_SECONDS:
+            self._close_segment(self._last_voice)
+
+    def _close_segment(self, end: int) -> None:
+        start, self._segment_start, self._last_voice = self._segment_start, None, None
+        if start is None or (end - start) / self.sample_rate < LIVE_SEGMENT_MIN_SECONDS:
+            return
+        clip = AudioClip.from_pcm(self.ring.read(start, end), sample_rate=self.sample_rate)
+        future = self._executor.submit(self.backend.transcribe_timed, clip, self.language)
+        with self._lock:
+            self._segments.append((start / self.sample_rate, end / self.sample_rate, future))
+
+    def _completed(self) -> List[Tuple[float, float, Transcript]]:
+        # Only the finished prefix, so the partial transcript never has holes
+        done = []
+        with self._lock:
+            segments = list(self._segments)
+        for start, end, future in segments:
+            if not future.done():
+                break
+            transcript = future.result()
+            if transcript is not None:
+                done.append((start, end, transcript))
+        return done
+
+    def partial_transcript(self) -> str:
+        return " ".join(transcript.text.strip() for _, _, transcript in self._completed())
+
+    def running_wpm(self) -> float:
+        """Words per minute over the speech transcribed so far (pauses between segments excluded)."""
+        from services.nlp_analysis import counted_words
+
+        completed = self._completed()
+        words = sum(len(counted_words(transcript.text.split())) for _, _, transcript in completed)
+        seconds = sum(end - start for start, end, _ in completed)
+        return round(words / (seconds / 60), 1) if seconds > 0 else 0.0
+
+    def recording(self) -> AudioClip:
+        """The take as one clip, read from the ring buffer (its last `buffer_seconds` if it was longer)."""
+        if self.ring is None:
+            return AudioClip.from_pcm(np.zeros(0, dtype=np.int16))
+        start = max(0, self.ring.written - self.ring.capacity)
+        if start:
+            print(f"Live recording longer than {self.buffer_seconds:.0f}s; only the end is kept for analysis")
+        return AudioClip.from_pcm(self.ring.read(start, self.ring.written), sample_rate=self.sample_rate)
+
+    def finish(self) -> Transcript:
+        """Close the open segment, wait for every transcription and return the merged transcript."""
+        if self._segment_start is not None:
+            self._close_segment(self._last_voice or self.ring.written)
+        with self._lock:
+            segments = list(self._segments)
+        texts, words = [], []
+        for start, _, future in segments:
+            transcript = future.result()
+            if transcript is None:
+                continue
+            texts.append(transcript.text.strip())
+            # Segment timings start at 0; move them to where the segment was in the recording
+            words.extend(TimedWord(w.word, w.start + start, w.end + start) for w in transcript.words)
+        self._executor.shutdown(wait=False)
+        return Transcript(" ".join(text for text in texts if text), words)
+
+
+def live_recording(key: str = "live_recording", language: Optional[str] = None):
+    """
+    Record with streamlit-webrtc, showing the transcript and WPM while the learner speaks.
+
+    Returns:
+        (Transcript, AudioClip of the whole take) once the recording is stopped (kept across
+        reruns until the next recording starts), or (None, None) before that.
+    """
+    import streamlit as st
+    from streamlit_webrtc import WebRtcMode, webrtc_streamer
+
+    webrtc_ctx = webrtc_streamer(
+        key=key,
+        mode=WebRtcMode.SENDONLY,
+        audio_receiver_size=1024,
+        media_stream_constraints={"audio": True, "video": False}
+    )
+    state_key = f"{key}_transcriber"
+    result_key = f"{key}_result"
+    partial_text = st.empty()
+    wpm_text = st.empty()
+
+    transcriber = st.session_state.get(state_key)
+    if webrtc_ctx.audio_receiver:
+        if transcriber is None:
+            transcriber = st.session_state[state_key] = LiveTranscriber(language=language)
+            st.session_state.pop(result_key, None)
+        last_refresh = 0.0
+        while webrtc_ctx.state.playing:
+            try:
+                frames = webrtc_ctx.audio_receiver.get_frames(timeout=1)
+            except queue.Empty:
+                continue  # no audio this second; the loop ends when the browser stops
+            for frame in frames:
+                transcriber.add_frame(frame)
+            if time.monotonic() - last_refresh > 1:
+                last_refresh = time.monotonic()
+                partial_text.text(transcriber.partial_transcript())
+                wpm_text.text(f"🗣️ {transcriber.running_wpm()} words per minute")
+
+    if not webrtc_ctx.state.playing and transcriber is not None:
+        del st.session_state[state_key]
+        if transcriber.ring is not None:
+            st.session_state[result_key] = (transcriber.finish(), transcriber.recording())
+    return st.session_state.get(result_key, (None, None))
+
 
 def process_audio(audio_frames):
     # Check if there is any audio data
     if not audio_frames:
         return "No audio data captured", 0
 
-    # Convert the audio frames to a NumPy array and save it to a BytesIO object
-    audio_data = np.concatenate([np.array(frame.to_ndarray()) for frame in audio_frames if frame is not None])
-    audio_bytes = BytesIO(audio_data.tobytes())
-
-    # Transcribe the audio using OpenAI Whisper API
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    result = client.audio.transcriptions.create(
-        model="whisper-1",
-        file=audio_bytes,
-        language=None
-    )
-    transcription = result.text
-    audio_duration = 0  # You may need to calculate this separately if needed
+    # Run the captured frames through the same segmenting transcriber as live recordings
+    transcriber = LiveTranscriber()
+    for frame in audio_frames:
+        if frame is not None:
+            transcriber.add_frame(frame)
+    transcription = transcriber.finish().text
+    audio_duration = transcriber.duration_seconds / 60
 
-    return transcription, audio_duration
\ No newline at end of file
+    return transcription, audio_duration
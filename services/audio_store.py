@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Disk budget for generated prompt audio, and where its index is kept (outside the served directory)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+TTS_CACHE_INDEX_PATH = os.getenv("TTS_CACHE_INDEX_PATH", ".cache/tts_audio_index.sqlite3")
+
+
+class AudioStore:
+    """
+    Size and last-access index of the files in an audio directory.
+
+    Every file is recorded with its size when written and its access time is
+    bumped when it is served, in a SQLite index, so keeping the directory under
+    `max_bytes` only reads the index: the least recently used files are deleted
+    first and hot prompt audio stays. When the index is opened, files on disk
+    that it does not know are added (using their modification time) and
+    entries whose file is gone are dropped.
+    """
+
+    def __init__(self, directory: str, index_path: str = TTS_CACHE_INDEX_PATH, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.index_path = index_path
+        self.max_bytes = max_bytes
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_access = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module never touches the disk
+        if self._conn is None:
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "name TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS files_last_access ON files (last_access)")
+            self._reconcile(self._conn)
+            self._conn.commit()
+        return self._conn
+
+    def _reconcile(self, conn: sqlite3.Connection) -> None:
+        # Once per process: index files written without going through the store (e.g. left by the
+        # old age-based cleanup) and forget files deleted by hand, so the budget sees the real directory
+        on_disk = {}
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    on_disk[entry.name] = entry.stat()
+        indexed = {name for (name,) in conn.execute("SELECT name FROM files")}
+        for name in on_disk.keys() - indexed:
+            conn.execute("INSERT INTO files (name, size, last_access) VALUES (?, ?, ?)",
+                         (name, on_disk[name].st_size, on_disk[name].st_mtime))
+        for name in indexed - on_disk.keys():
+            conn.execute("DELETE FROM files WHERE name = ?", (name,))
+
+    def _now(self) -> float:
+        # Strictly increasing so back-to-back accesses keep their LRU order
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    def touch(self, name: str) -> None:
+        """Mark a file as just served."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute("UPDATE files SET last_access = ? WHERE name = ?", (self._now(), name))
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error updating audio index: {e}")
+
+    def add(self, name: str, size: int) -> None:
+        """Record a newly written file and evict others if the directory is over budget."""
+        with self._lock:
+            try:
+                conn = self._connection()
+                conn.execute("INSERT OR REPLACE INTO files (name, size, last_access) VALUES (?, ?, ?)",
+                             (name, size, self._now()))
+                self._evict(conn, keep=name)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error updating audio index: {e}")
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used files until the directory fits in max_bytes (default: the store's budget).
+
+        Returns:
+            The number of bytes freed.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                freed = self._evict(conn, max_bytes=max_bytes)
+                conn.commit()
+                return freed
+            except sqlite3.Error as e:
+                print(f"Error updating audio index: {e}")
+                return 0
+
+    def _evict(self, conn: sqlite3.Connection, keep: Optional[str] = None, max_bytes: Optional[int] = None) -> int:
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM files").fetchone()[0]
+        freed = 0
+        if total <= max_bytes:
+            return freed
+        for name, size in conn.execute("SELECT name, size FROM files ORDER BY last_access").fetchall():
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass  # removed by hand; just drop it from the index
+            conn.execute("DELETE FROM files WHERE name = ?", (name,))
+            self.evicted_files += 1
+            self.evicted_bytes += size
+            freed += size
+            total -= size
+            if total <= max_bytes:
+                break
+        return freed
+
+    def stats(self) -> Dict[str, Any]:
+        """What is stored on disk and what has been evicted by this process."""
+        files, total_bytes = 0, 0
+        with self._lock:
+            try:
+                files, total_bytes = self._connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files"
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error reading audio index: {e}")
+        return {
+            "files": files,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "evicted_files": self.evicted_files,
+            "evicted_bytes": self.evicted_bytes
+        }
@@ -3,7 +3,8 @@ import pandas as pd
 from codaio import Coda, Table, Document, Cell
 import os
 from dotenv import load_dotenv
-from services.tts_generator import generate_audio  # Import the TTS generator
+from services.tts_generator import prompt_audio_url  # Import the TTS generator
+from services.tts_cache import TTS_CACHE_DIR
 
 
 # Load environment variables from .env file
@@ -101,9 +102,11 @@ def get_prompt_from_coda(prompt_code):
         flag = random_row['flag']
         
         # Check if audio_url is None, NaN, or an empty string
-        if not audio_url or pd.isna(audio_url) or audio_url.strip() == "":
+        # Also regenerate local audio that was evicted from the TTS cache (it comes back under the same name)
+        if not audio_url or pd.isna(audio_url) or audio_url.strip() == "" or (
+                audio_url.startswith(TTS_CACHE_DIR) and not os.path.exists(audio_url)):
             # Generate audio if audio_url is missing or empty
-            audio_url = generate_audio(text)  # Assuming this returns a valid file path or URL
+            audio_url = prompt_audio_url(text)  # Cached file, or a URL that streams it while it is synthesized
             st.write("Debug 1 : ", audio_url)
             if not audio_url:
                 raise ValueError("Failed to generate audio.")  # Handle generation failure
@@ -1,30 +1,20 @@
-import os
-import time
+from services.tts_cache import tts_cache
 
-def delete_old_audio_files(directory=".streamlit/static/generated_audio", age_minutes=10):
-    """
-    Deletes all audio files in the specified directory that were created more than `age_minutes` ago.
-    
-    Args:
-    - directory (str): The path to the directory where audio files are stored.
-    - age_minutes (int): The age in minutes after which files should be deleted.
+
+def delete_old_audio_files(max_bytes=None):
     """
-    # Define the time threshold in seconds
-    age_threshold = age_minutes * 60
-    current_time = time.time()
+    Evicts the least recently served generated audio until the directory fits its disk budget.
 
-    # Ensure the directory exists
-    if not os.path.exists(directory):
-        print(f"Directory '{directory}' does not exist.")
-        return
+    Only the audio index is read, so a sweep costs nothing while the directory is under budget.
 
-    # Iterate over files in the directory
-    for filename in os.listdir(directory):
-        file_path = os.path.join(directory, filename)
+    Args:
+    - max_bytes (int): Disk budget in bytes for this sweep; defaults to TTS_CACHE_MAX_BYTES.
 
-        # Check if the file is an audio file and is older than the threshold
-        if os.path.isfile(file_path) and filename.endswith(".mp3"):
-            file_age = current_time - os.path.getmtime(file_path)
-            if file_age > age_threshold:
-                os.remove(file_path)
-                print(f"Deleted old audio file: {filename}")
\ No newline at end of file
+    Returns:
+    - int: The number of bytes freed.
+    """
+    # Through the shared store, so its lock and eviction counters (and tts_cache.stats()) see the sweep
+    freed = tts_cache.store.evict(max_bytes)
+    if freed:
+        print(f"Deleted {freed / 1024:.0f} KB of least recently used audio from '{tts_cache.directory}'")
+    return freed
@@ -1,6 +1,195 @@
 from openai import OpenAI
 import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from services.llm_cache import llm_cache
+
+# Maximum number of skill evaluations sent to OpenAI at the same time
+SKILLS_ANALYSIS_MAX_WORKERS = int(os.getenv("SKILLS_ANALYSIS_MAX_WORKERS", "5"))
+
+# Evaluate all skills in a single JSON-schema constrained request instead of one request per skill
+SKILLS_ANALYSIS_STRUCTURED = os.getenv("SKILLS_ANALYSIS_STRUCTURED", "false").lower() == "true"
+
+# Model used for per-skill evaluations when the caller does not pick one
+SKILLS_ANALYSIS_MODEL = "gpt-3.5-turbo"
+
+# Structured outputs need a model that supports json_schema response formats
+STRUCTURED_MODEL = os.getenv("SKILLS_ANALYSIS_STRUCTURED_MODEL", "gpt-4o-mini")
+
+STRUCTURED_SYSTEM_PROMPT = """You are a language assessment assistant. You evaluate one student answer against several skills at once.
+For every skill listed, follow that skill's instructions and return an integer score between 0 and 100 and a short feedback.
+Return one evaluation per skill_id, using exactly the skill_ids given."""
+
+SYSTEM_PROMPT = """You are a language assessment assistant. Always return a score (0-100) and a short feedback.
+                 - At the end, provide the total score formatted as "TOTAL_SCORE:[total_score]" with a 2 or 3 digit integer in the square brackets."""
+
+
+def extract_score(content: str) -> int:
+    """Pull a 0-100 score out of a free-text evaluation (0 if none is found)."""
+    score_match = re.search(r"score\s*[:=\-]?\s*(\d{1,3})", content, re.IGNORECASE)
+    if not score_match:
+        score_match = re.search(r"\b(\d{2}|100)\b", content)
+    score = int(score_match.group(1)) if score_match else 0
+    return max(0, min(score, 100))  # Ensure score is between 0 and 100
+
+
+def evaluate_skill(client, skill: dict, text: str, audio_duration, question: str, context: str, model: str) -> dict:
+    """Run a single skill evaluation and return {'skill', 'score', 'feedback'}."""
+    cache_key = llm_cache.make_key(
+        model=model, system_prompt=SYSTEM_PROMPT, skill_prompt=skill['prompt'], transcription=text,
+        audio_duration=str(audio_duration), question=question, context=context
+    )
+    content = llm_cache.get(cache_key)
+    if content is None:
+        prompt = skill['prompt'] + "| Transcription: " + text + "| Audio Duration: " + str(audio_duration) + "| Question: " + question + "| Context: " + context
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "system", "content": prompt}
+            ]
+        )
+        content = response.choices[0].message.content.strip()
+        llm_cache.set(cache_key, content)
+    return {
+        "skill": skill['name'],
+        "score": extract_score(content),
+        "feedback": content
+    }
+
+
+def _skills_response_format(skill_ids: list) -> dict:
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "skills_evaluation",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "evaluations": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "skill_id": {"type": "string", "enum": skill_ids},
+                                "score": {"type": "integer"},
+                                "feedback": {"type": "string"}
+                            },
+                            "required": ["skill_id", "score", "feedback"],
+                            "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["evaluations"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+def parse_structured_evaluations(content: str, skill_ids: list) -> dict:
+    """
+    Validate a structured evaluation response.
+
+    Returns:
+        Dict of skill_id -> {'score', 'feedback'} for every well-formed evaluation;
+        unknown ids, non-integer scores and empty feedback are dropped.
+    """
+    try:
+        evaluations = json.loads(content).get("evaluations", [])
+    except (json.JSONDecodeError, AttributeError, TypeError):
+        return {}
+
+    parsed = {}
+    for evaluation in evaluations if isinstance(evaluations, list) else []:
+        if not isinstance(evaluation, dict):
+            continue
+        skill_id = evaluation.get("skill_id")
+        score = evaluation.get("score")
+        feedback = evaluation.get("feedback")
+        if skill_id not in skill_ids or skill_id in parsed:
+            continue
+        if isinstance(score, bool) or not isinstance(score, int) or not isinstance(feedback, str) or not feedback.strip():
+            continue
+        parsed[skill_id] = {"score": max(0, min(score, 100)), "feedback": feedback.strip()}
+    return parsed
+
+
+def structured_skills_analysis(
+    text: str,
+    skills: list,
+    audio_duration: str,
+    question: str,
+    context: str,
+    openai_api_key: str = None,
+    model: str = STRUCTURED_MODEL,
+    max_retries: int = 2
+):
+    """
+    Evaluate every skill in one JSON-schema constrained chat completion.
+
+    The transcription, question and context are sent once. Skills missing from
+    (or malformed in) the response are re-asked on their own; whatever is still
+    missing after `max_retries` falls back to the per-skill free-text path.
+
+    Args:
+        Same as dynamic_skills_analysis; `model` is used for the structured
+            requests and for the per-skill fallback.
+        max_retries: How many follow-up requests are made for missing skills.
+    Returns:
+        List of dicts: [{'skill': ..., 'score': ..., 'feedback': ...}, ...]
+        in the same order as `skills`.
+    """
+    if openai_api_key is None:
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+    client = OpenAI(api_key=openai_api_key)
+
+    skills_by_id = {f"s{i + 1}": skill for i, skill in enumerate(skills)}
+    answer = "Transcription: " + text + "\nAudio Duration: " + str(audio_duration) + "\nQuestion: " + question + "\nContext: " + context
+
+    evaluations = {}
+    pending = list(skills_by_id)
+    for _ in range(max_retries + 1):
+        if not pending:
+            break
+        skills_block = "\n\n".join(f"[{skill_id}] {skills_by_id[skill_id]['name']}:\n{skills_by_id[skill_id]['prompt']}" for skill_id in pending)
+        cache_key = llm_cache.make_key(model=model, system_prompt=STRUCTURED_SYSTEM_PROMPT, skill_prompt=skills_block, answer=answer)
+        content = llm_cache.get(cache_key)
+        if content is None:
+            try:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": STRUCTURED_SYSTEM_PROMPT},
+                        {"role": "system", "content": "Skills to evaluate:\n\n" + skills_block},
+                        {"role": "user", "content": answer}
+                    ],
+                    response_format=_skills_response_format(pending)
+                )
+                content = response.choices[0].message.content or ""
+            except Exception as e:
+                print(f"Error in structured skills analysis: {e}")
+                break
+        parsed = parse_structured_evaluations(content, pending)
+        # Only complete responses are worth replaying; partial ones would skip the re-ask
+        if len(parsed) == len(pending):
+            llm_cache.set(cache_key, content)
+        evaluations.update(parsed)
+        pending = [skill_id for skill_id in pending if skill_id not in evaluations]
+
+    for skill_id in pending:
+        result = evaluate_skill(client, skills_by_id[skill_id], text, audio_duration, question, context, model)
+        evaluations[skill_id] = {"score": result["score"], "feedback": result["feedback"]}
+
+    return [
+        {"skill": skill['name'], "score": evaluations[skill_id]["score"], "feedback": evaluations[skill_id]["feedback"]}
+        for skill_id, skill in skills_by_id.items()
+    ]
+
+
 def dynamic_skills_analysis(
     text: str,
     skills: list,
@@ -8,7 +197,9 @@ def dynamic_skills_analysis(
     question: str,
     context: str,
     openai_api_key: str = None,
-    model: str = "gpt-3.5-turbo"
+    model: str = None,
+    max_workers: int = SKILLS_ANALYSIS_MAX_WORKERS,
+    structured: bool = SKILLS_ANALYSIS_STRUCTURED
 ):
     """
     Args:
@@ -17,37 +208,28 @@ def dynamic_skills_analysis(
             - 'name': Skill name
             - 'prompt': Prompt template (with {text} placeholder)
         openai_api_key: Your OpenAI API key (optional, will use env if not provided).
-        model: OpenAI model to use.
+        model: OpenAI model to use (default: SKILLS_ANALYSIS_MODEL, or
+            STRUCTURED_MODEL in structured mode).
+        max_workers: How many skills are evaluated in parallel (1 = one after another).
+        structured: Evaluate all skills in one request with structured_skills_analysis.
     Returns:
         List of dicts: [{'skill': ..., 'score': ..., 'feedback': ...}, ...]
+        in the same order as `skills`.
     """
+    if structured:
+        return structured_skills_analysis(text, skills, audio_duration, question, context,
+                                          openai_api_key=openai_api_key, model=model or STRUCTURED_MODEL)
+    model = model or SKILLS_ANALYSIS_MODEL
     if openai_api_key is None:
         openai_api_key = os.getenv("OPENAI_API_KEY")
     client = OpenAI(api_key=openai_api_key)
-    results = []
-    for skill in skills:
-        prompt = skill['prompt'] + "| Transcription: " + text + "| Audio Duration: " + str(audio_duration) + "| Question: " + question + "| Context: " + context
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": """You are a language assessment assistant. Always return a score (0-100) and a short feedback.
-                 - At the end, provide the total score formatted as "TOTAL_SCORE:[total_score]" with a 2 or 3 digit integer in the square brackets."""
-                 },
-                {"role": "system", "content": prompt}
-            ]
-        )
-        content = response.choices[0].message.content.strip()
-        # Try to extract score and feedback (simple regex or convention)
-        import re
-        score_match = re.search(r"score\s*[:=\-]?\s*(\d{1,3})", content, re.IGNORECASE)
-        if not score_match:
-            score_match = re.search(r"\b(\d{2}|100)\b", content)
-        score = int(score_match.group(1)) if score_match else 0
-        score = max(0, min(score, 100))  # Ensure score is between 0 and 100
-        feedback = content
-        results.append({
-            "skill": skill['name'],
-            "score": score,
-            "feedback": feedback
-        })
-    return results
+
+    def evaluate(skill):
+        return evaluate_skill(client, skill, text, audio_duration, question, context, model)
+
+    if max_workers <= 1 or len(skills) <= 1:
+        return [evaluate(skill) for skill in skills]
+
+    # executor.map yields results in submission order, whatever finishes first
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(skills))) as executor:
+        return list(executor.map(evaluate, skills))
@@ -6,6 +6,8 @@ from codaio import Coda, Document
 import os
 from dotenv import load_dotenv
 import numpy as np
+from services.table_cache import table_cache
+from services.user_directory import UserDirectory
 
 # Load environment variables
 load_dotenv()
@@ -17,14 +19,19 @@ coda = Coda(os.getenv("CODA_API_KEY"))
 DEMO_DOC_ID = "jPJTMi7bJR"
 DEMO_USERS_TABLE = "grid-LJUorNwMyd"
 
-def get_table_rows(doc_id: str, table_id: str):
-    """Get all rows from a Coda table"""
-    coda = Coda(os.getenv("CODA_API_KEY"))
+def fetch_table_rows(doc_id: str, table_id: str):
+    """Download all rows of a Coda table (bypasses the cache)"""
     doc = Document(doc_id, coda=coda)
     table = doc.get_table(table_id)
     rows = table.rows()
     return [row.to_dict() for row in rows]
 
+def get_table_rows(doc_id: str, table_id: str):
+    """Get all rows from a Coda table"""
+    return table_cache.get(doc_id, table_id, fetch_table_rows)
+
+demo_users = UserDirectory(DEMO_DOC_ID, DEMO_USERS_TABLE, fetch_table_rows)
+
 def get_user_learning_data(username: str) -> Dict[str, Any]:
     """
     Fetch user learning data from the Demo Users table.
@@ -36,17 +43,7 @@ def get_user_learning_data(username: str) -> Dict[str, Any]:
         Dictionary containing user learning data
     """
     try:
-        doc = Document(DEMO_DOC_ID, coda=coda)
-        table = doc.get_table(DEMO_USERS_TABLE)
-        rows = table.rows()
-        
-        # Find the user row
-        user_row = None
-        for row in rows:
-            row_data = row.to_dict()
-            if row_data.get('username') == username:
-                user_row = row_data
-                break
+        user_row = demo_users.get(username)
         
         if not user_row:
             return None
@@ -84,8 +81,7 @@ def generate_learning_plan_data(username: str) -> Dict[str, Any]:
         Dictionary containing all learning plan data
     """
     # Get user data from demo users table
-    rows = get_table_rows(DEMO_DOC_ID, DEMO_USERS_TABLE)
-    user_row = next((row for row in rows if row.get('username') == username), None)
+    user_row = demo_users.get(username)
     
     if not user_row:
         # Return default data if user not found
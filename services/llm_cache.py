@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Where cached LLM evaluations are stored and how much disk they may use
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_evaluations.sqlite3")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+
+# How often cache hits write their access times to disk (they are kept in memory in between)
+LLM_CACHE_ACCESS_FLUSH_SECONDS = float(os.getenv("LLM_CACHE_ACCESS_FLUSH_SECONDS", "30"))
+
+
+class LLMCache:
+    """
+    Disk-backed, content-addressed cache of LLM completions.
+
+    Entries are keyed by a hash of everything that influences the completion
+    (model, prompts, transcription...). When the stored responses exceed
+    `max_bytes`, the least recently used ones are evicted. Hits only read the
+    database: their access times are collected in memory and written with the
+    next `set`, or at most every `access_flush_seconds`.
+    """
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 enabled: bool = LLM_CACHE_ENABLED, access_flush_seconds: float = LLM_CACHE_ACCESS_FLUSH_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.access_flush_seconds = access_flush_seconds
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_access = 0.0
+        self._pending_access: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Hash the inputs of a completion into a cache key."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module never touches the disk
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)")
+            self._conn.commit()
+        return self._conn
+
+    def _now(self) -> float:
+        # Strictly increasing so back-to-back accesses keep their LRU order
+        self._last_access = max(time.time(), self._last_access + 1e-6)
+        return self._last_access
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for a key, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            try:
+                conn = self._connection()
+                row = conn.execute("SELECT value FROM completions WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._pending_access[key] = self._now()
+                if time.monotonic() - self._last_flush >= self.access_flush_seconds:
+                    self._flush_access(conn)
+                    conn.commit()
+                self.hits += 1
+                return row[0]
+            except sqlite3.Error as e:
+                print(f"Error reading LLM cache: {e}")
+                self.misses += 1
+                return None
+
+    def set(self, key: str, value: str) -> None:
+        """Store a completion and evict least recently used entries if over budget."""
+        if not self.enabled or not value:
+            return
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                conn = self._connection()
+                self._pending_access.pop(key, None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, size, self._now())
+                )
+                self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error writing LLM cache: {e}")
+
+    def _flush_access(self, conn: sqlite3.Connection) -> None:
+        # Entries evicted since their hit are simply not updated
+        if self._pending_access:
+            conn.executemany("UPDATE completions SET last_access = ? WHERE key = ?",
+                             [(last_access, key) for key, last_access in self._pending_access.items()])
+            self._pending_access.clear()
+        self._last_flush = time.monotonic()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Pending hits must be on disk before picking the least recently used entries
+        self._flush_access(conn)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM completions ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus what is stored on disk."""
+        entries, total_bytes = 0, 0
+        if self.enabled:
+            with self._lock:
+                try:
+                    entries, total_bytes = self._connection().execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Error reading LLM cache stats: {e}")
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+
+# Shared instance used by the analysis services
+llm_cache = LLMCache()
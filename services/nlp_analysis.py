@@ -1,4 +1,5 @@
 import statistics
+import string
 from collections import Counter
 import streamlit as st
 
@@ -73,13 +74,78 @@ def calculate_vocabulary_richness(text):
 
 
 
+# Silences between words at least this long count as pauses (0.25s is the usual fluency-research cut-off)
+PAUSE_THRESHOLD_SECONDS = 0.25
+LONG_PAUSE_THRESHOLD_SECONDS = 1.0
+
+# Below this many words or seconds of speech the timed WPM is too noisy to replace the overall WPM
+MIN_TIMED_WORDS = 3
+MIN_TIMED_SPAN_SECONDS = 3.0
+
+
+# Stripped from both ends of a token before it is counted ("bien." and " bien" are the same word)
+WORD_PUNCTUATION = string.punctuation + "«»“”‘’…¿¡"
+
+
+def is_counted_word(word):
+    """The words that count towards lemmas and WPM (elided tokens such as "c'est" are left out)."""
+    return word.isalpha()
+
+
+def counted_words(tokens):
+    """The tokens passing is_counted_word once whitespace and surrounding punctuation are stripped."""
+    words = (token.strip().strip(WORD_PUNCTUATION) for token in tokens)
+    return [word for word in words if is_counted_word(word)]
+
+def calculate_speech_timing(timed_words, pause_threshold=PAUSE_THRESHOLD_SECONDS):
+    """
+    Fluency measures from word timestamps, ignoring silence before the first and after the last word.
+
+    Args:
+        timed_words: Objects with `start` and `end` in seconds (e.g. TimedWord), in spoken order.
+    Returns:
+        dict with speech_wpm (words over the speaking span), articulation_rate (words over
+        the time actually spent talking), pause_count, long_pause_count, total_pause_seconds,
+        mean_pause_seconds, speech_seconds and word_count. Words are counted with counted_words,
+        as for total_lemmas; every word still bounds the pauses.
+    """
+    word_count = len(counted_words(word.word for word in timed_words))
+    if not timed_words or word_count == 0:
+        return {
+            'speech_wpm': 0, 'articulation_rate': 0, 'pause_count': 0, 'long_pause_count': 0,
+            'total_pause_seconds': 0, 'mean_pause_seconds': 0, 'speech_seconds': 0, 'word_count': 0
+        }
+
+    gaps = [max(0.0, following.start - previous.end) for previous, following in zip(timed_words, timed_words[1:])]
+    pauses = [gap for gap in gaps if gap >= pause_threshold]
+    speech_seconds = max(timed_words[-1].end - timed_words[0].start, 0.0)
+    talking_seconds = speech_seconds - sum(pauses)
+
+    return {
+        'speech_wpm': word_count / (speech_seconds / 60) if speech_seconds > 0 else 0,
+        'articulation_rate': word_count / (talking_seconds / 60) if talking_seconds > 0 else 0,
+        'pause_count': len(pauses),
+        'long_pause_count': sum(1 for pause in pauses if pause >= LONG_PAUSE_THRESHOLD_SECONDS),
+        'total_pause_seconds': round(sum(pauses), 2),
+        'mean_pause_seconds': round(statistics.mean(pauses), 2) if pauses else 0,
+        'speech_seconds': round(speech_seconds, 2),
+        'word_count': word_count
+    }
+
 # General Text Analysis (without relying on any specific language models)
-def analyze_lemmas_and_frequency(transcription, duration_in_minutes):
+def analyze_lemmas_and_frequency(transcription, duration_in_minutes, timed_words=None):
+    """
+    Args:
+        timed_words: Optional word timestamps from the transcription. When present, WPM
+            (and so the fluency score) is measured over the speaking span only, once there
+            are MIN_TIMED_WORDS words over MIN_TIMED_SPAN_SECONDS, and the speech timing
+            measures from calculate_speech_timing are added.
+    """
     st.write("Performing general text analysis")
 
 
     # Tokenize by splitting the paragraph into words (basic tokenization)
-    words = [word for word in transcription.split() if word.isalpha()]
+    words = counted_words(transcription.split())
     
     total_lemmas = len(words)
     unique_lemmas = len(set(words))
@@ -88,6 +154,12 @@ def analyze_lemmas_and_frequency(transcription, duration_in_minutes):
     # Simple WPM calculation
     wpm = total_lemmas / duration_in_minutes if duration_in_minutes > 0 else 0
 
+    timing = calculate_speech_timing(timed_words) if timed_words else {}
+    if (timing.get('speech_wpm') and timing['word_count'] >= MIN_TIMED_WORDS
+            and timing['speech_seconds'] >= MIN_TIMED_SPAN_SECONDS):
+        # Leading and trailing silence no longer count against the speaker (short answers keep the overall WPM)
+        wpm = timing['speech_wpm']
+
     # Calculate Scores
     fluency_score = calculate_fluency_score(wpm)
     # TODO: next function is dupplicating code
@@ -99,7 +171,8 @@ def analyze_lemmas_and_frequency(transcription, duration_in_minutes):
         'avg_word_length': avg_word_length,
         'fluency_score': fluency_score,
         'vocabulary_score': vocabulary_richness_score,
-        'wpm': wpm
+        'wpm': wpm,
+        **timing
     }
 
 # Function to display the results in a table
@@ -5,11 +5,27 @@ import wave
 import io
 import tempfile
 import os
+import threading
+import numpy as np
+from services.audio_clip import AudioClip, AudioFormatError, TARGET_SAMPLE_RATE
+from services.speech_pool import get_speech_pool
 
 # Azure Speech Services credentials (replace with your secure method in production)
 AZURE_SPEECH_KEY = "6Nk0XGWtuEsmRfGzBhJ2CGUseiZ9NKNCY8QIwukSxzZBkRq1a5CcJQQJ99BFAC5RqLJXJ3w3AAAYACOGUOFg"
 AZURE_SPEECH_REGION = "westeurope"
 
+# Feed decoded audio to Azure from memory; set to false to go through a temporary WAV file instead
+AZURE_PUSH_STREAM = os.getenv("AZURE_PUSH_STREAM", "true").lower() == "true"
+
+# Bytes written to the push stream per call (one second of 16 kHz 16-bit mono)
+PUSH_STREAM_CHUNK_BYTES = TARGET_SAMPLE_RATE * 2
+
+# "continuous" scores every utterance in the recording; "once" stops after the first one
+AZURE_RECOGNITION_MODE = os.getenv("AZURE_RECOGNITION_MODE", "continuous").lower()
+
+# Upper bound on a continuous recognition session, in seconds
+AZURE_RECOGNITION_TIMEOUT = float(os.getenv("AZURE_RECOGNITION_TIMEOUT", "300"))
+
 def validate_and_convert_audio(audio_file_path: str) -> str:
     """
     Validate and convert audio file to proper format for Azure Speech Services.
@@ -99,31 +115,73 @@ class PhoneticAnalysisService:
         self.language = language
         self.speech_key = AZURE_SPEECH_KEY
         self.speech_region = AZURE_SPEECH_REGION
+        # Speech and assessment configs are shared by every service in the process
+        self.speech_pool = get_speech_pool(self.speech_key, self.speech_region)
 
     def analyze_pronunciation(self, audio_file_path: str, reference_text: str = "") -> Dict[str, Any]:
         # Validate and convert audio to proper format
         converted_audio_path = validate_and_convert_audio(audio_file_path)
-        
-        speech_config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.speech_region)
-        audio_config = speechsdk.audio.AudioConfig(filename=converted_audio_path)
-        recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, language=self.language, audio_config=audio_config)
-        if reference_text:
-            pron_config = speechsdk.PronunciationAssessmentConfig(
-                reference_text=reference_text,
-                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-                granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-                enable_miscue=True
-            )
-        else:
-            pron_config = speechsdk.PronunciationAssessmentConfig(
-                reference_text="",
-                grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
-                granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
-                enable_miscue=False
-            )
-        if self.language == "fr-FR":
-            pron_config.enable_prosody_assessment()
-        pron_config.apply_to(recognizer)
+        try:
+            return self._assess_file(converted_audio_path, reference_text)
+        finally:
+            # Clean up converted file if it's different from original
+            if converted_audio_path != audio_file_path and os.path.exists(converted_audio_path):
+                try:
+                    os.unlink(converted_audio_path)
+                except:
+                    pass
+
+    def analyze_clip(self, clip: AudioClip, reference_text: str = "") -> Dict[str, Any]:
+        """Analyze an already decoded clip; it is 16 kHz mono 16-bit, so no conversion pass is needed"""
+        if AZURE_PUSH_STREAM:
+            try:
+                audio_config = self._push_stream_config(clip)
+            except Exception as e:
+                print(f"Push stream unavailable, falling back to a temporary file: {e}")
+            else:
+                return self._assess(audio_config, reference_text)
+        return self._assess_clip_file(clip, reference_text)
+
+    def analyze_samples(self, samples: np.ndarray, sample_rate: int = TARGET_SAMPLE_RATE, reference_text: str = "") -> Dict[str, Any]:
+        """Analyze mono int16 or float32 samples without going through a file"""
+        return self.analyze_clip(AudioClip.from_pcm(samples, sample_rate=sample_rate), reference_text)
+
+    def _push_stream_config(self, clip: AudioClip):
+        """Build an AudioConfig reading the clip's PCM from memory"""
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=clip.sample_rate, bits_per_sample=16, channels=1
+        )
+        stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+        pcm = clip.pcm_bytes
+        for start in range(0, len(pcm), PUSH_STREAM_CHUNK_BYTES):
+            stream.write(bytes(pcm[start:start + PUSH_STREAM_CHUNK_BYTES]))
+        # Closing the write side marks the end of the audio for recognize_once
+        stream.close()
+        return speechsdk.audio.AudioConfig(stream=stream)
+
+    def _assess_clip_file(self, clip: AudioClip, reference_text: str = "") -> Dict[str, Any]:
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
+        try:
+            temp_file.write(clip.wav_bytes())
+            temp_file.close()
+            return self._assess_file(temp_file.name, reference_text)
+        finally:
+            temp_file.close()
+            try:
+                os.unlink(temp_file.name)
+            except:
+                pass
+
+    def _assess_file(self, converted_audio_path: str, reference_text: str = "") -> Dict[str, Any]:
+        """Run Azure pronunciation assessment on a 16 kHz mono 16-bit WAV file"""
+        return self._assess(speechsdk.audio.AudioConfig(filename=converted_audio_path), reference_text)
+
+    def _assess(self, audio_config, reference_text: str = "") -> Dict[str, Any]:
+        if AZURE_RECOGNITION_MODE == "continuous":
+            return self._assess_continuous(audio_config, reference_text)
+        recognizer = self.speech_pool.recognizer(
+            self.language, audio_config, reference_text=reference_text, prosody=self.language == "fr-FR"
+        )
         result = recognizer.recognize_once()
         if result.reason == speechsdk.ResultReason.RecognizedSpeech:
             assessment = speechsdk.PronunciationAssessmentResult(result)
@@ -132,13 +190,6 @@ class PhoneticAnalysisService:
             word_scores = self._extract_word_scores(details)
             overall_score = self._calculate_overall_score(word_scores)
             
-            # Clean up converted file if it's different from original
-            if converted_audio_path != audio_file_path and os.path.exists(converted_audio_path):
-                try:
-                    os.unlink(converted_audio_path)
-                except:
-                    pass
-            
             return {
                 "success": True,
                 "score": overall_score,
@@ -147,15 +198,69 @@ class PhoneticAnalysisService:
                 "recognized_text": result.text
             }
         else:
-            # Clean up converted file if it's different from original
-            if converted_audio_path != audio_file_path and os.path.exists(converted_audio_path):
-                try:
-                    os.unlink(converted_audio_path)
-                except:
-                    pass
-            
             return {"success": False, "error": str(result.reason)}
 
+    def _assess_continuous(self, audio_config, reference_text: str = "") -> Dict[str, Any]:
+        """
+        Score the whole recording, one utterance at a time.
+
+        Each recognized segment is parsed as soon as Azure returns it; the word
+        scores of all segments are then merged into a single result shaped like
+        the recognize_once one (details['NBest'][0]['Words'] holds every word,
+        details['Segments'] the raw per-segment JSON).
+        """
+        recognizer = self.speech_pool.recognizer(
+            self.language, audio_config, reference_text=reference_text, prosody=self.language == "fr-FR",
+            continuous=True
+        )
+        segments, texts, words, errors = [], [], [], []
+        done = threading.Event()
+
+        def on_recognized(evt):
+            if evt.result.reason != speechsdk.ResultReason.RecognizedSpeech:
+                return
+            json_result = evt.result.properties.get(speechsdk.PropertyId.SpeechServiceResponse_JsonResult)
+            details = json.loads(json_result) if json_result else {}
+            segments.append(details)
+            texts.append(evt.result.text)
+            if details.get('NBest'):
+                words.extend(details['NBest'][0].get('Words', []))
+
+        def on_canceled(evt):
+            if evt.cancellation_details.reason == speechsdk.CancellationReason.Error:
+                errors.append(evt.cancellation_details.error_details)
+            done.set()
+
+        recognizer.recognized.connect(on_recognized)
+        recognizer.canceled.connect(on_canceled)
+        recognizer.session_stopped.connect(lambda evt: done.set())
+
+        recognizer.start_continuous_recognition()
+        try:
+            if not done.wait(AZURE_RECOGNITION_TIMEOUT):
+                errors.append(f"Recognition timed out after {AZURE_RECOGNITION_TIMEOUT:.0f}s")
+        finally:
+            recognizer.stop_continuous_recognition()
+
+        if not segments:
+            return {"success": False, "error": errors[0] if errors else str(speechsdk.ResultReason.NoMatch)}
+
+        recognized_text = " ".join(text for text in texts if text)
+        details = {
+            "RecognitionStatus": "Success",
+            "DisplayText": recognized_text,
+            "NBest": [{"Display": recognized_text, "Words": words}],
+            "Segments": segments
+        }
+        word_scores = self._extract_word_scores(details)
+        return {
+            "success": True,
+            "score": self._calculate_overall_score(word_scores),
+            "word_scores": word_scores,
+            "details": details,
+            "recognized_text": recognized_text
+        }
+
     def _extract_word_scores(self, details: Dict[str, Any]) -> List[Dict[str, Any]]:
         word_scores = []
         if 'NBest' in details and details['NBest']:
@@ -189,66 +294,47 @@ class PhoneticAnalysisService:
     def analyze_pronunciation_from_bytes(self, audio_bytes: bytes, reference_text: str = "") -> Dict[str, Any]:
         """Analyze pronunciation from audio bytes (from Streamlit audio_input)"""
         try:
-            # Create a proper WAV file from the audio bytes
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            
-            # Create WAV header for 16kHz, 16-bit, mono
-            import struct
-            
-            sample_rate = 16000
-            channels = 1
-            sample_width = 2
-            audio_length = len(audio_bytes)
-            
-            # Write WAV header
-            temp_file.write(b'RIFF')
-            temp_file.write(struct.pack('<I', 36 + audio_length))
-            temp_file.write(b'WAVE')
-            temp_file.write(b'fmt ')
-            temp_file.write(struct.pack('<I', 16))
-            temp_file.write(struct.pack('<H', 1))  # PCM
-            temp_file.write(struct.pack('<H', channels))
-            temp_file.write(struct.pack('<I', sample_rate))
-            temp_file.write(struct.pack('<I', sample_rate * channels * sample_width))
-            temp_file.write(struct.pack('<H', channels * sample_width))
-            temp_file.write(struct.pack('<H', sample_width * 8))
-            temp_file.write(b'data')
-            temp_file.write(struct.pack('<I', audio_length))
-            
-            # Write audio data
-            temp_file.write(audio_bytes)
-            temp_file.close()
-            
-            # Analyze the created WAV file
-            result = self.analyze_pronunciation(temp_file.name, reference_text)
-            
-            # Clean up temporary file
             try:
-                os.unlink(temp_file.name)
-            except:
-                pass
-            
-            return result
+                clip = AudioClip.load(audio_bytes)
+            except AudioFormatError:
+                # Headerless input is taken as 16kHz, 16-bit, mono PCM
+                clip = AudioClip.from_pcm(audio_bytes)
+            return self.analyze_clip(clip, reference_text)
             
         except Exception as e:
             return {"success": False, "error": f"Failed to process audio bytes: {str(e)}"}
 
+_services: Dict[str, PhoneticAnalysisService] = {}
+
+def get_phonetic_service(language: str = "fr-FR") -> PhoneticAnalysisService:
+    """One service per language for the whole process"""
+    service = _services.get(language)
+    if service is None:
+        service = _services.setdefault(language, PhoneticAnalysisService(language=language))
+    return service
+
 def phonetic_analysis_skill(audio_input, reference_text: str = "", language: str = "fr-FR") -> Dict[str, Any]:
     """
     Analyze pronunciation from audio input (file path or bytes).
     
     Args:
-        audio_input: Either a file path (str) or audio bytes (bytes)
+        audio_input: A file path (str), a decoded AudioClip, a 16 kHz mono sample array
+            (np.ndarray) or audio bytes (bytes)
         reference_text: Optional reference text for comparison
         language: Language code (default: "fr-FR")
     """
     try:
-        service = PhoneticAnalysisService(language=language)
+        service = get_phonetic_service(language)
         
         # Handle different input types
         if isinstance(audio_input, str):
             # File path provided
             result = service.analyze_pronunciation(audio_input, reference_text)
+        elif isinstance(audio_input, AudioClip):
+            # Already decoded once by the caller
+            result = service.analyze_clip(audio_input, reference_text)
+        elif isinstance(audio_input, np.ndarray):
+            result = service.analyze_samples(audio_input, reference_text=reference_text)
         else:
             # Bytes provided (from Streamlit audio_input)
             result = service.analyze_pronunciation_from_bytes(audio_input, reference_text)
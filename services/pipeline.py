@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline: `fn` is called with the outputs of `inputs` as keyword arguments."""
+    name: str
+    fn: Callable[..., Any]
+    inputs: Sequence[str] = ()
+    label: Optional[str] = None
+
+
+@dataclass
+class PipelineResult:
+    """Outputs of the stages that succeeded, errors of those that failed, and per-stage timings."""
+    values: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    def ok(self, name: str) -> bool:
+        return name in self.values
+
+
+class PipelineError(Exception):
+    """Raised when a stage is skipped because one of its inputs failed."""
+
+
+class Pipeline:
+    """
+    Small DAG executor for the assessment flow.
+
+    Every stage declares the names of the stages it depends on. A stage starts
+    on the thread pool as soon as all of its inputs are available, so stages
+    that do not depend on each other run concurrently. The `on_stage_done`
+    callback runs on the calling thread, which keeps Streamlit calls safe.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], inputs: Sequence[str] = (), label: Optional[str] = None) -> "Pipeline":
+        if name in self.stages:
+            raise ValueError(f"Duplicate pipeline stage: {name}")
+        self.stages[name] = Stage(name, fn, tuple(inputs), label)
+        return self
+
+    def _validate(self) -> None:
+        for stage in self.stages.values():
+            for dependency in stage.inputs:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+        # Kahn's algorithm: every stage must be reachable without a cycle
+        remaining = {name: set(stage.inputs) for name, stage in self.stages.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle between: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def run(self, on_stage_done: Optional[Callable[[Stage, int, int], None]] = None) -> PipelineResult:
+        """
+        Execute every stage and return their results.
+
+        Args:
+            on_stage_done: Called as (stage, completed_count, total_count) after each stage
+                finishes, whether it succeeded, failed or was skipped.
+        """
+        self._validate()
+        result = PipelineResult()
+        pending: Dict[str, Stage] = dict(self.stages)
+        running = {}
+        completed = 0
+        total = len(self.stages)
+
+        def finish(stage: Stage):
+            nonlocal completed
+            completed += 1
+            if on_stage_done:
+                on_stage_done(stage, completed, total)
+
+        def timed(stage: Stage, kwargs: Dict[str, Any]):
+            started = time.perf_counter()
+            try:
+                return stage.fn(**kwargs)
+            finally:
+                result.durations[stage.name] = time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # Skip stages whose inputs failed, start those whose inputs are all ready
+                for name, stage in list(pending.items()):
+                    failed = [dep for dep in stage.inputs if dep in result.errors]
+                    if failed:
+                        del pending[name]
+                        result.errors[name] = PipelineError(f"Skipped because '{failed[0]}' failed")
+                        finish(stage)
+                    elif all(dep in result.values for dep in stage.inputs):
+                        del pending[name]
+                        kwargs = {dep: result.values[dep] for dep in stage.inputs}
+                        running[executor.submit(timed, stage, kwargs)] = stage
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    try:
+                        result.values[stage.name] = future.result()
+                    except Exception as e:
+                        result.errors[stage.name] = e
+                    finish(stage)
+
+        return result
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Parallel ElevenLabs requests (keep within the plan's concurrency limit)
+PROMPT_AUDIO_WORKERS = int(os.getenv("PROMPT_AUDIO_WORKERS", "3"))
+# Rows written back to Coda per upsert request
+PROMPT_AUDIO_BATCH_SIZE = int(os.getenv("PROMPT_AUDIO_BATCH_SIZE", "25"))
+PROMPT_AUDIO_PROGRESS_PATH = os.getenv("PROMPT_AUDIO_PROGRESS_PATH", ".cache/prompt_audio_progress.json")
+
+# Retries on HTTP 429, waiting Retry-After or base * 2^attempt seconds
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BASE_DELAY = 2.0
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    # ElevenLabs errors carry status_code; requests (used by codaio) keeps it on the response
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'headers', None) or {}
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def with_rate_limit_retry(fn: Callable[[], Any], retries: int = RATE_LIMIT_RETRIES,
+                          base_delay: float = RATE_LIMIT_BASE_DELAY, sleep: Callable[[float], None] = time.sleep) -> Any:
+    """Call fn, backing off and retrying when the API answers 429 Too Many Requests."""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if _status_code(e) != 429 or attempt == retries:
+                raise
+            delay = _retry_after(e) or base_delay * 2 ** attempt
+            print(f"Rate limited, retrying in {delay:.1f} s")
+            sleep(delay)
+
+
+def missing_audio_texts(rows: Iterable[Dict[str, Any]], text_column: str = 'text',
+                        url_column: str = 'audio_url') -> List[str]:
+    """Distinct prompt texts of the rows that have no audio URL yet, in table order."""
+    texts = []
+    seen = set()
+    for row in rows:
+        text = row.get(text_column)
+        url = row.get(url_column)
+        has_url = isinstance(url, str) and url.strip() != ""
+        if has_url or not isinstance(text, str) or not text.strip() or text in seen:
+            continue
+        seen.add(text)
+        texts.append(text)
+    return texts
+
+
+@dataclass
+class PregenerationReport:
+    synthesized: int = 0
+    written: int = 0
+    skipped: int = 0        # already done in an earlier run
+    failed: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (f"{self.synthesized} synthesized, {self.written} written to Coda, {self.skipped} already done, "
+                f"{len(self.failed)} failed in {self.seconds:.1f} s")
+
+
+class PromptAudioJob:
+    """
+    Precompute the audio of every prompt that has none, before learners ask for it.
+
+    Texts are synthesized by a bounded worker pool and written back to Coda in
+    batches (upserted on the text column, so duplicate prompts share one file).
+    Progress is saved to a JSON file after every step: a rerun skips texts that
+    were already written and only writes back those that were synthesized but
+    not yet saved.
+    """
+
+    def __init__(self, table, generate: Callable[[str], Optional[str]], text_column: str = 'text',
+                 url_column: str = 'audio_url', workers: int = PROMPT_AUDIO_WORKERS,
+                 batch_size: int = PROMPT_AUDIO_BATCH_SIZE, progress_path: str = PROMPT_AUDIO_PROGRESS_PATH,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.table = table
+        self.generate = generate
+        self.text_column = text_column
+        self.url_column = url_column
+        self.workers = workers
+        self.batch_size = batch_size
+        self.progress_path = progress_path
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.progress = self._load_progress()
+
+    def _load_progress(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.progress_path):
+            return {}
+        with open(self.progress_path) as f:
+            return json.load(f)
+
+    def _save_progress(self) -> None:
+        directory = os.path.dirname(self.progress_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            with open(self.progress_path + ".tmp", "w") as f:
+                json.dump(self.progress, f, ensure_ascii=False)
+            os.replace(self.progress_path + ".tmp", self.progress_path)
+
+    def _record(self, text: str, audio_url: str) -> None:
+        with self._lock:
+            self.progress[text] = {'audio_url': audio_url, 'written': False}
+        self._save_progress()
+
+    def _write_back(self, texts: List[str]) -> int:
+        from codaio import Cell
+
+        rows = [
+            [Cell(column=self.text_column, value_storage=text),
+             Cell(column=self.url_column, value_storage=self.progress[text]['audio_url'])]
+            for text in texts
+        ]
+        with_rate_limit_retry(lambda: self.table.upsert_rows(rows, key_columns=[self.text_column]), sleep=self.sleep)
+        with self._lock:
+            for text in texts:
+                self.progress[text]['written'] = True
+        self._save_progress()
+        return len(texts)
+
+    def _flush(self, report: PregenerationReport, force: bool = False) -> None:
+        pending = [text for text, entry in self.progress.items() if not entry['written']]
+        while pending and (force or len(pending) >= self.batch_size):
+            batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+            try:
+                report.written += self._write_back(batch)
+            except Exception as e:
+                # Left unwritten in the progress file; the next run retries them
+                print(f"Error writing prompt audio to Coda: {e}")
+                return
+
+    def run(self, rows: Optional[Iterable[Dict[str, Any]]] = None) -> PregenerationReport:
+        """
+        Synthesize and save the audio of every prompt missing one.
+
+        Args:
+            rows: Row dicts of the prompts table; read from the table when omitted.
+        """
+        start = time.perf_counter()
+        report = PregenerationReport()
+        if rows is None:
+            rows = self.table.to_dict()
+        todo = []
+        for text in missing_audio_texts(rows, self.text_column, self.url_column):
+            if text in self.progress:
+                report.skipped += 1
+            else:
+                todo.append(text)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {
+                executor.submit(with_rate_limit_retry, lambda text=text: self.generate(text), sleep=self.sleep): text
+                for text in todo
+            }
+            for future in as_completed(futures):
+                text = futures[future]
+                try:
+                    audio_url = future.result()
+                except Exception as e:
+                    report.failed[text] = str(e)
+                    continue
+                if not audio_url:
+                    report.failed[text] = "No audio generated"
+                    continue
+                self._record(text, audio_url)
+                report.synthesized += 1
+                self._flush(report)
+
+        self._flush(report, force=True)
+        report.seconds = time.perf_counter() - start
+        return report
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+from services.audio_clip import AudioClip
+from services.audio_encoding import UPLOAD_AUDIO_BITRATE, encode_clip
+
+# Where learner recordings are archived, and how they are encoded
+RECORDINGS_DIR = os.getenv("RECORDINGS_DIR", ".cache/recordings")
+RECORDINGS_CODEC = os.getenv("RECORDINGS_CODEC", "opus").lower()
+RECORDINGS_BITRATE = os.getenv("RECORDINGS_BITRATE", UPLOAD_AUDIO_BITRATE)
+RECORDINGS_ENABLED = os.getenv("RECORDINGS_ENABLED", "true").lower() == "true"
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@dataclass
+class StoredRecording:
+    key: str
+    path: str
+    size: int
+    deduplicated: bool  # True when identical audio was already archived
+
+
+class RecordingStore:
+    """
+    Content-addressed archive of learner recordings.
+
+    A recording's key is the SHA-256 of its normalized PCM (16 kHz mono int16),
+    so the same take uploaded twice, whatever its original container, is stored
+    once. Files are encoded with RECORDINGS_CODEC and sharded by the first two
+    hex digits of the key. Metadata (session, user...) is kept next to each file
+    and can be added after the fact with `annotate`.
+    """
+
+    def __init__(self, root: str = RECORDINGS_DIR, codec: str = RECORDINGS_CODEC, bitrate: str = RECORDINGS_BITRATE):
+        self.root = root
+        self.codec = codec
+        self.bitrate = bitrate
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, List] = {}  # key -> [lock, holders]
+
+    @staticmethod
+    def key_for(clip: AudioClip) -> str:
+        return hashlib.sha256(clip.pcm_bytes).hexdigest()
+
+    def _directory(self, key: str) -> str:
+        return os.path.join(self.root, key[:2])
+
+    def path(self, key: str) -> Optional[str]:
+        """Path of the stored audio for a key, or None if it is not archived."""
+        directory = self._directory(key)
+        if not os.path.isdir(directory):
+            return None
+        for name in os.listdir(directory):
+            if name.startswith(key + ".") and not name.endswith((".json", ".tmp")):
+                return os.path.join(directory, name)
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self.path(key) is not None
+
+    def put(self, clip: AudioClip) -> StoredRecording:
+        """Archive a clip unless identical audio is already stored."""
+        key = self.key_for(clip)
+        key_lock = self._acquire_key(key)
+        try:
+            # Concurrent uploads of the same take encode it once
+            with key_lock:
+                existing = self.path(key)
+                if existing:
+                    return StoredRecording(key, existing, os.path.getsize(existing), deduplicated=True)
+
+                encoded, _ = encode_clip(clip, codec=self.codec, bitrate=self.bitrate, name=key)
+                directory = self._directory(key)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, encoded.name)
+                # Write then rename, so readers never see a half-written file
+                with open(path + ".tmp", "wb") as f:
+                    f.write(encoded.getbuffer())
+                os.replace(path + ".tmp", path)
+                return StoredRecording(key, path, os.path.getsize(path), deduplicated=False)
+        finally:
+            self._release_key(key)
+
+    def _acquire_key(self, key: str) -> threading.Lock:
+        # Reference counted, so the lock stays shared until its last waiter is done with it
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release_key(self, key: str) -> None:
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+
+    def open(self, key: str) -> BinaryIO:
+        """The encoded file, opened for reading."""
+        path = self.path(key)
+        if path is None:
+            raise KeyError(key)
+        return open(path, "rb")
+
+    def stream(self, key: str, chunk_size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+        """Yield the encoded file in chunks, without loading it whole."""
+        with self.open(key) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def load(self, key: str) -> AudioClip:
+        """Decode a stored recording (lossy codecs do not reproduce the key's exact PCM)."""
+        with self.open(key) as f:
+            return AudioClip.from_bytes(f.read())
+
+    def annotate(self, key: str, **metadata) -> None:
+        """Record who/what a stored recording belongs to; every call appends an entry."""
+        path = os.path.join(self._directory(key), key + ".json")
+        # Read, append and write under one lock so concurrent annotations are all kept
+        with self._lock:
+            entries = self.metadata(key)
+            entries.append(metadata)
+            with open(path + ".tmp", "w") as f:
+                json.dump(entries, f, default=str)
+            os.replace(path + ".tmp", path)
+
+    def metadata(self, key: str) -> List[dict]:
+        path = os.path.join(self._directory(key), key + ".json")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def keys(self) -> Iterator[str]:
+        """Every archived key, for batch jobs."""
+        if not os.path.isdir(self.root):
+            return
+        for shard in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, shard)
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith((".json", ".tmp")):
+                    yield name.split(".", 1)[0]
+
+
+# Shared archive used by the assessment flow
+recording_store = RecordingStore()
@@ -0,0 +1,53 @@
+import threading
+from typing import Any, Dict, List, Tuple
+
+from services.table_cache import TableCache, TableKey, FetchFn, table_cache
+from services.table_index import TableIndex
+
+
+class SkillRegistry:
+    """
+    skill_id -> skill row lookup for every user skills table.
+
+    One TableIndex is kept per (doc_id, table_id), so resolving a prompt's
+    skills downloads the skills table at most once per cache TTL.
+    """
+
+    def __init__(self, fetch: FetchFn, cache: TableCache = table_cache):
+        self._fetch = fetch
+        self._cache = cache
+        self._indexes: Dict[TableKey, TableIndex] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, doc_id: str, table_id: str) -> TableIndex:
+        with self._lock:
+            index = self._indexes.get((doc_id, table_id))
+            if index is None:
+                index = TableIndex(doc_id, table_id, self._fetch, key_column='skill_id', cache=self._cache)
+                self._indexes[(doc_id, table_id)] = index
+            return index
+
+    def get(self, doc_id: str, table_id: str, skill_id: Any) -> Dict[str, Any]:
+        """Return the skill row for a skill_id, or None if it does not exist."""
+        return self._index(doc_id, table_id).get(skill_id)
+
+    def resolve(self, doc_id: str, table_id: str, skill_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Look up several skills at once.
+
+        Returns:
+            (skill rows in the order of skill_ids, skill_ids that were not found)
+        """
+        index = self._index(doc_id, table_id)
+        found, missing = [], []
+        for skill_id in skill_ids:
+            skill_row = index.get(skill_id)
+            if skill_row is None:
+                missing.append(skill_id)
+            else:
+                found.append(skill_row)
+        return found, missing
+
+    def invalidate(self, doc_id: str, table_id: str) -> None:
+        """Force the next lookup in a skills table to re-download it."""
+        self._cache.invalidate(doc_id, table_id)
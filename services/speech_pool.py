@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import azure.cognitiveservices.speech as speechsdk
+
+# Distinct reference texts whose assessment configs are kept around
+ASSESSMENT_CONFIG_CACHE_SIZE = 128
+
+
+class SpeechPool:
+    """
+    Process-wide Azure Speech objects that can be shared between requests.
+
+    A SpeechConfig is built once per language and a PronunciationAssessmentConfig
+    once per (reference text, prosody) pair. Recognizers are tied to their audio
+    input so they cannot be reused; instead `recognizer` opens the service
+    connection as soon as one is created, so the handshake overlaps the rest of
+    the setup rather than delaying the first audio.
+    """
+
+    def __init__(self, speech_key: str, speech_region: str, assessment_cache_size: int = ASSESSMENT_CONFIG_CACHE_SIZE):
+        self.speech_key = speech_key
+        self.speech_region = speech_region
+        self.assessment_cache_size = assessment_cache_size
+        self._speech_configs: Dict[str, speechsdk.SpeechConfig] = {}
+        self._assessment_configs: "OrderedDict[Tuple[str, bool], speechsdk.PronunciationAssessmentConfig]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def speech_config(self, language: str) -> speechsdk.SpeechConfig:
+        with self._lock:
+            config = self._speech_configs.get(language)
+            if config is None:
+                config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.speech_region)
+                config.speech_recognition_language = language
+                self._speech_configs[language] = config
+            return config
+
+    def assessment_config(self, reference_text: str = "", prosody: bool = False) -> speechsdk.PronunciationAssessmentConfig:
+        """Scripted (with miscue detection) when there is a reference text, unscripted otherwise."""
+        key = (reference_text, prosody)
+        with self._lock:
+            config = self._assessment_configs.get(key)
+            if config is not None:
+                self._assessment_configs.move_to_end(key)
+                return config
+        config = speechsdk.PronunciationAssessmentConfig(
+            reference_text=reference_text,
+            grading_system=speechsdk.PronunciationAssessmentGradingSystem.HundredMark,
+            granularity=speechsdk.PronunciationAssessmentGranularity.Phoneme,
+            enable_miscue=bool(reference_text)
+        )
+        if prosody:
+            config.enable_prosody_assessment()
+        with self._lock:
+            self._assessment_configs[key] = config
+            while len(self._assessment_configs) > self.assessment_cache_size:
+                self._assessment_configs.popitem(last=False)
+        return config
+
+    def recognizer(self, language: str, audio_config, reference_text: str = "", prosody: bool = False,
+                   continuous: bool = False) -> speechsdk.SpeechRecognizer:
+        """A recognizer with pronunciation assessment applied and its connection already opening."""
+        recognizer = speechsdk.SpeechRecognizer(
+            speech_config=self.speech_config(language), language=language, audio_config=audio_config
+        )
+        self.assessment_config(reference_text, prosody).apply_to(recognizer)
+        try:
+            speechsdk.Connection.from_recognizer(recognizer).open(continuous)
+        except Exception as e:
+            # Not fatal: recognition opens the connection itself
+            print(f"Could not pre-open the speech connection: {e}")
+        return recognizer
+
+
+_pools: Dict[Tuple[str, str], SpeechPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_speech_pool(speech_key: str, speech_region: str) -> SpeechPool:
+    """The shared pool for these credentials (module state survives Streamlit reruns)."""
+    with _pools_lock:
+        pool = _pools.get((speech_key, speech_region))
+        if pool is None:
+            pool = _pools[(speech_key, speech_region)] = SpeechPool(speech_key, speech_region)
+        return pool
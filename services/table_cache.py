@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# How long (seconds) a cached Coda table is considered fresh
+CODA_CACHE_TTL = float(os.getenv("CODA_CACHE_TTL", "300"))
+
+TableKey = Tuple[str, str]
+FetchFn = Callable[[str, str], List[Dict[str, Any]]]
+
+
+class TableCache:
+    """
+    Process-wide cache of Coda table rows keyed by (doc_id, table_id).
+
+    Fresh entries are served from memory. Once an entry is older than the TTL
+    it is still returned immediately while a background thread re-downloads
+    the table (stale-while-revalidate). Writers call `invalidate` so the next
+    read goes back to Coda.
+    """
+
+    def __init__(self, ttl: float = CODA_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[TableKey, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._generations: Dict[TableKey, int] = {}
+        self._refreshing: set = set()
+        self._key_locks: Dict[TableKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, doc_id: str, table_id: str, fetch: FetchFn) -> List[Dict[str, Any]]:
+        """
+        Return the rows of a table, downloading them with `fetch` on a miss.
+
+        Args:
+            doc_id: Coda document ID
+            table_id: Coda table ID
+            fetch: Callable (doc_id, table_id) -> list of row dicts
+        """
+        key = (doc_id, table_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._load(key, fetch)
+
+        fetched_at, rows = entry
+        if time.monotonic() - fetched_at > self.ttl:
+            self._refresh_in_background(key, fetch)
+        return rows
+
+    def invalidate(self, doc_id: str, table_id: Optional[str] = None) -> None:
+        """Drop a cached table, or every table of a document if no table_id is given."""
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == doc_id and (table_id is None or k[1] == table_id)]
+            if table_id is not None:
+                keys.append((doc_id, table_id))
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """Drop every cached table."""
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def _key_lock(self, key: TableKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _load(self, key: TableKey, fetch: FetchFn) -> List[Dict[str, Any]]:
+        # Concurrent cold reads of the same table share a single download
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[1]
+            generation = self._generations.get(key, 0)
+            rows = fetch(*key)
+            self._store(key, rows, generation)
+            return rows
+
+    def _store(self, key: TableKey, rows: List[Dict[str, Any]], generation: int) -> None:
+        with self._lock:
+            # Skip results that were fetched before an invalidation
+            if self._generations.get(key, 0) == generation:
+                self._entries[key] = (time.monotonic(), rows)
+
+    def _refresh_in_background(self, key: TableKey, fetch: FetchFn) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            generation = self._generations.get(key, 0)
+
+        def refresh():
+            try:
+                self._store(key, fetch(*key), generation)
+            except Exception as e:
+                print(f"Error refreshing Coda table {key[1]}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+# Shared instance used by every page of the app
+table_cache = TableCache()
@@ -0,0 +1,84 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from services.table_cache import TableCache, FetchFn, table_cache
+
+# Minimum delay (seconds) between forced refreshes triggered by unknown keys
+MISS_REFRESH_INTERVAL = 30
+
+
+class TableIndex:
+    """
+    In-memory key -> row index over one column of a cached Coda table.
+
+    Rows come from the shared table cache. The index is only updated when the
+    cache hands back a new copy of the table, so a lookup is a dict access.
+    An unknown key forces one refresh (rate limited) so rows added in Coda are
+    found without waiting for the TTL. Keys are compared as strings.
+    """
+
+    def __init__(self, doc_id: str, table_id: str, fetch: FetchFn, key_column: str,
+                 cache: TableCache = table_cache,
+                 miss_refresh_interval: float = MISS_REFRESH_INTERVAL):
+        self.doc_id = doc_id
+        self.table_id = table_id
+        self.key_column = key_column
+        self.miss_refresh_interval = miss_refresh_interval
+        self._fetch = fetch
+        self._cache = cache
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._indexed_rows: Optional[List[Dict[str, Any]]] = None
+        self._last_miss_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Dict[str, Any]]:
+        """Return the row for a key, or None if no row has it."""
+        key = str(key)
+        self._sync()
+        row = self._index.get(key)
+        if row is None and self._should_refresh_on_miss():
+            self.invalidate()
+            row = self._index.get(key)
+        return row
+
+    def invalidate(self) -> None:
+        """Drop the cached table and re-index it from Coda."""
+        self._cache.invalidate(self.doc_id, self.table_id)
+        self._sync()
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._index)
+
+    def _should_refresh_on_miss(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_miss_refresh < self.miss_refresh_interval:
+                return False
+            self._last_miss_refresh = now
+            return True
+
+    def _sync(self) -> None:
+        rows = self._cache.get(self.doc_id, self.table_id, self._fetch)
+        if rows is self._indexed_rows:
+            return
+        with self._lock:
+            if rows is self._indexed_rows:
+                return
+            # Apply the new table as a diff so readers never see an empty index
+            seen = set()
+            for row in rows:
+                key = row.get(self.key_column)
+                if key is None or key == '':
+                    continue
+                key = str(key)
+                seen.add(key)
+                if self._index.get(key) != row:
+                    self._index[key] = row
+            for key in [k for k in self._index if k not in seen]:
+                del self._index[key]
+            self._indexed_rows = rows
@@ -5,6 +5,17 @@ from pydub import AudioSegment
 from openai import OpenAI
 import dotenv
 import os
+from concurrent.futures import ThreadPoolExecutor
+from services.audio_clip import AudioClip, AudioFormatError, parse_wav_header
+from services.audio_encoding import UPLOAD_AUDIO_CODEC, UPLOAD_AUDIO_BITRATE, encode_clip
+from services.transcription_backends import Transcript, TranscriptionBackend, get_transcription_backend
+from services.audio_chunking import (
+    TRANSCRIPTION_CHUNK_SECONDS, TRANSCRIPTION_CHUNK_OVERLAP_SECONDS, split_clip, stitch_transcripts, stitch_words
+)
+
+# Recordings longer than this are split and their chunks transcribed concurrently
+LONG_AUDIO_THRESHOLD_SECONDS = float(os.getenv("LONG_AUDIO_THRESHOLD_SECONDS", "60"))
+TRANSCRIPTION_MAX_WORKERS = int(os.getenv("TRANSCRIPTION_MAX_WORKERS", "4"))
 
 
 def convert_audio_to_wav(audio_bytes):
@@ -16,13 +27,35 @@ def convert_audio_to_wav(audio_bytes):
         print(f"Error converting audio to WAV: {e}")
         return None
 
+def compress_audio(audio_bytes, codec=UPLOAD_AUDIO_CODEC, bitrate=UPLOAD_AUDIO_BITRATE):
+    """
+    Downsample to 16 kHz mono and encode to a speech codec before upload.
+
+    Returns:
+        (named file object, EncodingReport); falls back to convert_audio_to_wav
+        with no report if the recording cannot be decoded.
+    """
+    try:
+        return encode_clip(AudioClip.load(audio_bytes), codec=codec, bitrate=bitrate)
+    except AudioFormatError as e:
+        print(f"Error compressing audio: {e}")
+        return convert_audio_to_wav(audio_bytes), None
+
 def get_audio_duration(audio_bytes):
     try:
+        if isinstance(audio_bytes, AudioClip):
+            return audio_bytes.duration_minutes
         # Handle both BytesIO and bytes
         if hasattr(audio_bytes, "getvalue"):
             audio_bytes = audio_bytes.getvalue()
         else:
             audio_bytes = audio_bytes
+        try:
+            # WAV duration comes straight from the header, no decoding needed
+            fmt, _, data_size = parse_wav_header(audio_bytes)
+            return data_size / fmt['block_align'] / fmt['sample_rate'] / 60
+        except AudioFormatError:
+            pass
         with io.BytesIO(audio_bytes) as audio_bio:
             audio_segment = AudioSegment.from_file(audio_bio, format="wav")
             duration_in_minutes = len(audio_segment) / (1000 * 60)  # Convert milliseconds to minutes
@@ -32,20 +65,76 @@ def get_audio_duration(audio_bytes):
         return None
 
 
-def transcribe_audio(openai_api_key, audio_bio, language=None):
+def transcribe_audio(openai_api_key, audio_bio, language=None, backend=None, word_timestamps=False):
+    """
+    Transcribe a recording with the configured backend (see services/transcription_backends.py).
+
+    Recordings longer than LONG_AUDIO_THRESHOLD_SECONDS go through transcribe_long_audio.
+
+    Args:
+        backend: A TranscriptionBackend or a backend name; defaults to TRANSCRIPTION_BACKEND.
+        word_timestamps: Return a Transcript with word timings instead of the text alone.
+    """
     try:
-        client = OpenAI(api_key=openai_api_key)
-        result = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_bio,
-            language=language
-        )
-        return result.text
+        if not isinstance(backend, TranscriptionBackend):
+            backend = get_transcription_backend(backend, openai_api_key)
+        transcribe = backend.transcribe_timed if word_timestamps else backend.transcribe
+        try:
+            clip = AudioClip.load(audio_bio)
+        except AudioFormatError:
+            # Let the backend deal with whatever we could not decode
+            return transcribe(audio_bio, language=language)
+        if clip.duration_seconds > LONG_AUDIO_THRESHOLD_SECONDS:
+            return transcribe_long_audio(openai_api_key, clip, language=language, backend=backend, word_timestamps=word_timestamps)
+        return transcribe(clip, language=language)
     except Exception as e:
         print(f"Error transcribing audio: {e}")
         return None
 
 
+def transcribe_long_audio(
+    openai_api_key,
+    audio,
+    language=None,
+    backend=None,
+    chunk_seconds=TRANSCRIPTION_CHUNK_SECONDS,
+    overlap_seconds=TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+    max_workers=TRANSCRIPTION_MAX_WORKERS,
+    word_timestamps=False
+):
+    """
+    Transcribe a long recording as overlapping chunks, cut at quiet points, in parallel.
+
+    Returns:
+        The stitched transcription (a Transcript if `word_timestamps`), or None if any chunk failed.
+    """
+    if not isinstance(backend, TranscriptionBackend):
+        backend = get_transcription_backend(backend, openai_api_key)
+    chunks = split_clip(AudioClip.load(audio), chunk_seconds, overlap_seconds)
+
+    def transcribe(chunk):
+        if word_timestamps:
+            transcript = backend.transcribe_timed(chunk, language=language)
+            # Chunk timings start at 0; move them to where the chunk sits in the recording
+            return transcript.shifted(chunk.offset_seconds) if transcript is not None else None
+        return backend.transcribe(chunk, language=language)
+
+    if len(chunks) == 1:
+        return transcribe(chunks[0])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        results = list(executor.map(transcribe, chunks))
+    # A transcript with a hole in it would be scored as if the learner skipped that part
+    if any(result is None for result in results):
+        return None
+    if not word_timestamps:
+        return stitch_transcripts(results)
+    return Transcript(
+        stitch_transcripts([result.text for result in results]),
+        stitch_words([result.words for result in results], text_of=lambda word: word.word)
+    )
+
+
 def whisper_stt(openai_api_key=None, start_prompt="▶️ Start recording", stop_prompt="⏹️ Stop recording", just_once=False,
                use_container_width=False, language=None, callback=None, args=(), kwargs=None, key=None):
     if not 'openai_client' in st.session_state:
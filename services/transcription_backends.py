@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import OpenAI
+from services.audio_clip import AudioClip, AudioFormatError
+from services.audio_encoding import EncodingReport, encode_clip
+
+# Which engine transcribes recordings: "openai" (whisper-1 API) or "local" (CTranslate2 Whisper)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai").lower()
+
+# Local backend settings
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_WHISPER_DEVICE = os.getenv("LOCAL_WHISPER_DEVICE", "cpu")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+LOCAL_WHISPER_BEAM_SIZE = int(os.getenv("LOCAL_WHISPER_BEAM_SIZE", "5"))
+LOCAL_WHISPER_CPU_THREADS = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", "0"))  # 0 = CTranslate2 default
+
+
+@dataclass
+class TimedWord:
+    """A recognized word and when it was spoken, in seconds from the start of the recording."""
+    word: str
+    start: float
+    end: float
+
+
+@dataclass
+class Transcript:
+    """A transcription with its word timings (empty when the backend cannot provide them)."""
+    text: str
+    words: List[TimedWord] = field(default_factory=list)
+
+    def shifted(self, seconds: float) -> "Transcript":
+        """The same transcript with every word moved later by `seconds`."""
+        return Transcript(self.text, [TimedWord(w.word, w.start + seconds, w.end + seconds) for w in self.words])
+
+
+class TranscriptionBackend(ABC):
+    """Turns a recording into text. Subclasses implement `transcribe` and, if they can, `transcribe_timed`."""
+
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Optional[str]:
+        """
+        Args:
+            audio: An AudioClip, a named file object (e.g. BytesIO with .name) or raw bytes.
+            language: ISO-639-1 code, or None to let the model detect it.
+        Returns:
+            The transcription, or None if it failed.
+        """
+
+    def transcribe_timed(self, audio: Any, language: Optional[str] = None) -> Optional[Transcript]:
+        """Like `transcribe`, with word-level timestamps when the backend supports them."""
+        text = self.transcribe(audio, language=language)
+        return Transcript(text) if text is not None else None
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """
+    The hosted whisper-1 API.
+
+    Recordings are encoded to UPLOAD_AUDIO_CODEC before upload; the size and
+    timings of the latest request are kept in `last_report`.
+    """
+
+    name = "openai"
+
+    def __init__(self, openai_api_key: Optional[str] = None, model: str = "whisper-1"):
+        self.client = OpenAI(api_key=openai_api_key or os.getenv("OPENAI_API_KEY"))
+        self.model = model
+        self.last_report: Optional[EncodingReport] = None
+
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Optional[str]:
+        result = self._request(audio, language)
+        return result.text if result is not None else None
+
+    def transcribe_timed(self, audio: Any, language: Optional[str] = None) -> Optional[Transcript]:
+        result = self._request(audio, language, response_format="verbose_json", timestamp_granularities=["word"])
+        if result is None:
+            return None
+        words = [TimedWord(w.word, w.start, w.end) for w in (getattr(result, "words", None) or [])]
+        return Transcript(result.text, words)
+
+    def _request(self, audio: Any, language: Optional[str], **options):
+        report = None
+        try:
+            audio, report = encode_clip(AudioClip.load(audio))
+        except (AudioFormatError, ImportError):
+            pass  # upload as-is and let the API decide
+        try:
+            start = time.perf_counter()
+            result = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=audio,
+                language=language,
+                **options
+            )
+            if report:
+                report.request_seconds = time.perf_counter() - start
+                self.last_report = report
+                print(f"Whisper upload: {report.summary()}")
+            return result
+        except Exception as e:
+            print(f"Error transcribing audio: {e}")
+            return None
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Whisper running on this machine through CTranslate2 (faster-whisper).
+
+    The model is loaded on first use and shared by every instance with the same
+    settings, so a Streamlit process only pays the load once. Audio is handed
+    over as the decoded 16 kHz float array, which skips a second ffmpeg decode.
+    """
+
+    name = "local"
+
+    _models: Dict[Tuple[str, str, str, int], Any] = {}
+    _models_lock = threading.Lock()
+
+    def __init__(
+        self,
+        model_size: str = LOCAL_WHISPER_MODEL,
+        device: str = LOCAL_WHISPER_DEVICE,
+        compute_type: str = LOCAL_WHISPER_COMPUTE_TYPE,
+        beam_size: int = LOCAL_WHISPER_BEAM_SIZE,
+        cpu_threads: int = LOCAL_WHISPER_CPU_THREADS
+    ):
+        self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.cpu_threads = cpu_threads
+
+    @property
+    def model(self):
+        key = (self.model_size, self.device, self.compute_type, self.cpu_threads)
+        with self._models_lock:
+            if key not in self._models:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as e:
+                    raise ImportError("The local transcription backend needs faster-whisper (pip install faster-whisper)") from e
+                self._models[key] = WhisperModel(
+                    self.model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads
+                )
+            return self._models[key]
+
+    def transcribe(self, audio: Any, language: Optional[str] = None) -> Optional[str]:
+        transcript = self._run(audio, language, word_timestamps=False)
+        return transcript.text if transcript is not None else None
+
+    def transcribe_timed(self, audio: Any, language: Optional[str] = None) -> Optional[Transcript]:
+        return self._run(audio, language, word_timestamps=True)
+
+    def _run(self, audio: Any, language: Optional[str], word_timestamps: bool) -> Optional[Transcript]:
+        try:
+            clip = AudioClip.load(audio)
+            segments, _ = self.model.transcribe(
+                clip.float_samples(), language=language, beam_size=self.beam_size, word_timestamps=word_timestamps
+            )
+            # Segments are generated lazily; iterating them runs the decoding
+            texts, words = [], []
+            for segment in segments:
+                texts.append(segment.text.strip())
+                words.extend(TimedWord(w.word.strip(), w.start, w.end) for w in (segment.words or []))
+            return Transcript(" ".join(texts).strip(), words)
+        except Exception as e:
+            print(f"Error transcribing audio locally: {e}")
+            return None
+
+
+def get_transcription_backend(name: Optional[str] = None, openai_api_key: Optional[str] = None) -> TranscriptionBackend:
+    """Build the configured backend (TRANSCRIPTION_BACKEND unless `name` is given)."""
+    name = (name or TRANSCRIPTION_BACKEND).lower()
+    if name == "local":
+        return LocalWhisperBackend()
+    if name == "openai":
+        return OpenAIWhisperBackend(openai_api_key)
+    raise ValueError(f"Unknown transcription backend: {name}")
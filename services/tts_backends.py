@@ -0,0 +1,223 @@
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from services.audio_clip import TARGET_SAMPLE_RATE, encode_wav
+
+# Which text-to-speech engine generates prompt audio: "elevenlabs" or "local"
+TTS_BACKEND = os.getenv("TTS_BACKEND", "elevenlabs").lower()
+
+# Simulated service timing for the local synthesizer: delay before the first
+# chunk, and seconds spent per second of audio produced (0 = as fast as possible)
+LOCAL_TTS_LATENCY_SECONDS = float(os.getenv("LOCAL_TTS_LATENCY_SECONDS", "0"))
+LOCAL_TTS_REALTIME_FACTOR = float(os.getenv("LOCAL_TTS_REALTIME_FACTOR", "0"))
+
+# TODO: gender and age specific voices
+
+# List of Voice IDs to choose from
+VOICE_IDS = [
+    "F1toM6PcP54s45kOOAyV", # Mademoiselle French
+    "70QakWcpr1EAWDdnypvd", # 35 yo North East Parisian smoker "Meuf"
+    "ufWL6S7fryuQBD3Y5J3I", # Jeremy Conversational
+    "5Qfm4RqcAer0xoyWtoHC", # Maxime - French Young male
+    "TQaDhGYcKI0vrQueAmVO", # Lucien
+    "ohItIVrXTBI80RrUECOD" # Guillaume - Narration
+    # Add as many as you want
+]
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
+TTS_OUTPUT_FORMAT = "mp3_22050_32"
+TTS_VOICE_SETTINGS = {
+    "stability": 0.0,
+    "similarity_boost": 1.0,
+    "style": 0.0,
+    "use_speaker_boost": True,
+}
+
+
+def voice_for(text: str) -> str:
+    """Pick a voice from VOICE_IDS by hashing the text, so a prompt always gets the same (cacheable) voice."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return VOICE_IDS[int.from_bytes(digest[:4], "big") % len(VOICE_IDS)]
+
+
+class TTSBackend(ABC):
+    """Interface shared by the text-to-speech engines."""
+
+    name = "base"
+    output_format = ""
+
+    @property
+    def extension(self) -> str:
+        return self.output_format.split("_", 1)[0]
+
+    @abstractmethod
+    def cache_parts(self, voice_id: str) -> Dict[str, Any]:
+        """Everything besides the text that changes the audio, for the TTS cache key."""
+
+    @abstractmethod
+    def synthesize(self, text: str, voice_id: str) -> Iterator[bytes]:
+        """
+        Generate speech for `text`.
+
+        Returns:
+            The encoded audio as an iterator of byte chunks, produced as they become available.
+        """
+
+
+class ElevenLabsBackend(TTSBackend):
+    """ElevenLabs text-to-speech; the response is streamed back in chunks."""
+
+    name = "elevenlabs"
+    output_format = TTS_OUTPUT_FORMAT
+
+    _clients: Dict[str, Any] = {}
+    _clients_lock = threading.Lock()
+
+    def __init__(self, api_key: Optional[str] = None, model_id: str = TTS_MODEL_ID,
+                 voice_settings: Optional[Dict[str, Any]] = None):
+        self.api_key = api_key or os.getenv("ELEVEN_LABS_API_KEY")
+        self.model_id = model_id
+        self.voice_settings = voice_settings or TTS_VOICE_SETTINGS
+
+    @property
+    def client(self):
+        # One client (and connection pool) per API key for the whole process
+        with self._clients_lock:
+            client = self._clients.get(self.api_key)
+            if client is None:
+                from elevenlabs.client import ElevenLabs
+                client = self._clients[self.api_key] = ElevenLabs(api_key=self.api_key)
+            return client
+
+    def cache_parts(self, voice_id: str) -> Dict[str, Any]:
+        return {
+            'voice_id': voice_id,
+            'model_id': self.model_id,
+            'output_format': self.output_format,
+            'voice_settings': self.voice_settings
+        }
+
+    def synthesize(self, text: str, voice_id: str) -> Iterator[bytes]:
+        from elevenlabs import VoiceSettings
+
+        # Call the Eleven Labs API for text-to-speech conversion (the response is streamed)
+        return self.client.text_to_speech.convert(
+            voice_id=voice_id,
+            output_format=self.output_format,
+            text=text,
+            model_id=self.model_id,
+            voice_settings=VoiceSettings(**self.voice_settings),
+        )
+
+
+# First two formants (Hz) of the vowels the local synthesizer can say
+VOWEL_FORMANTS = {
+    'a': (800, 1250), 'e': (450, 1900), 'i': (300, 2300),
+    'o': (480, 850), 'u': (320, 800), 'y': (300, 1800)
+}
+SYLLABLE_SECONDS = 0.16
+CONSONANT_SECONDS = 0.04
+WORD_GAP_SECONDS = 0.06
+PUNCTUATION_GAP_SECONDS = {',': 0.25, ';': 0.25, ':': 0.25, '.': 0.45, '!': 0.45, '?': 0.45}
+LOCAL_TTS_CHUNK_SECONDS = 0.25
+
+
+class LocalTTSBackend(TTSBackend):
+    """
+    Deterministic offline synthesizer, for benchmarks and load tests without network access.
+
+    Each vowel group of the text becomes a harmonic tone shaped by that vowel's
+    formants, consonants become short noise bursts, and spaces and punctuation
+    become silences, so the audio has roughly the length and rhythm of real
+    speech. The voice ID only sets the pitch. The same text and voice always
+    give the same bytes. `latency_seconds` and `realtime_factor` simulate a
+    remote service: a delay before the first chunk, then chunks released at
+    `realtime_factor` times the audio's duration.
+    """
+
+    name = "local"
+    output_format = f"wav_{TARGET_SAMPLE_RATE}"
+
+    def __init__(self, latency_seconds: float = LOCAL_TTS_LATENCY_SECONDS,
+                 realtime_factor: float = LOCAL_TTS_REALTIME_FACTOR, sample_rate: int = TARGET_SAMPLE_RATE):
+        self.latency_seconds = latency_seconds
+        self.realtime_factor = realtime_factor
+        self.sample_rate = sample_rate
+
+    def cache_parts(self, voice_id: str) -> Dict[str, Any]:
+        # Simulated latency does not change the audio, so it is not part of the key
+        return {'backend': self.name, 'voice_id': voice_id, 'output_format': self.output_format}
+
+    def render(self, text: str, voice_id: str) -> np.ndarray:
+        """The int16 samples for `text`."""
+        seed = hashlib.sha256(f"{voice_id}\n{text}".encode("utf-8")).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], "big"))
+        pitch = 100.0 + int.from_bytes(hashlib.sha256(voice_id.encode("utf-8")).digest()[:2], "big") % 120
+
+        # Strip accents so "é" is said like "e"
+        plain = unicodedata.normalize("NFD", text.lower())
+        plain = "".join(c for c in plain if unicodedata.category(c) != "Mn")
+
+        parts = []
+        for token in re.findall(r"[a-z]+|[.,;:!?]", plain):
+            if token in PUNCTUATION_GAP_SECONDS:
+                parts.append(self._silence(PUNCTUATION_GAP_SECONDS[token]))
+                continue
+            for consonants, vowels in re.findall(r"([^aeiouy]*)([aeiouy]*)", token):
+                if consonants:
+                    parts.append(self._noise(rng, CONSONANT_SECONDS))
+                if vowels:
+                    parts.append(self._vowel(VOWEL_FORMANTS[vowels[0]], pitch))
+                    pitch *= 0.99  # gentle declination over the sentence
+            parts.append(self._silence(WORD_GAP_SECONDS))
+
+        if not parts:
+            return np.zeros(0, dtype=np.int16)
+        samples = np.concatenate(parts)
+        return (np.clip(samples, -1.0, 1.0) * 20000).astype(np.int16)
+
+    def _silence(self, seconds: float) -> np.ndarray:
+        return np.zeros(int(seconds * self.sample_rate))
+
+    def _noise(self, rng: np.random.Generator, seconds: float) -> np.ndarray:
+        return rng.standard_normal(int(seconds * self.sample_rate)) * 0.08 * np.hanning(int(seconds * self.sample_rate))
+
+    def _vowel(self, formants, pitch: float) -> np.ndarray:
+        t = np.arange(int(SYLLABLE_SECONDS * self.sample_rate)) / self.sample_rate
+        harmonics = np.arange(1, int(4000 // pitch) + 1) * pitch
+        # Resonance of each harmonic at the vowel's formants (bandwidth ~100 Hz)
+        gains = sum(1.0 / (1.0 + ((harmonics - f) / 100.0) ** 2) for f in formants)
+        tone = np.sin(2 * np.pi * np.outer(harmonics, t)).T @ gains
+        return tone / max(np.abs(tone).max(), 1e-9) * 0.8 * np.hanning(len(t))
+
+    def synthesize(self, text: str, voice_id: str) -> Iterator[bytes]:
+        start = time.perf_counter()
+        samples = self.render(text, voice_id)
+        data = encode_wav(samples, self.sample_rate)
+        chunk_bytes = int(LOCAL_TTS_CHUNK_SECONDS * self.sample_rate) * 2
+        # The first chunk leaves after `latency_seconds`, the rest at the simulated synthesis speed
+        ready_at = start + self.latency_seconds
+        for offset in range(0, len(data), chunk_bytes):
+            delay = ready_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            yield data[offset:offset + chunk_bytes]
+            ready_at += LOCAL_TTS_CHUNK_SECONDS * self.realtime_factor
+
+
+def get_tts_backend(name: Optional[str] = None) -> TTSBackend:
+    """Build the configured backend (TTS_BACKEND unless `name` is given)."""
+    name = (name or TTS_BACKEND).lower()
+    if name == "local":
+        return LocalTTSBackend()
+    if name == "elevenlabs":
+        return ElevenLabsBackend()
+    raise ValueError(f"Unknown TTS backend: {name}")
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from services.audio_store import AudioStore
+
+# Generated prompt audio lives where Streamlit serves static files from
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".streamlit/static/generated_audio")
+# Per-request timings kept for inspection
+TTS_METRICS_HISTORY = 200
+
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+@dataclass
+class SynthesisMetrics:
+    """Timing of one text-to-speech request, from the call to the last byte."""
+    key: str
+    cached: bool
+    ttfb_seconds: Optional[float] = None   # until the first audio chunk
+    total_seconds: float = 0.0
+    bytes: int = 0
+    complete: bool = False                 # False when the stream failed or its reader stopped early
+    error: Optional[str] = None            # set when it failed
+
+    @property
+    def status(self) -> str:
+        if self.complete:
+            return "complete"
+        return "failed" if self.error else "abandoned"
+
+    def summary(self) -> str:
+        source = "cache" if self.cached else "synthesized"
+        ttfb = f"{self.ttfb_seconds * 1000:.0f} ms" if self.ttfb_seconds is not None else "no audio"
+        summary = f"{source}, first byte {ttfb}, total {self.total_seconds * 1000:.0f} ms, {self.bytes / 1024:.1f} KB"
+        if not self.complete:
+            summary += f", {self.status}" + (f": {self.error}" if self.error else "")
+        return summary
+
+
+class TTSCache:
+    """
+    Content-addressed store of synthesized speech.
+
+    A file's name is the hash of everything that influences the audio (text,
+    voice, model, output format, voice settings), so a prompt that was already
+    synthesized is served from disk without calling the TTS API. Concurrent
+    requests for the same key wait on a single synthesis. The directory is
+    kept under its disk budget by an AudioStore, which evicts the least
+    recently served files.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIR, store: Optional[AudioStore] = None):
+        self.directory = directory
+        self.store = store or AudioStore(directory)
+        self.hits = 0
+        self.misses = 0
+        self.recent_metrics: Deque[SynthesisMetrics] = deque(maxlen=TTS_METRICS_HISTORY)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, List] = {}  # key -> [lock, holders]
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Hash the inputs of a synthesis into a cache key."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def get(self, key: str, extension: str) -> Optional[str]:
+        """Path of the cached audio for a key, or None if it has not been synthesized."""
+        path = self.path(key, extension)
+        return path if os.path.exists(path) else None
+
+    def serve(self, key: str, extension: str) -> Optional[str]:
+        """
+        Path of the cached audio for a key when it is about to be served, or None on a miss.
+
+        A hit refreshes the file's place in the store's LRU order and is counted in
+        `stats`; a miss is not counted, since the caller then goes through `stream`.
+        """
+        path = self.get(key, extension)
+        if path:
+            self.store.touch(os.path.basename(path))
+            with self._lock:
+                self.hits += 1
+        return path
+
+    def get_or_synthesize(self, key: str, extension: str, synthesize: Callable[[], Iterable[bytes]]) -> Optional[str]:
+        """
+        Return the cached file for a key, calling `synthesize` only if there is none.
+
+        Args:
+            key: Cache key from make_key.
+            extension: File extension matching the output format (e.g. 'mp3').
+            synthesize: Returns the audio as an iterable of byte chunks.
+
+        Returns:
+            The file path, or None if the synthesis produced no audio.
+        """
+        for _ in self.stream(key, extension, synthesize):
+            pass
+        return self.get(key, extension)
+
+    def stream(self, key: str, extension: str, synthesize: Callable[[], Iterable[bytes]],
+               on_metrics: Optional[Callable[[SynthesisMetrics], None]] = None) -> Iterator[bytes]:
+        """
+        Yield the audio for a key as it becomes available.
+
+        On a miss, chunks are passed on as soon as the TTS API sends them while
+        being written to the cache; on a hit the cached file is read back in
+        chunks. Timing is recorded in `recent_metrics` when the stream ends,
+        including streams that fail or are closed early (see SynthesisMetrics.status).
+        """
+        started = time.perf_counter()
+        metrics = SynthesisMetrics(key=key, cached=True)
+
+        def record(chunk: bytes) -> bytes:
+            if metrics.bytes == 0:
+                metrics.ttfb_seconds = time.perf_counter() - started
+            metrics.bytes += len(chunk)
+            return chunk
+
+        try:
+            existing = self.get(key, extension)
+            if existing:
+                self.store.touch(os.path.basename(existing))
+                yield from (record(chunk) for chunk in self._read(existing))
+            else:
+                key_lock = self._acquire_key(key)
+                try:
+                    with key_lock:
+                        # Another request may have synthesized it while we waited
+                        existing = self.get(key, extension)
+                        if existing:
+                            self.store.touch(os.path.basename(existing))
+                            yield from (record(chunk) for chunk in self._read(existing))
+                        else:
+                            metrics.cached = False
+                            yield from (record(chunk) for chunk in self._synthesize(key, extension, synthesize))
+                finally:
+                    self._release_key(key)
+            metrics.complete = True
+        except Exception as e:
+            metrics.error = str(e) or type(e).__name__
+            raise
+        finally:
+            # Failed and abandoned streams are recorded too
+            self._record_metrics(metrics, started, on_metrics)
+
+    def _record_metrics(self, metrics: SynthesisMetrics, started: float,
+                        on_metrics: Optional[Callable[[SynthesisMetrics], None]]) -> None:
+        metrics.total_seconds = time.perf_counter() - started
+        with self._lock:
+            if metrics.cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.recent_metrics.append(metrics)
+        print(f"Text-to-speech: {metrics.summary()}")
+        if on_metrics:
+            on_metrics(metrics)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and first-byte latency for this process plus what is stored on disk."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+            ttfbs = [m.ttfb_seconds for m in self.recent_metrics if not m.cached and m.ttfb_seconds is not None]
+        stats["mean_synthesis_ttfb_seconds"] = round(sum(ttfbs) / len(ttfbs), 3) if ttfbs else None
+        stats.update(self.store.stats())
+        return stats
+
+    def _acquire_key(self, key: str) -> threading.Lock:
+        # Reference counted, so the lock stays shared until its last waiter is done with it
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+            return entry[0]
+
+    def _release_key(self, key: str) -> None:
+        with self._lock:
+            entry = self._key_locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._key_locks[key]
+
+    def _read(self, path: str) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    return
+                yield chunk
+
+    def _synthesize(self, key: str, extension: str, synthesize: Callable[[], Iterable[bytes]]) -> Iterator[bytes]:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key, extension)
+        # Write to a temp file of our own, then rename, so the player never gets a half-written file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=key + ".", suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in synthesize():
+                    if chunk:
+                        f.write(chunk)
+                        size += len(chunk)
+                        yield chunk
+            if size == 0:
+                print(f"Text-to-speech returned no audio for {key}")
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, path)
+            self.store.add(os.path.basename(path), size)
+        except BaseException:
+            # Includes the reader stopping early: a partial file must not be served later
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Shared cache used by the TTS generator
+tts_cache = TTSCache()
@@ -1,61 +1,65 @@
-import requests
-import random
-import os
-import uuid
-from elevenlabs import VoiceSettings
-from elevenlabs import play
-from elevenlabs.client import ElevenLabs
 from dotenv import load_dotenv
 
-load_dotenv() 
-
-
-# Define the Eleven Labs API Key
-ELEVEN_LABS_API_KEY = os.getenv("ELEVEN_LABS_API_KEY")
-
-client = ElevenLabs(api_key=ELEVEN_LABS_API_KEY)
-
-# TODO: gender and age specific voices
-
-# List of Voice IDs to choose from
-VOICE_IDS = [
-    "F1toM6PcP54s45kOOAyV", # Mademoiselle French
-    "70QakWcpr1EAWDdnypvd", # 35 yo North East Parisian smoker "Meuf"
-    "ufWL6S7fryuQBD3Y5J3I", # Jeremy Conversational
-    "5Qfm4RqcAer0xoyWtoHC", # Maxime - French Young male
-    "TQaDhGYcKI0vrQueAmVO", # Lucien
-    "ohItIVrXTBI80RrUECOD" # Guillaume - Narration
-    # Add as many as you want
-]
-
-selected_voice_id = random.choice(VOICE_IDS)
-
-def generate_audio(text):
-    # Generate a unique filename with the .mp3 extension
-    filename = f"{uuid.uuid4()}.mp3"
-    save_dir = ".streamlit/static/generated_audio"
-    os.makedirs(save_dir, exist_ok=True)  # Ensure the directory exists
-    file_path = os.path.join(save_dir, filename)
-
-
-    # Call the Eleven Labs API for text-to-speech conversion
-    response = client.text_to_speech.convert(
-        voice_id=selected_voice_id,
-        output_format="mp3_22050_32",
-        text=text,
-        model_id="eleven_multilingual_v2",  # Use turbo model for low latency
-        voice_settings=VoiceSettings(
-            stability=0.0,
-            similarity_boost=1.0,
-            style=0.0,
-            use_speaker_boost=True,
-        ),
-    )
-
-    with open(file_path, "wb") as f:
-        for chunk in response:
-            if chunk:
-                f.write(chunk)
-
-    # Return a URL path that Streamlit can serve
-    return f".streamlit/static/generated_audio/{filename}"
\ No newline at end of file
+# Before the backends module reads TTS_BACKEND and the API key
+load_dotenv()
+
+from services.tts_backends import get_tts_backend, voice_for
+from services.tts_cache import tts_cache
+from services.tts_server import tts_stream_server
+
+
+def _tts_request(text, voice_id=None, backend=None):
+    """Cache key, file extension and synthesis call for a prompt."""
+    backend = backend or get_tts_backend()
+    voice_id = voice_id or voice_for(text)
+    key = tts_cache.make_key(text=text, **backend.cache_parts(voice_id))
+    return key, backend.extension, lambda: backend.synthesize(text, voice_id)
+
+
+def generate_audio(text, voice_id=None, backend=None):
+    """
+    Synthesize `text`, or reuse the file from an earlier identical request.
+
+    Args:
+        text: The prompt text to read out.
+        voice_id: Voice to use; defaults to voice_for(text).
+        backend: A TTSBackend; defaults to the one selected by TTS_BACKEND (ElevenLabs).
+
+    Returns:
+        The path of the audio file (servable by Streamlit), or None if nothing was generated.
+    """
+    return tts_cache.get_or_synthesize(*_tts_request(text, voice_id, backend))
+
+
+def stream_audio(text, voice_id=None, on_metrics=None, backend=None):
+    """
+    Yield the audio of `text` chunk by chunk as the TTS backend produces it.
+
+    The chunks are saved to the TTS cache at the same time, so the next request
+    for the same prompt is served from disk. Time to first byte and total time
+    are logged and passed to `on_metrics` (a SynthesisMetrics) when the stream ends.
+    """
+    key, extension, synthesize = _tts_request(text, voice_id, backend)
+    return tts_cache.stream(key, extension, synthesize, on_metrics=on_metrics)
+
+
+def prompt_audio_url(text, voice_id=None, backend=None):
+    """
+    Where the prompt player should load the audio of `text` from, without waiting for synthesis.
+
+    Cached audio is returned as its file path. Otherwise, when streaming is enabled
+    (TTS_STREAM_PUBLIC_URL), the prompt is registered with the streaming server and its URL
+    is returned: the browser starts playing on the first chunk and the file is cached for
+    next time. Without streaming, or if the server cannot start, the file is synthesized first.
+    """
+    key, extension, synthesize = _tts_request(text, voice_id, backend)
+    cached = tts_cache.serve(key, extension)
+    if cached:
+        return cached
+    if not tts_stream_server.enabled:
+        return tts_cache.get_or_synthesize(key, extension, synthesize)
+    try:
+        return tts_stream_server.url_for(key, extension, synthesize)
+    except OSError as e:
+        print(f"Could not start the TTS stream server: {e}")
+        return tts_cache.get_or_synthesize(key, extension, synthesize)
@@ -0,0 +1,121 @@
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional, Tuple
+
+from services.tts_cache import TTSCache, tts_cache
+
+# Where the prompt player fetches streamed audio from. Streaming is off unless TTS_STREAM_PUBLIC_URL
+# is set to an address every learner's browser can reach (e.g. TTS_STREAM_PORT behind the same
+# proxy as Streamlit); prompts are then synthesized to a file before playing, as before
+TTS_STREAM_HOST = os.getenv("TTS_STREAM_HOST", "127.0.0.1")
+TTS_STREAM_PORT = int(os.getenv("TTS_STREAM_PORT", "8765"))
+TTS_STREAM_PUBLIC_URL = os.getenv("TTS_STREAM_PUBLIC_URL")
+
+# Prompts registered for streaming that have not been fetched yet
+MAX_PENDING_STREAMS = 256
+
+CONTENT_TYPES = {'mp3': "audio/mpeg", 'wav': "audio/wav", 'pcm': "audio/L16", 'ulaw': "audio/basic"}
+
+SynthesisRequest = Tuple[str, Callable[[], Iterable[bytes]]]
+
+
+class TTSStreamServer:
+    """
+    Small HTTP server that plays prompt audio while it is being synthesized.
+
+    Only prompts registered with `url_for` can be fetched (the endpoint cannot
+    be used to synthesize arbitrary text). GET /tts/<key>.<ext> answers with a
+    chunked response fed by TTSCache.stream, so the browser's <audio> element
+    starts playing on the first chunk while the file is saved to the cache.
+    """
+
+    def __init__(self, cache: TTSCache = tts_cache, host: str = TTS_STREAM_HOST, port: int = TTS_STREAM_PORT,
+                 public_url: Optional[str] = TTS_STREAM_PUBLIC_URL):
+        self.cache = cache
+        self.host = host
+        self.port = port
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self._pending: "OrderedDict[str, SynthesisRequest]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the player may be given stream URLs (only with an explicit public URL)."""
+        return self.public_url is not None
+
+    def url_for(self, key: str, extension: str, synthesize: Callable[[], Iterable[bytes]]) -> str:
+        """Register a synthesis and return the URL that streams it (starting the server if needed)."""
+        self.start()
+        with self._lock:
+            self._pending[key] = (extension, synthesize)
+            self._pending.move_to_end(key)
+            while len(self._pending) > MAX_PENDING_STREAMS:
+                self._pending.popitem(last=False)
+        base = self.public_url or f"http://localhost:{self.port}"
+        return f"{base}/tts/{key}.{extension}"
+
+    def lookup(self, name: str) -> Optional[Tuple[str, str, Callable[[], Iterable[bytes]]]]:
+        key, _, extension = name.partition(".")
+        with self._lock:
+            request = self._pending.get(key)
+        if request is None or request[0] != extension:
+            return None
+        return key, extension, request[1]
+
+    def start(self) -> None:
+        """Serve in a daemon thread; module state keeps one server across Streamlit reruns."""
+        with self._lock:
+            if self._server is not None:
+                return
+            self._server = ThreadingHTTPServer((self.host, self.port), _handler_for(self))
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="tts-stream", daemon=True).start()
+
+    def stop(self) -> None:
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+def _handler_for(server: TTSStreamServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            prefix = "/tts/"
+            found = server.lookup(self.path[len(prefix):]) if self.path.startswith(prefix) else None
+            if found is None:
+                self.send_error(404)
+                return
+            key, extension, synthesize = found
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPES.get(extension, "application/octet-stream"))
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            stream = server.cache.stream(key, extension, synthesize)
+            try:
+                for chunk in stream:
+                    self.wfile.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the player went away; the stream is recorded as abandoned
+            finally:
+                stream.close()
+
+        def log_message(self, format, *args):
+            pass  # timings are logged by the TTS cache
+
+    return Handler
+
+
+# Shared server used by the prompt player
+tts_stream_server = TTSStreamServer()
@@ -0,0 +1,16 @@
+from services.table_cache import TableCache, FetchFn, table_cache
+from services.table_index import TableIndex, MISS_REFRESH_INTERVAL
+
+
+class UserDirectory(TableIndex):
+    """
+    Username -> user row lookup over a Coda users table.
+
+    Login resolves from memory; see TableIndex for refresh behaviour.
+    """
+
+    def __init__(self, doc_id: str, table_id: str, fetch: FetchFn,
+                 cache: TableCache = table_cache,
+                 miss_refresh_interval: float = MISS_REFRESH_INTERVAL):
+        super().__init__(doc_id, table_id, fetch, key_column='username',
+                         cache=cache, miss_refresh_interval=miss_refresh_interval)
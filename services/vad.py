@@ -0,0 +1,137 @@
+import os
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from services.audio_clip import AudioClip
+
+# Trim leading and trailing silence before transcription and pronunciation assessment
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+
+VAD_FRAME_SECONDS = 0.02
+# A segment starts on a frame this far above the noise floor...
+VAD_START_DB = 10.0
+# ...and lasts while frames stay this far above it (hysteresis)
+VAD_CONTINUE_DB = 5.0
+# Quiet but noisy frames (s, f, ch) count as speech when their zero-crossing rate is this high
+VAD_FRICATIVE_ZCR = 0.25
+# The noise floor is estimated from the quietest frames, but never above this level
+VAD_MAX_NOISE_FLOOR_DB = -40.0
+# Frames below this are digital silence (e.g. the zeros a browser mic sends while warming up), not room noise
+VAD_DIGITAL_SILENCE_DB = -90.0
+VAD_MIN_SPEECH_SECONDS = 0.1
+VAD_MIN_SILENCE_SECONDS = 0.3
+VAD_PADDING_SECONDS = 0.2
+
+
+@dataclass
+class VadResult:
+    """Speech found in a clip."""
+    clip: AudioClip  # trimmed to the first and last speech segment (the original clip if none was found)
+    segments: List[Tuple[float, float]] = field(default_factory=list)  # (start, end) seconds in the original clip
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.segments)
+
+
+def frame_features(samples: np.ndarray, sample_rate: int, frame_seconds: float = VAD_FRAME_SECONDS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame level in dBFS and zero-crossing rate over non-overlapping frames.
+
+    Returns:
+        (energy_db, zcr), one value per full frame.
+    """
+    frame = max(1, int(sample_rate * frame_seconds))
+    count = len(samples) // frame
+    frames = samples[:count * frame].reshape(count, frame).astype(np.float32) / 32768.0
+    rms = np.sqrt(np.einsum('ij,ij->i', frames, frames) / frame)
+    energy_db = 20 * np.log10(np.maximum(rms, 1e-10))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(frame - 1, 1)
+    return energy_db, zcr
+
+
+def _hysteresis(start: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """Frames in a run of `keep` frames that contains at least one `start` frame."""
+    keep = keep | start
+    run_starts = keep & ~np.concatenate(([False], keep[:-1]))
+    labels = np.cumsum(run_starts) * keep  # 0 outside runs, 1..n inside
+    has_start = np.bincount(labels, weights=start, minlength=labels.max() + 1) > 0
+    has_start[0] = False
+    return has_start[labels]
+
+
+def _runs(mask: np.ndarray) -> np.ndarray:
+    """(start, end) frame indices of every run of True, end exclusive."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.column_stack((np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+
+def noise_floor(energy_db: np.ndarray) -> float:
+    """10th percentile frame level, ignoring digital silence, capped at VAD_MAX_NOISE_FLOOR_DB."""
+    audible = energy_db[energy_db > VAD_DIGITAL_SILENCE_DB]
+    if len(audible) == 0:
+        return VAD_DIGITAL_SILENCE_DB
+    return min(float(np.percentile(audible, 10)), VAD_MAX_NOISE_FLOOR_DB)
+
+
+def speech_mask(energy_db: np.ndarray, zcr: np.ndarray) -> np.ndarray:
+    """Frame-level speech / non-speech decision, before any smoothing."""
+    if len(energy_db) == 0:
+        return np.zeros(0, dtype=bool)
+    floor = noise_floor(energy_db)
+    keep = energy_db > floor + VAD_CONTINUE_DB
+    start = (energy_db > floor + VAD_START_DB) | (keep & (zcr > VAD_FRICATIVE_ZCR))
+    return _hysteresis(start, keep)
+
+
+def detect_speech(
+    clip: AudioClip,
+    min_speech_seconds: float = VAD_MIN_SPEECH_SECONDS,
+    min_silence_seconds: float = VAD_MIN_SILENCE_SECONDS,
+    padding_seconds: float = VAD_PADDING_SECONDS
+) -> VadResult:
+    """
+    Find speech with an energy + zero-crossing detector and trim the silence around it.
+
+    The noise floor is the 10th percentile frame level, leaving out digitally
+    silent frames so a zero pre-roll does not drag it down. Gaps shorter than
+    `min_silence_seconds` are bridged, segments shorter than `min_speech_seconds`
+    dropped, and every segment padded by `padding_seconds` so word onsets and
+    endings are not clipped.
+    """
+    runs = _runs(speech_mask(*frame_features(clip.samples, clip.sample_rate)))
+    if len(runs) == 0:
+        return VadResult(clip)
+
+    # Bridge short pauses, then drop blips
+    min_silence = int(round(min_silence_seconds / VAD_FRAME_SECONDS))
+    merged = [list(runs[0])]
+    for run_start, run_end in runs[1:]:
+        if run_start - merged[-1][1] < min_silence:
+            merged[-1][1] = run_end
+        else:
+            merged.append([run_start, run_end])
+    min_speech = int(round(min_speech_seconds / VAD_FRAME_SECONDS))
+    merged = [run for run in merged if run[1] - run[0] >= min_speech]
+    if not merged:
+        return VadResult(clip)
+
+    frame = max(1, int(clip.sample_rate * VAD_FRAME_SECONDS))
+    padding = int(padding_seconds * clip.sample_rate)
+    bounds = []
+    for run_start, run_end in merged:
+        lower, upper = max(0, run_start * frame - padding), min(clip.num_samples, run_end * frame + padding)
+        if bounds and lower <= bounds[-1][1]:
+            bounds[-1] = (bounds[-1][0], upper)  # padding made neighbours touch
+        else:
+            bounds.append((lower, upper))
+    segments = [(s / clip.sample_rate, e / clip.sample_rate) for s, e in bounds]
+    return VadResult(clip.slice(bounds[0][0], bounds[-1][1]), segments)
+
+
+def trim_silence(clip: AudioClip) -> AudioClip:
+    """The clip without its leading and trailing silence (a view, no copy)."""
+    return detect_speech(clip).clip
@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+
+from services.audio_clip import AudioClip
+from services.acoustic_features import extract_acoustic_features
+
+
+def syllables(seconds: float, rate: float = 4.0) -> np.ndarray:
+    """A 200 Hz tone whose loudness pulses `rate` times per second, like syllables"""
+    t = np.arange(int(seconds * 16000)) / 16000
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rate * t)
+    return (np.sin(2 * np.pi * 200 * t) * envelope * 10000).astype(np.int16)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return (np.random.default_rng(2).standard_normal(int(seconds * 16000)) * 20).astype(np.int16)
+
+
+class TestAcousticFeatures:
+    def test_pauses_and_phonation(self):
+        """Test pause counting and the phonation-time ratio inside the speaking span"""
+        samples = np.concatenate([silence(1), syllables(2), silence(0.8), syllables(2), silence(0.1), syllables(1), silence(1)])
+        features = extract_acoustic_features(AudioClip.from_pcm(samples))
+
+        assert features.pause_count == 1
+        assert abs(features.max_pause_seconds - 0.8) < 0.1
+        assert abs(features.duration_seconds - 5.9) < 0.1
+        assert 0.8 < features.phonation_time_ratio < 0.9
+
+    def test_syllable_rate(self):
+        """Test that energy pulses are counted as syllables"""
+        features = extract_acoustic_features(AudioClip.from_pcm(syllables(5, rate=4.0)))
+
+        assert 3.5 <= features.articulation_rate <= 4.5
+
+    def test_silence_gives_zeros(self):
+        """Test that a clip without speech yields empty features"""
+        features = extract_acoustic_features(AudioClip.from_pcm(silence(2)))
+
+        assert features.syllable_count == 0
+        assert features.to_dict()['pause_count'] == 0
+
+    def test_runs_in_milliseconds(self):
+        """Test that a two-minute clip is analysed well under a second"""
+        clip = AudioClip.from_pcm(syllables(120))
+        extract_acoustic_features(clip)  # warm-up (numba compilation when installed)
+
+        start = time.perf_counter()
+        extract_acoustic_features(clip)
+        assert time.perf_counter() - start < 0.5
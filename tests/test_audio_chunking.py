@@ -0,0 +1,45 @@
+import numpy as np
+
+from services.audio_clip import AudioClip
+from services.audio_chunking import chunk_bounds, find_split_points, split_clip, stitch_transcripts
+
+
+def speech_with_pauses(seconds: int, pauses: list, sample_rate: int = 16000) -> np.ndarray:
+    """Loud noise with silent half-second gaps starting at the given seconds"""
+    samples = (np.random.default_rng(0).standard_normal(seconds * sample_rate) * 5000).astype(np.int16)
+    for pause in pauses:
+        samples[int(pause * sample_rate):int((pause + 0.5) * sample_rate)] = 0
+    return samples
+
+
+class TestAudioChunking:
+    def test_cuts_land_in_pauses(self):
+        """Test that each cut is moved back into the pause before the nominal boundary"""
+        samples = speech_with_pauses(70, pauses=[27, 55])
+        cuts = find_split_points(samples, 16000, chunk_seconds=30, search_seconds=5)
+
+        assert len(cuts) == 2
+        assert 27 * 16000 <= cuts[0] < 27.5 * 16000
+        assert 55 * 16000 <= cuts[1] < 55.5 * 16000
+
+    def test_short_clip_is_not_split(self):
+        """Test that a clip shorter than one chunk is returned whole"""
+        clip = AudioClip.from_pcm(speech_with_pauses(10, pauses=[]))
+        chunks = split_clip(clip, chunk_seconds=30)
+
+        assert len(chunks) == 1
+        assert chunks[0].num_samples == clip.num_samples
+
+    def test_chunks_overlap(self):
+        """Test that neighbouring chunks share the overlap around each cut"""
+        assert chunk_bounds(100, [40, 70], overlap=5) == [(0, 45), (35, 75), (65, 100)]
+
+    def test_stitch_removes_repeated_overlap(self):
+        """Test that words heard in both chunks are kept once"""
+        texts = ["Je suis allé au marché hier.", "Marché hier, j'ai acheté des pommes", "des pommes et des poires."]
+
+        assert stitch_transcripts(texts) == "Je suis allé au marché hier. j'ai acheté des pommes et des poires."
+
+    def test_stitch_keeps_single_repeated_word(self):
+        """Test that a lone repeated word is not treated as overlap"""
+        assert stitch_transcripts(["Je pense que", "que oui"]) == "Je pense que que oui"
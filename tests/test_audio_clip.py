@@ -0,0 +1,58 @@
+import struct
+
+import numpy as np
+
+from services.audio_clip import AudioClip, encode_wav, parse_wav_header
+
+
+def make_wav(samples: np.ndarray, sample_rate: int, channels: int) -> bytes:
+    """Build a 16-bit PCM WAV file from interleaved int16 samples"""
+    data = samples.astype('<i2').tobytes()
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + len(data), b'WAVE',
+        b'fmt ', 16, 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16,
+        b'data', len(data)
+    ) + data
+
+
+class TestAudioClip:
+    def test_target_format_is_not_copied(self):
+        """Test that 16 kHz mono 16-bit WAV is wrapped without decoding"""
+        samples = np.arange(-800, 800, dtype=np.int16)
+        clip = AudioClip.from_bytes(make_wav(samples, 16000, 1))
+
+        assert np.array_equal(clip.samples, samples)
+        assert clip.samples.base is not None
+        assert clip.duration_seconds == len(samples) / 16000
+
+    def test_stereo_44k_is_downmixed_and_resampled(self):
+        """Test that other WAV layouts are converted to 16 kHz mono"""
+        frames = 44100
+        tone = (np.sin(np.arange(frames) * 2 * np.pi * 440 / 44100) * 10000).astype(np.int16)
+        clip = AudioClip.from_bytes(make_wav(np.repeat(tone, 2), 44100, 2))
+
+        assert clip.sample_rate == 16000
+        assert abs(clip.num_samples - 16000) <= 1
+        assert abs(clip.duration_seconds - 1.0) < 0.001
+        assert 9000 < np.abs(clip.samples).max() <= 10100
+
+    def test_wav_bytes_round_trip(self):
+        """Test that the re-encoded WAV has a single, valid header"""
+        samples = np.array([0, 1000, -1000, 32767, -32768], dtype=np.int16)
+        clip = AudioClip.from_pcm(samples.tobytes())
+
+        fmt, offset, size = parse_wav_header(clip.wav_bytes())
+        assert (fmt['sample_rate'], fmt['channels'], fmt['bits_per_sample']) == (16000, 1, 16)
+        assert offset == 44 and size == samples.nbytes
+        assert clip.wav_bytes().count(b'RIFF') == 1
+        assert AudioClip.from_bytes(encode_wav(samples)).samples.tolist() == samples.tolist()
+
+    def test_streaming_header_with_unknown_size(self):
+        """Test that a data chunk size of 0xFFFFFFFF falls back to the bytes present"""
+        samples = np.ones(320, dtype=np.int16)
+        wav = bytearray(make_wav(samples, 16000, 1))
+        struct.pack_into('<I', wav, 40, 0xFFFFFFFF)
+
+        fmt, offset, size = parse_wav_header(bytes(wav))
+        assert size == samples.nbytes
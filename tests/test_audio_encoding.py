@@ -0,0 +1,27 @@
+import numpy as np
+
+from services.audio_clip import AudioClip, parse_wav_header
+from services.audio_encoding import encode_clip
+
+
+class TestAudioEncoding:
+    def test_wav_codec_reports_sizes(self):
+        """Test that the WAV path returns a named, rewound file and a size report"""
+        clip = AudioClip.from_pcm(np.zeros(16000, dtype=np.int16))
+        encoded, report = encode_clip(clip, codec="wav")
+
+        assert encoded.name == "audio.wav"
+        assert encoded.tell() == 0
+        assert report.codec == "wav"
+        assert report.encoded_bytes == 16000 * 2 + 44
+        assert report.duration_seconds == 1.0
+        assert "request took" not in report.summary()
+
+    def test_unknown_codec_falls_back_to_wav(self):
+        """Test that an unsupported codec still yields an uploadable WAV"""
+        clip = AudioClip.from_pcm(np.ones(800, dtype=np.int16))
+        encoded, report = encode_clip(clip, codec="flac")
+
+        fmt, _, size = parse_wav_header(encoded.getvalue())
+        assert report.codec == "wav"
+        assert (fmt['sample_rate'], size) == (16000, 1600)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from services.audio_clip import AudioClip
+from services.audio_quality import AudioQualityError, check_audio_quality, require_audio_quality
+
+
+def tone(seconds: float, amplitude: float = 8000) -> np.ndarray:
+    t = np.arange(int(seconds * 16000)) / 16000
+    return np.sin(2 * np.pi * 200 * t) * amplitude
+
+
+def noise(seconds: float, amplitude: float = 30) -> np.ndarray:
+    return np.random.default_rng(4).standard_normal(int(seconds * 16000)) * amplitude
+
+
+def clip_of(*parts) -> AudioClip:
+    return AudioClip.from_pcm(np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16))
+
+
+class TestAudioQuality:
+    def test_good_take_passes(self):
+        """Test that clear speech between short silences has no issues"""
+        report = check_audio_quality(clip_of(noise(0.5), tone(3), noise(0.5)))
+
+        assert report.ok and report.warnings == []
+        assert report.metrics['snr_db'] > 30
+
+    def test_silence_is_rejected(self):
+        """Test that a silent take is rejected before any API call"""
+        with pytest.raises(AudioQualityError, match="silent"):
+            require_audio_quality(clip_of(noise(3, amplitude=1)))
+
+    def test_too_little_speech_is_rejected(self):
+        """Test that a take with under a second of speech is rejected"""
+        report = check_audio_quality(clip_of(noise(2), tone(0.4), noise(2)))
+
+        assert not report.ok
+        assert "longer answer" in report.errors[0]
+
+    def test_clipping(self):
+        """Test that heavy clipping rejects and light clipping warns"""
+        assert not check_audio_quality(clip_of(noise(0.5), tone(3, amplitude=60000))).ok
+
+        light = tone(3)
+        light[::100] = 32767
+        report = check_audio_quality(clip_of(noise(0.5), light))
+        assert report.ok and "distorted" in report.warnings[0]
+
+    def test_low_source_sample_rate_warns(self):
+        """Test that telephone-quality recordings are flagged"""
+        clip = clip_of(noise(0.5), tone(3))
+        clip.source_format = {'sample_rate': 11025}
+
+        assert "11025 Hz" in check_audio_quality(clip).warnings[0]
+
+    def test_zero_padded_noise_is_rejected(self):
+        """Test that leading digital silence does not make room noise pass as speech"""
+        room = noise(5, amplitude=300)
+        assert "longer answer" in check_audio_quality(clip_of(room)).errors[0]
+
+        report = check_audio_quality(clip_of(np.zeros(int(0.8 * 16000)), room))
+
+        assert not report.ok
+        assert "longer answer" in report.errors[0]
+        assert report.metrics['speech_seconds'] < 1.0
+        assert report.metrics['snr_db'] < 10
+
+    def test_zero_padding_does_not_change_the_snr(self):
+        """Test that the signal-to-noise estimate ignores digital silence"""
+        take = [noise(0.5, amplitude=300), tone(3), noise(0.5, amplitude=300)]
+        padded = check_audio_quality(clip_of(np.zeros(16000), *take)).metrics['snr_db']
+
+        assert padded == pytest.approx(check_audio_quality(clip_of(*take)).metrics['snr_db'], abs=1)
+
+    def test_resampled_input_keeps_its_source_rate(self):
+        """Test that the sample rate check sees the rate before resampling"""
+        samples = (np.sin(2 * np.pi * 200 * np.arange(3 * 8000) / 8000) * 8000).astype(np.int16)
+        report = check_audio_quality(AudioClip.from_pcm(samples, sample_rate=8000))
+
+        assert report.metrics['source_sample_rate'] == 8000
+        assert "8000 Hz" in report.warnings[0]
@@ -0,0 +1,116 @@
+import numpy as np
+
+from services.audio_service import AudioRingBuffer, LiveTranscriber
+from services.transcription_backends import TimedWord, Transcript, TranscriptionBackend
+
+
+class SegmentBackend(TranscriptionBackend):
+    """Reports each segment's length instead of calling an API"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, language=None):
+        return self.transcribe_timed(audio, language).text
+
+    def transcribe_timed(self, audio, language=None):
+        self.calls.append(audio.duration_seconds)
+        return Transcript(f"segment {len(self.calls)}", [TimedWord("segment", 0.1, 0.4)])
+
+
+def speech(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * 48000)) / 48000
+    return (np.sin(2 * np.pi * 200 * t) * 8000).astype(np.int16)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return (np.random.default_rng(3).standard_normal(int(seconds * 48000)) * 10).astype(np.int16)
+
+
+def feed(transcriber: LiveTranscriber, *parts: np.ndarray) -> None:
+    # 10 ms frames, like WebRTC delivers them
+    for part in parts:
+        for frame in np.array_split(part, max(1, len(part) // 480)):
+            transcriber.add_samples(frame, 48000)
+
+
+class TestAudioRingBuffer:
+    def test_wraps_around(self):
+        """Test that reads across the end of the buffer come back in order"""
+        ring = AudioRingBuffer(10)
+        ring.write(np.arange(8, dtype=np.int16))
+        ring.write(np.arange(8, 14, dtype=np.int16))
+
+        assert ring.read(6, 14).tolist() == list(range(6, 14))
+
+    def test_overwritten_samples_cannot_be_read(self):
+        """Test that asking for audio older than the capacity fails"""
+        ring = AudioRingBuffer(10)
+        ring.write(np.arange(25, dtype=np.int16))
+
+        assert ring.read(15, 25).tolist() == list(range(15, 25))
+        try:
+            ring.read(10, 20)
+            assert False, "expected IndexError"
+        except IndexError:
+            pass
+
+
+class TestLiveTranscriber:
+    def test_segments_are_sent_as_pauses_arrive(self):
+        """Test that each speech segment is transcribed when the pause after it ends"""
+        backend = SegmentBackend()
+        transcriber = LiveTranscriber(backend=backend)
+        for part in (silence(0.5), speech(2), silence(1), speech(1.5)):
+            # 10 ms frames, like WebRTC delivers them
+            for frame in np.array_split(part, max(1, len(part) // 480)):
+                transcriber.add_samples(frame, 48000)
+
+        assert len(backend.calls) == 1  # the second segment is still open
+        transcript = transcriber.finish()
+
+        assert transcript.text == "segment 1 segment 2"
+        assert [round(call, 1) for call in backend.calls] == [2.0, 1.5]
+        assert round(transcript.words[1].start, 1) == 3.6
+        assert transcriber.running_wpm() == round(2 / (3.5 / 60), 1)  # the segment numbers are not words
+
+    def test_recording_keeps_the_whole_take(self):
+        """Test that the full recording is read back from the ring buffer for analysis"""
+        transcriber = LiveTranscriber(backend=SegmentBackend(), buffer_seconds=5)
+        feed(transcriber, speech(1.5), silence(1), speech(1), silence(1))
+        transcriber.finish()
+
+        clip = transcriber.recording()
+        assert abs(clip.duration_seconds - 4.5) < 0.01
+        assert clip.sample_rate == 16000
+
+    def test_recording_longer_than_the_buffer_keeps_its_end(self):
+        """Test that only the ring buffer holds audio, so an over-long take keeps its last buffer_seconds"""
+        transcriber = LiveTranscriber(backend=SegmentBackend(), buffer_seconds=3)
+        feed(transcriber, speech(1.5), silence(1), speech(1), silence(1))
+        transcriber.finish()
+
+        assert abs(transcriber.recording().duration_seconds - 3.0) < 0.01
+        assert transcriber.duration_seconds == 4.5
+
+    def test_leading_digital_silence_does_not_merge_segments(self):
+        """Test that mic warm-up zeros do not drag the noise floor down and hide the pauses"""
+        backend = SegmentBackend()
+        transcriber = LiveTranscriber(backend=backend)
+        feed(transcriber, np.zeros(24000, dtype=np.int16), silence(0.5), speech(2), silence(1), speech(2), silence(1.5))
+        transcriber.finish()
+
+        assert [round(start, 1) for start, _, _ in transcriber._segments] == [1.0, 4.0]
+        assert [round(call, 1) for call in backend.calls] == [2.0, 2.0]
+
+    def test_running_wpm_counts_words_like_the_batch_path(self):
+        """Test that punctuation and elided tokens are counted as in analyze_lemmas_and_frequency"""
+        class PunctuatedBackend(SegmentBackend):
+            def transcribe_timed(self, audio, language=None):
+                return Transcript("Bonjour, c'est moi !", [])
+
+        transcriber = LiveTranscriber(backend=PunctuatedBackend())
+        feed(transcriber, silence(0.5), speech(2), silence(1))
+        transcriber.finish()
+
+        assert transcriber.running_wpm() == round(2 / (2.0 / 60), 1)
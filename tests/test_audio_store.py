@@ -0,0 +1,93 @@
+import os
+
+from services.audio_store import AudioStore
+from services.tts_cache import TTSCache
+
+
+def write(directory, name, size):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "wb") as f:
+        f.write(b"\0" * size)
+
+
+class TestAudioStore:
+    def test_least_recently_served_files_are_evicted(self, tmp_path):
+        """Test that going over budget deletes the coldest files and keeps recently served ones"""
+        directory = str(tmp_path / "audio")
+        store = AudioStore(directory, str(tmp_path / "index.sqlite3"), max_bytes=300)
+        for name in ("a.mp3", "b.mp3", "c.mp3"):
+            write(directory, name, 100)
+            store.add(name, 100)
+        store.touch("a.mp3")
+
+        write(directory, "d.mp3", 100)
+        store.add("d.mp3", 100)
+
+        assert sorted(os.listdir(directory)) == ["a.mp3", "c.mp3", "d.mp3"]
+        stats = store.stats()
+        assert (stats["files"], stats["bytes"], stats["evicted_bytes"]) == (3, 300, 100)
+
+    def test_existing_files_are_imported_once(self, tmp_path):
+        """Test that audio already on disk is indexed when the index is first opened"""
+        directory = str(tmp_path / "audio")
+        write(directory, "old.mp3", 200)
+        write(directory, "new.mp3", 200)
+        os.utime(os.path.join(directory, "old.mp3"), (1, 1))
+
+        store = AudioStore(directory, str(tmp_path / "index.sqlite3"), max_bytes=250)
+        assert store.stats()["bytes"] == 400
+        assert store.evict() == 200
+        assert os.listdir(directory) == ["new.mp3"]
+
+    def test_evicted_prompt_is_synthesized_again(self, tmp_path):
+        """Test that the TTS cache reports hit rate and recreates audio that was evicted"""
+        directory = str(tmp_path / "audio")
+        cache = TTSCache(directory, AudioStore(directory, str(tmp_path / "index.sqlite3"), max_bytes=150))
+        calls = []
+
+        def synthesize(text):
+            def run():
+                calls.append(text)
+                return [text.encode() * 100]
+            return run
+
+        cache.get_or_synthesize("a", "mp3", synthesize("a"))
+        cache.get_or_synthesize("a", "mp3", synthesize("a"))
+        cache.get_or_synthesize("b", "mp3", synthesize("b"))
+        cache.get_or_synthesize("a", "mp3", synthesize("a"))
+
+        assert calls == ["a", "b", "a"]
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 3, 0.25)
+        assert stats["files"] == 1 and stats["bytes"] == 100
+
+    def test_files_unknown_to_a_non_empty_index_are_reconciled(self, tmp_path):
+        """Test that files written behind the index's back count towards the budget once it is reopened"""
+        directory = str(tmp_path / "audio")
+        index = str(tmp_path / "index.sqlite3")
+        store = AudioStore(directory, index, max_bytes=1000)
+        write(directory, "known.mp3", 100)
+        store.add("known.mp3", 100)
+        write(directory, "gone.mp3", 100)
+        store.add("gone.mp3", 100)
+
+        write(directory, "stray.mp3", 300)
+        os.remove(os.path.join(directory, "gone.mp3"))
+        reopened = AudioStore(directory, index, max_bytes=1000)
+
+        assert (reopened.stats()["files"], reopened.stats()["bytes"]) == (2, 400)
+
+    def test_sweep_with_a_smaller_budget_uses_the_shared_store(self, tmp_path, monkeypatch):
+        """Test that delete_old_audio_files evicts through tts_cache.store so its stats see the sweep"""
+        from services import delete_audio_files
+
+        directory = str(tmp_path / "audio")
+        cache = TTSCache(directory, AudioStore(directory, str(tmp_path / "index.sqlite3"), max_bytes=1000))
+        monkeypatch.setattr(delete_audio_files, "tts_cache", cache)
+        for name in ("a", "b", "c"):
+            cache.get_or_synthesize(name, "mp3", lambda: [b"x" * 100])
+
+        assert delete_audio_files.delete_old_audio_files(max_bytes=150) == 200
+        assert cache.stats()["evicted_bytes"] == 200
+        assert cache.store.max_bytes == 1000
+        assert os.listdir(directory) == ["c.mp3"]
@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from services import dynamic_skills_analysis as analysis
+from services.llm_cache import LLMCache
+
+SKILLS = [
+    {'name': 'Grammar', 'prompt': 'Rate the grammar.'},
+    {'name': 'Vocabulary', 'prompt': 'Rate the vocabulary.'},
+    {'name': 'Fluency', 'prompt': 'Rate the fluency.'}
+]
+
+
+class FakeOpenAI:
+    """Answers chat completions from a list of canned contents and records the requests."""
+
+    def __init__(self, contents):
+        self.contents = list(contents)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.requests.append(request)
+        message = SimpleNamespace(content=self.contents.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch, tmp_path):
+    """Route the module's OpenAI client to canned answers, with an empty LLM cache."""
+    monkeypatch.setattr(analysis, "llm_cache", LLMCache(path=str(tmp_path / 'llm.sqlite3')))
+
+    def install(contents):
+        client = FakeOpenAI(contents)
+        monkeypatch.setattr(analysis, "OpenAI", lambda api_key=None: client)
+        return client
+    return install
+
+
+def evaluations(*items):
+    return json.dumps({'evaluations': [{'skill_id': i, 'score': s, 'feedback': f} for i, s, f in items]})
+
+
+class TestParseStructuredEvaluations:
+    def test_valid_response(self):
+        """Test that every well-formed evaluation is returned, with scores clamped to 0-100"""
+        content = evaluations(('s1', 80, 'Good agreement. '), ('s2', 140, 'Rich vocabulary'))
+
+        assert analysis.parse_structured_evaluations(content, ['s1', 's2']) == {
+            's1': {'score': 80, 'feedback': 'Good agreement.'},
+            's2': {'score': 100, 'feedback': 'Rich vocabulary'}
+        }
+
+    def test_missing_and_unknown_ids_are_dropped(self):
+        """Test that only the requested skill ids are kept, once each"""
+        content = evaluations(('s1', 70, 'Ok'), ('s9', 50, 'Not asked'), ('s1', 10, 'Duplicate'))
+
+        assert analysis.parse_structured_evaluations(content, ['s1', 's2']) == {'s1': {'score': 70, 'feedback': 'Ok'}}
+
+    def test_malformed_evaluations_are_dropped(self):
+        """Test that non-integer scores, empty feedback and broken JSON give no evaluation"""
+        content = evaluations(('s1', '80', 'Text score'), ('s2', True, 'Boolean score'), ('s3', 60, '  '))
+
+        assert analysis.parse_structured_evaluations(content, ['s1', 's2', 's3']) == {}
+        assert analysis.parse_structured_evaluations('{"evaluations": [', ['s1']) == {}
+        assert analysis.parse_structured_evaluations('[1, 2]', ['s1']) == {}
+        assert analysis.parse_structured_evaluations('{"evaluations": "s1"}', ['s1']) == {}
+
+
+class TestStructuredSkillsAnalysis:
+    def test_missing_skills_are_re_asked(self, fake_openai):
+        """Test that only the skills missing from the first answer are requested again"""
+        client = fake_openai([
+            evaluations(('s1', 80, 'Good grammar'), ('s3', 60, 'Some hesitations')),
+            evaluations(('s2', 70, 'Varied words'))
+        ])
+
+        results = analysis.structured_skills_analysis("Bonjour", SKILLS, "5", "Q", "C", openai_api_key="k")
+
+        assert [(r['skill'], r['score']) for r in results] == [('Grammar', 80), ('Vocabulary', 70), ('Fluency', 60)]
+        assert len(client.requests) == 2
+        retry_schema = client.requests[1]['response_format']['json_schema']['schema']
+        assert retry_schema['properties']['evaluations']['items']['properties']['skill_id']['enum'] == ['s2']
+
+    def test_falls_back_to_per_skill_evaluation(self, fake_openai):
+        """Test that skills still missing after the retries use the free-text path with the same model"""
+        client = fake_openai([
+            evaluations(('s1', 80, 'Good grammar'), ('s2', 70, 'Varied words')),
+            "not json",
+            "Score: 55. Some hesitations."
+        ])
+
+        results = analysis.structured_skills_analysis(
+            "Bonjour", SKILLS, "5", "Q", "C", openai_api_key="k", model="my-model", max_retries=1
+        )
+
+        assert [r['score'] for r in results] == [80, 70, 55]
+        assert results[2]['feedback'] == "Score: 55. Some hesitations."
+        assert 'response_format' not in client.requests[2]
+        assert [request['model'] for request in client.requests] == ['my-model'] * 3
+
+    def test_caller_model_is_used_in_structured_mode(self, fake_openai):
+        """Test that dynamic_skills_analysis passes its model to the structured path"""
+        client = fake_openai([evaluations(('s1', 80, 'Good'), ('s2', 70, 'Ok'), ('s3', 60, 'Ok'))])
+
+        analysis.dynamic_skills_analysis("Bonjour", SKILLS, "5", "Q", "C", openai_api_key="k",
+                                         model="my-model", structured=True)
+
+        assert client.requests[0]['model'] == 'my-model'
+
+
+class TestDynamicSkillsAnalysis:
+    def test_parallel_results_keep_the_input_order(self, monkeypatch):
+        """Test that skills evaluated in the thread pool come back in the order they were given"""
+        monkeypatch.setattr(analysis, "OpenAI", lambda api_key=None: None)
+        running = set()
+        overlapped = threading.Event()
+        lock = threading.Lock()
+
+        def evaluate_skill(client, skill, text, audio_duration, question, context, model):
+            with lock:
+                running.add(skill['name'])
+                if len(running) > 1:
+                    overlapped.set()
+            # The first skill finishes last
+            time.sleep({'Grammar': 0.2, 'Vocabulary': 0.1, 'Fluency': 0.0}[skill['name']])
+            with lock:
+                running.discard(skill['name'])
+            return {'skill': skill['name'], 'score': 50, 'feedback': model}
+
+        monkeypatch.setattr(analysis, "evaluate_skill", evaluate_skill)
+
+        results = analysis.dynamic_skills_analysis("Bonjour", SKILLS, "5", "Q", "C", openai_api_key="k",
+                                                   max_workers=3, structured=False)
+
+        assert [r['skill'] for r in results] == ['Grammar', 'Vocabulary', 'Fluency']
+        assert [r['feedback'] for r in results] == [analysis.SKILLS_ANALYSIS_MODEL] * 3
+        assert overlapped.is_set()
+
+    def test_exception_in_one_skill_is_raised(self, monkeypatch):
+        """Test that a failing skill evaluation is not swallowed by the thread pool"""
+        monkeypatch.setattr(analysis, "OpenAI", lambda api_key=None: None)
+        evaluated = []
+
+        def evaluate_skill(client, skill, text, audio_duration, question, context, model):
+            if skill['name'] == 'Vocabulary':
+                raise RuntimeError("OpenAI request failed")
+            evaluated.append(skill['name'])
+            return {'skill': skill['name'], 'score': 50, 'feedback': 'Ok'}
+
+        monkeypatch.setattr(analysis, "evaluate_skill", evaluate_skill)
+
+        with pytest.raises(RuntimeError, match="OpenAI request failed"):
+            analysis.dynamic_skills_analysis("Bonjour", SKILLS, "5", "Q", "C", openai_api_key="k",
+                                             max_workers=3, structured=False)
+        assert sorted(evaluated) == ['Fluency', 'Grammar']
@@ -0,0 +1,67 @@
+import sqlite3
+
+from services.llm_cache import LLMCache
+
+
+class TestLLMCache:
+    def test_key_depends_on_every_input(self):
+        """Test that changing any part of the request changes the cache key"""
+        base = dict(model='gpt-3.5-turbo', skill_prompt='rate syntax', transcription='bonjour')
+        assert LLMCache.make_key(**base) == LLMCache.make_key(**dict(base))
+        assert LLMCache.make_key(**base) != LLMCache.make_key(**dict(base, transcription='salut'))
+        assert LLMCache.make_key(**base) != LLMCache.make_key(**dict(base, model='gpt-4'))
+
+    def test_hit_and_miss_counters(self, tmp_path):
+        """Test that stored completions are returned and lookups are counted"""
+        cache = LLMCache(path=str(tmp_path / 'llm.sqlite3'), max_bytes=1024)
+
+        assert cache.get('k1') is None
+        cache.set('k1', 'Score: 80')
+        assert cache.get('k1') == 'Score: 80'
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the cache stays under its byte budget by evicting LRU entries"""
+        cache = LLMCache(path=str(tmp_path / 'llm.sqlite3'), max_bytes=25)
+
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'y' * 10)
+        cache.get('a')  # 'b' is now the least recently used
+        cache.set('c', 'z' * 10)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 'x' * 10
+        assert cache.get('c') == 'z' * 10
+        assert cache.stats()['bytes'] <= 25
+
+    def test_hits_do_not_write_until_flushed(self, tmp_path):
+        """Test that access times from hits are batched in memory and written with the next set"""
+        path = str(tmp_path / 'llm.sqlite3')
+        cache = LLMCache(path=path, max_bytes=1024, access_flush_seconds=3600)
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'y' * 10)
+        on_disk = lambda: dict(sqlite3.connect(path).execute("SELECT key, last_access FROM completions"))
+        before = on_disk()
+
+        for _ in range(5):
+            assert cache.get('a') == 'x' * 10
+        assert on_disk() == before
+
+        cache.set('c', 'z' * 10)
+        assert on_disk()['a'] > on_disk()['b']
+
+    def test_hits_are_flushed_periodically(self, tmp_path):
+        """Test that access times reach the disk once the flush interval has passed"""
+        path = str(tmp_path / 'llm.sqlite3')
+        cache = LLMCache(path=path, max_bytes=1024, access_flush_seconds=0)
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'y' * 10)
+
+        cache.get('a')
+
+        on_disk = dict(sqlite3.connect(path).execute("SELECT key, last_access FROM completions"))
+        assert on_disk['a'] > on_disk['b']
@@ -0,0 +1,246 @@
+import importlib
+import json
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeSignal:
+    def __init__(self):
+        self.callbacks = []
+
+    def connect(self, callback):
+        self.callbacks.append(callback)
+
+    def fire(self, evt):
+        for callback in self.callbacks:
+            callback(evt)
+
+
+def build_fake_speechsdk():
+    """A stand-in for azure.cognitiveservices.speech whose recognizers replay `sdk.script`."""
+    sdk = types.ModuleType("azure.cognitiveservices.speech")
+    sdk.ResultReason = SimpleNamespace(RecognizedSpeech="RecognizedSpeech", NoMatch="NoMatch")
+    sdk.CancellationReason = SimpleNamespace(Error="Error", EndOfStream="EndOfStream")
+    sdk.PropertyId = SimpleNamespace(SpeechServiceResponse_JsonResult="JsonResult")
+    sdk.PronunciationAssessmentGradingSystem = SimpleNamespace(HundredMark="HundredMark")
+    sdk.PronunciationAssessmentGranularity = SimpleNamespace(Phoneme="Phoneme")
+    # Recognized segments as (text, json details), and how the session ends: "stopped", "error" or "hang"
+    sdk.script = {'segments': [], 'end': "stopped"}
+    sdk.created = {'speech_configs': 0, 'assessment_configs': 0, 'recognizers': []}
+
+    class SpeechConfig:
+        def __init__(self, subscription, region):
+            sdk.created['speech_configs'] += 1
+            self.subscription = subscription
+            self.region = region
+            self.speech_recognition_language = None
+
+    class PronunciationAssessmentConfig:
+        def __init__(self, reference_text, grading_system, granularity, enable_miscue):
+            sdk.created['assessment_configs'] += 1
+            self.reference_text = reference_text
+            self.enable_miscue = enable_miscue
+            self.prosody = False
+
+        def enable_prosody_assessment(self):
+            self.prosody = True
+
+        def apply_to(self, recognizer):
+            recognizer.assessment_config = self
+
+    class SpeechRecognizer:
+        def __init__(self, speech_config, language, audio_config):
+            sdk.created['recognizers'].append(self)
+            self.speech_config = speech_config
+            self.language = language
+            self.calls = []
+            self.recognized = FakeSignal()
+            self.canceled = FakeSignal()
+            self.session_stopped = FakeSignal()
+
+        def result(self, text, details):
+            return SimpleNamespace(reason=sdk.ResultReason.RecognizedSpeech, text=text,
+                                   properties={sdk.PropertyId.SpeechServiceResponse_JsonResult: json.dumps(details)})
+
+        def recognize_once(self):
+            self.calls.append("recognize_once")
+            if not sdk.script['segments']:
+                return SimpleNamespace(reason=sdk.ResultReason.NoMatch)
+            return self.result(*sdk.script['segments'][0])
+
+        def start_continuous_recognition(self):
+            self.calls.append("start_continuous_recognition")
+            for text, details in sdk.script['segments']:
+                self.recognized.fire(SimpleNamespace(result=self.result(text, details)))
+            if sdk.script['end'] == "error":
+                details = SimpleNamespace(reason=sdk.CancellationReason.Error, error_details="Connection failed")
+                self.canceled.fire(SimpleNamespace(cancellation_details=details))
+            elif sdk.script['end'] == "stopped":
+                self.session_stopped.fire(SimpleNamespace())
+
+        def stop_continuous_recognition(self):
+            self.calls.append("stop_continuous_recognition")
+
+    class Connection:
+        @staticmethod
+        def from_recognizer(recognizer):
+            return SimpleNamespace(open=lambda continuous: recognizer.calls.append(("open", continuous)))
+
+    sdk.SpeechConfig = SpeechConfig
+    sdk.PronunciationAssessmentConfig = PronunciationAssessmentConfig
+    sdk.SpeechRecognizer = SpeechRecognizer
+    sdk.Connection = Connection
+    sdk.PronunciationAssessmentResult = lambda result: None
+    sdk.audio = SimpleNamespace()
+    return sdk
+
+
+@pytest.fixture
+def speechsdk(monkeypatch):
+    """Install the fake Azure Speech SDK and import fresh copies of the services that use it."""
+    sdk = build_fake_speechsdk()
+    monkeypatch.setitem(sys.modules, "azure", types.ModuleType("azure"))
+    monkeypatch.setitem(sys.modules, "azure.cognitiveservices", types.ModuleType("azure.cognitiveservices"))
+    monkeypatch.setitem(sys.modules, "azure.cognitiveservices.speech", sdk)
+    for name in ("services.speech_pool", "services.phonetic_analysis"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return sdk
+
+
+class TestSpeechPool:
+    def test_speech_config_is_built_once_per_language(self, speechsdk):
+        """Test that requests in the same language share one SpeechConfig"""
+        from services.speech_pool import SpeechPool
+        pool = SpeechPool("key", "westeurope")
+
+        french = pool.speech_config("fr-FR")
+
+        assert pool.speech_config("fr-FR") is french
+        assert french.speech_recognition_language == "fr-FR"
+        english = pool.speech_config("en-US")
+        assert english is not french
+        assert english.speech_recognition_language == "en-US"
+        assert speechsdk.created['speech_configs'] == 2
+
+    def test_assessment_configs_are_reused_and_evicted(self, speechsdk):
+        """Test that assessment configs are kept per (reference text, prosody), least recently used out first"""
+        from services.speech_pool import SpeechPool
+        pool = SpeechPool("key", "westeurope", assessment_cache_size=2)
+
+        bonjour = pool.assessment_config("Bonjour")
+        merci = pool.assessment_config("Merci")
+        assert pool.assessment_config("Bonjour") is bonjour  # "Merci" is now the least recently used
+        pool.assessment_config("Salut")
+
+        assert pool.assessment_config("Bonjour") is bonjour
+        assert pool.assessment_config("Merci") is not merci
+        assert speechsdk.created['assessment_configs'] == 4
+
+    def test_assessment_config_options(self, speechsdk):
+        """Test that miscue detection follows the reference text and prosody gets its own config"""
+        from services.speech_pool import SpeechPool
+        pool = SpeechPool("key", "westeurope")
+
+        assert pool.assessment_config("Bonjour").enable_miscue
+        assert not pool.assessment_config("").enable_miscue
+        with_prosody = pool.assessment_config("Bonjour", prosody=True)
+        assert with_prosody.prosody
+        assert with_prosody is not pool.assessment_config("Bonjour")
+
+    def test_recognizer_uses_the_shared_configs_and_opens_the_connection(self, speechsdk):
+        """Test that recognizers get the pooled configs and start connecting right away"""
+        from services.speech_pool import SpeechPool
+        pool = SpeechPool("key", "westeurope")
+
+        first = pool.recognizer("fr-FR", audio_config=None, reference_text="Bonjour", continuous=True)
+        second = pool.recognizer("fr-FR", audio_config=None, reference_text="Bonjour")
+
+        assert first is not second
+        assert first.speech_config is second.speech_config
+        assert first.assessment_config is second.assessment_config
+        assert first.calls == [("open", True)]
+        assert second.calls == [("open", False)]
+
+    def test_one_pool_per_credentials(self, speechsdk):
+        """Test that services with the same credentials share a pool"""
+        from services.speech_pool import get_speech_pool
+
+        assert get_speech_pool("key", "westeurope") is get_speech_pool("key", "westeurope")
+        assert get_speech_pool("key", "westeurope") is not get_speech_pool("key", "northeurope")
+
+
+def segment(text, *word_scores):
+    """Azure's JSON for one recognized utterance."""
+    words = [{'Word': word, 'PronunciationAssessment': {'AccuracyScore': score}} for word, score in word_scores]
+    return text, {'RecognitionStatus': "Success", 'DisplayText': text, 'NBest': [{'Display': text, 'Words': words}]}
+
+
+class TestRecognitionMode:
+    @pytest.fixture
+    def phonetic_analysis(self, speechsdk):
+        return importlib.import_module("services.phonetic_analysis")
+
+    def test_continuous_mode_merges_every_segment(self, speechsdk, phonetic_analysis, monkeypatch):
+        """Test that all utterances are scored and merged into one recognize_once-shaped result"""
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_MODE", "continuous")
+        first = segment("Bonjour.", ("Bonjour", 90))
+        second = segment("Je m'appelle Camille.", ("Je", 80), ("m'appelle", 70), ("Camille", 40))
+        speechsdk.script['segments'] = [first, second]
+
+        result = phonetic_analysis.PhoneticAnalysisService()._assess(audio_config=None)
+
+        assert result['success']
+        assert result['recognized_text'] == "Bonjour. Je m'appelle Camille."
+        assert [w['word'] for w in result['word_scores']] == ["Bonjour", "Je", "m'appelle", "Camille"]
+        assert result['score'] == 70.0
+        assert result['details']['Segments'] == [first[1], second[1]]
+        assert result['details']['NBest'][0]['Display'] == result['recognized_text']
+        recognizer = speechsdk.created['recognizers'][-1]
+        assert recognizer.calls == [("open", True), "start_continuous_recognition", "stop_continuous_recognition"]
+
+    def test_once_mode_stops_after_the_first_utterance(self, speechsdk, phonetic_analysis, monkeypatch):
+        """Test that AZURE_RECOGNITION_MODE=once only scores the first utterance"""
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_MODE", "once")
+        speechsdk.script['segments'] = [segment("Bonjour.", ("Bonjour", 90)), segment("Merci.", ("Merci", 50))]
+
+        result = phonetic_analysis.PhoneticAnalysisService()._assess(audio_config=None)
+
+        assert result['success']
+        assert result['recognized_text'] == "Bonjour."
+        assert result['score'] == 90.0
+        assert speechsdk.created['recognizers'][-1].calls == [("open", False), "recognize_once"]
+
+    def test_cancellation_error_is_reported(self, speechsdk, phonetic_analysis, monkeypatch):
+        """Test that a session canceled before any utterance fails with Azure's error"""
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_MODE", "continuous")
+        speechsdk.script['end'] = "error"
+
+        result = phonetic_analysis.PhoneticAnalysisService()._assess(audio_config=None)
+
+        assert result == {"success": False, "error": "Connection failed"}
+
+    def test_segments_before_a_cancellation_are_kept(self, speechsdk, phonetic_analysis, monkeypatch):
+        """Test that utterances recognized before an error still give a result"""
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_MODE", "continuous")
+        speechsdk.script['segments'] = [segment("Bonjour.", ("Bonjour", 60))]
+        speechsdk.script['end'] = "error"
+
+        result = phonetic_analysis.PhoneticAnalysisService()._assess(audio_config=None)
+
+        assert result['success']
+        assert result['score'] == 60.0
+
+    def test_session_that_never_stops_times_out(self, speechsdk, phonetic_analysis, monkeypatch):
+        """Test that recognition is stopped after AZURE_RECOGNITION_TIMEOUT"""
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_MODE", "continuous")
+        monkeypatch.setattr(phonetic_analysis, "AZURE_RECOGNITION_TIMEOUT", 0.05)
+        speechsdk.script['end'] = "hang"
+
+        result = phonetic_analysis.PhoneticAnalysisService()._assess(audio_config=None)
+
+        assert not result['success']
+        assert "timed out" in result['error']
+        assert speechsdk.created['recognizers'][-1].calls[-1] == "stop_continuous_recognition"
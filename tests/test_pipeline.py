@@ -0,0 +1,53 @@
+import threading
+import pytest
+from services.pipeline import Pipeline, PipelineError
+
+
+class TestPipeline:
+    def test_independent_stages_run_concurrently(self):
+        """Test that stages without dependencies between them overlap"""
+        barrier = threading.Barrier(2, timeout=2)
+
+        def wait_for_peer(value):
+            def stage():
+                barrier.wait()  # only passes if both stages are running at once
+                return value
+            return stage
+
+        pipeline = (
+            Pipeline(max_workers=2)
+            .add('transcription', wait_for_peer('bonjour'))
+            .add('pronunciation', wait_for_peer(87))
+            .add('report', lambda transcription, pronunciation: f"{transcription}:{pronunciation}",
+                 inputs=('transcription', 'pronunciation'))
+        )
+        result = pipeline.run()
+
+        assert result.values['report'] == 'bonjour:87'
+        assert not result.errors
+
+    def test_failed_stage_skips_dependents_only(self):
+        """Test that a failure propagates to dependent stages but not to independent ones"""
+        def fail():
+            raise ValueError("Failed to transcribe audio")
+
+        completed = []
+        pipeline = (
+            Pipeline()
+            .add('transcription', fail)
+            .add('pronunciation', lambda: 87)
+            .add('skills_analysis', lambda transcription: transcription, inputs=('transcription',))
+        )
+        result = pipeline.run(on_stage_done=lambda stage, done, total: completed.append((stage.name, done, total)))
+
+        assert result.values == {'pronunciation': 87}
+        assert isinstance(result.errors['transcription'], ValueError)
+        assert isinstance(result.errors['skills_analysis'], PipelineError)
+        assert sorted(name for name, _, _ in completed) == ['pronunciation', 'skills_analysis', 'transcription']
+        assert [done for _, done, _ in completed] == [1, 2, 3]
+
+    def test_cycles_are_rejected(self):
+        """Test that a dependency cycle is reported instead of hanging"""
+        pipeline = Pipeline().add('a', lambda b: b, inputs=('b',)).add('b', lambda a: a, inputs=('a',))
+        with pytest.raises(ValueError):
+            pipeline.run()
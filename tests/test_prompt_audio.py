@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+pytest.importorskip("codaio")
+
+from services.prompt_audio import PromptAudioJob, missing_audio_texts, with_rate_limit_retry
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class FakeTable:
+    def __init__(self, fail_writes: int = 0):
+        self.upserts = []
+        self.fail_writes = fail_writes
+
+    def upsert_rows(self, rows, key_columns=None):
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise ConnectionError("Coda unavailable")
+        self.upserts.append(({row[0].value_storage: row[1].value_storage for row in rows}, key_columns))
+
+
+ROWS = [
+    {'text': "Bonjour", 'audio_url': ""},
+    {'text': "Salut", 'audio_url': "existing.mp3"},
+    {'text': "Merci", 'audio_url': float('nan')},
+    {'text': "Bonjour", 'audio_url': None},
+    {'text': "Au revoir", 'audio_url': None},
+]
+
+
+def fake_generate(calls):
+    lock = threading.Lock()
+
+    def generate(text):
+        with lock:
+            calls.append(text)
+        return f"audio/{text}.mp3"
+    return generate
+
+
+class TestPromptAudio:
+    def test_missing_audio_texts(self):
+        """Test that only distinct texts without a URL are selected"""
+        assert missing_audio_texts(ROWS) == ["Bonjour", "Merci", "Au revoir"]
+
+    def test_rate_limited_calls_are_retried(self):
+        """Test that a 429 is retried with backoff and other errors are not"""
+        attempts, delays = [], []
+
+        def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RateLimited()
+            return "ok"
+
+        assert with_rate_limit_retry(call, base_delay=1.0, sleep=delays.append) == "ok"
+        assert delays == [1.0, 2.0]
+        with pytest.raises(ValueError):
+            with_rate_limit_retry(lambda: (_ for _ in ()).throw(ValueError()), sleep=delays.append)
+
+    def test_run_writes_back_in_batches(self, tmp_path):
+        """Test that every missing prompt is synthesized once and saved in batches"""
+        calls = []
+        table = FakeTable()
+        job = PromptAudioJob(table, fake_generate(calls), workers=2, batch_size=2,
+                             progress_path=str(tmp_path / "progress.json"))
+
+        report = job.run(ROWS)
+
+        assert sorted(calls) == ["Au revoir", "Bonjour", "Merci"]
+        assert (report.synthesized, report.written, report.failed) == (3, 3, {})
+        assert [len(urls) for urls, _ in table.upserts] == [2, 1]
+        assert all(keys == ['text'] for _, keys in table.upserts)
+
+    def test_interrupted_run_resumes(self, tmp_path):
+        """Test that a rerun writes back what was synthesized and does not synthesize it again"""
+        progress = str(tmp_path / "progress.json")
+        calls = []
+        PromptAudioJob(FakeTable(fail_writes=1), fake_generate(calls), batch_size=10, progress_path=progress).run(ROWS)
+
+        table = FakeTable()
+        report = PromptAudioJob(table, fake_generate(calls), progress_path=progress).run(ROWS)
+
+        assert len(calls) == 3
+        assert report.skipped == 3 and report.written == 3
+        assert table.upserts[0][0]["Merci"] == "audio/Merci.mp3"
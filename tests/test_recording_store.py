@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from services.audio_clip import AudioClip, encode_wav
+from services.recording_store import RecordingStore
+
+
+def take(seed: int = 0) -> np.ndarray:
+    return (np.random.default_rng(seed).standard_normal(16000) * 3000).astype(np.int16)
+
+
+class TestRecordingStore:
+    def test_identical_audio_is_stored_once(self, tmp_path):
+        """Test that the same PCM is deduplicated whatever container it came in"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        samples = take()
+
+        first = store.put(AudioClip.from_bytes(encode_wav(samples)))
+        second = store.put(AudioClip.from_pcm(samples.tobytes()))
+
+        assert not first.deduplicated and second.deduplicated
+        assert first.key == second.key and first.path == second.path
+        assert list(store.keys()) == [first.key]
+
+    def test_concurrent_puts_encode_once(self, tmp_path):
+        """Test that simultaneous uploads of one take produce a single file"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        clip = AudioClip.from_pcm(take(1))
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: store.put(clip), range(8)))
+
+        assert sum(not result.deduplicated for result in results) == 1
+        assert len(list(store.keys())) == 1
+
+    def test_stream_and_load(self, tmp_path):
+        """Test that a stored recording can be streamed in chunks and decoded back"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        samples = take(2)
+        stored = store.put(AudioClip.from_pcm(samples))
+
+        chunks = list(store.stream(stored.key, chunk_size=1000))
+        assert len(chunks) > 1 and sum(map(len, chunks)) == stored.size
+        assert np.array_equal(store.load(stored.key).samples, samples)
+
+    def test_annotate(self, tmp_path):
+        """Test that metadata entries accumulate next to the recording"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        key = store.put(AudioClip.from_pcm(take(3))).key
+
+        store.annotate(key, session_id="s1", username="alice")
+        store.annotate(key, session_id="s2", username="alice")
+
+        assert [entry["session_id"] for entry in store.metadata(key)] == ["s1", "s2"]
+        assert store.metadata("0" * 64) == []
+
+    def test_key_locks_are_released(self, tmp_path):
+        """Test that deduplicated and failed puts don't leave per-key locks behind"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        clip = AudioClip.from_pcm(take(4))
+        store.put(clip)
+        store.put(clip)
+
+        # The root is a file, so writing the recording fails
+        (tmp_path / "broken").write_bytes(b"")
+        broken = RecordingStore(root=str(tmp_path / "broken"), codec="wav")
+        with pytest.raises(OSError):
+            broken.put(AudioClip.from_pcm(take(5)))
+
+        assert store._key_locks == {} and broken._key_locks == {}
+
+    def test_concurrent_annotations_are_all_kept(self, tmp_path):
+        """Test that simultaneous annotations of one recording don't overwrite each other"""
+        store = RecordingStore(root=str(tmp_path), codec="wav")
+        key = store.put(AudioClip.from_pcm(take(6))).key
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: store.annotate(key, session_id=f"s{i}"), range(20)))
+
+        assert sorted(entry["session_id"] for entry in store.metadata(key)) == sorted(f"s{i}" for i in range(20))
@@ -0,0 +1,24 @@
+from services.table_cache import TableCache
+from services.skill_registry import SkillRegistry
+
+
+class TestSkillRegistry:
+    def test_resolve_downloads_skills_table_once(self):
+        """Test that resolving several skill IDs costs a single table download"""
+        calls = []
+
+        def fetch(doc_id, table_id):
+            calls.append((doc_id, table_id))
+            return [
+                {'skill_id': 1, 'skill_name': 'Syntax', 'skill_ai_prompt': 'syntax prompt'},
+                {'skill_id': 2, 'skill_name': 'Vocabulary', 'skill_ai_prompt': 'vocab prompt'},
+                {'skill_id': 3, 'skill_name': 'Naturalness', 'skill_ai_prompt': 'natural prompt'},
+            ]
+
+        registry = SkillRegistry(fetch, cache=TableCache(ttl=60))
+        found, missing = registry.resolve('doc', 'skills', ['3', '1', '9'])
+
+        assert [row['skill_name'] for row in found] == ['Naturalness', 'Syntax']
+        assert missing == ['9']
+        assert registry.get('doc', 'skills', '2')['skill_name'] == 'Vocabulary'
+        assert calls == [('doc', 'skills'), ('doc', 'skills')]  # one load + one refresh for the unknown '9'
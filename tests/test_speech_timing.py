@@ -0,0 +1,68 @@
+from services.nlp_analysis import analyze_lemmas_and_frequency, calculate_speech_timing, counted_words
+from services.transcription_backends import TimedWord, Transcript
+
+
+class TestSpeechTiming:
+    def test_leading_and_trailing_silence_is_ignored(self):
+        """Test that WPM is measured from the first word to the last"""
+        words = [TimedWord("mot", 5 + i * 0.5, 5 + i * 0.5 + 0.4) for i in range(20)]
+        timing = calculate_speech_timing(words)
+
+        assert timing['speech_seconds'] == 9.9
+        assert round(timing['speech_wpm']) == round(20 / (9.9 / 60))
+        assert timing['pause_count'] == 0
+
+    def test_pauses_are_counted_and_excluded_from_articulation_rate(self):
+        """Test that gaps over the threshold are pauses and don't count as talking time"""
+        words = [TimedWord("un", 0.0, 0.5), TimedWord("deux", 0.6, 1.0),
+                 TimedWord("trois", 2.5, 3.0), TimedWord("quatre", 3.4, 4.0)]
+        timing = calculate_speech_timing(words)
+
+        assert timing['pause_count'] == 2
+        assert timing['long_pause_count'] == 1
+        assert timing['total_pause_seconds'] == 1.9
+        assert timing['articulation_rate'] == 4 / ((4.0 - 1.9) / 60)
+
+    def test_no_words(self):
+        """Test that an empty transcript gives zeros rather than dividing by zero"""
+        assert calculate_speech_timing([])['speech_wpm'] == 0
+
+    def test_shifted_transcript(self):
+        """Test that chunk transcripts can be moved to their place in the recording"""
+        transcript = Transcript("bonjour", [TimedWord("bonjour", 0.2, 0.7)]).shifted(30.0)
+        assert (transcript.words[0].start, transcript.words[0].end) == (30.2, 30.7)
+
+    def test_short_answer_keeps_the_overall_wpm(self):
+        """Test that a one-word answer is not scored over its own 0.4 s span"""
+        result = analyze_lemmas_and_frequency("Oui", 0.1, [TimedWord("Oui", 1.0, 1.4)])
+
+        assert result['wpm'] == 10
+        assert result['fluency_score'] < 100
+
+    def test_long_enough_answer_uses_the_speaking_span(self):
+        """Test that the timed WPM replaces the overall one past the minimum words and span"""
+        words = [TimedWord("mot", i * 0.5, i * 0.5 + 0.4) for i in range(10)]
+        result = analyze_lemmas_and_frequency(" ".join(["mot"] * 10), 0.5, words)
+
+        assert result['wpm'] == 10 / (4.9 / 60)
+
+    def test_elided_words_are_counted_like_lemmas(self):
+        """Test that timed words are filtered the same way as total_lemmas"""
+        words = [TimedWord(" C'est", 0.0, 0.3), TimedWord(" bien", 0.4, 0.8)]
+        result = analyze_lemmas_and_frequency("C'est bien", 0.1, words)
+
+        assert result['total_lemmas'] == 1
+        assert calculate_speech_timing(words)['word_count'] == 1
+        assert calculate_speech_timing(words)['speech_wpm'] == 1 / (0.8 / 60)
+
+    def test_timed_and_text_word_counts_agree(self):
+        """Test that punctuation in the text does not change the count compared to Whisper's timed words"""
+        text = "Bonjour, je m'appelle Camille. Et vous ? « Très bien » !"
+        words = [TimedWord(f" {word}", i * 0.5, i * 0.5 + 0.4)
+                 for i, word in enumerate(["Bonjour", "je", "m'appelle", "Camille", "Et", "vous", "Très", "bien"])]
+
+        result = analyze_lemmas_and_frequency(text, 0.1, words)
+
+        assert result['total_lemmas'] == 7
+        assert result['word_count'] == result['total_lemmas']
+        assert counted_words(text.split()) == ["Bonjour", "je", "Camille", "Et", "vous", "Très", "bien"]
@@ -0,0 +1,53 @@
+import time
+from services.table_cache import TableCache
+
+
+class TestTableCache:
+    def _counting_fetch(self, calls):
+        def fetch(doc_id, table_id):
+            calls.append((doc_id, table_id))
+            return [{'table': table_id, 'version': len(calls)}]
+        return fetch
+
+    def test_fresh_entry_served_from_memory(self):
+        """Test that repeated reads within the TTL hit Coda only once"""
+        calls = []
+        cache = TableCache(ttl=60)
+        fetch = self._counting_fetch(calls)
+
+        first = cache.get('doc', 'grid-1', fetch)
+        second = cache.get('doc', 'grid-1', fetch)
+
+        assert first == second
+        assert calls == [('doc', 'grid-1')]
+
+    def test_stale_entry_returned_while_refreshing(self):
+        """Test that an expired entry is served immediately and refreshed in the background"""
+        calls = []
+        cache = TableCache(ttl=0)
+        fetch = self._counting_fetch(calls)
+
+        cache.get('doc', 'grid-1', fetch)
+        stale = cache.get('doc', 'grid-1', fetch)
+        assert stale[0]['version'] == 1
+
+        deadline = time.time() + 2
+        while len(calls) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        cache.ttl = 60
+        assert cache.get('doc', 'grid-1', fetch)[0]['version'] == 2
+
+    def test_invalidate_forces_refetch(self):
+        """Test that invalidation drops only the targeted table"""
+        calls = []
+        cache = TableCache(ttl=60)
+        fetch = self._counting_fetch(calls)
+
+        cache.get('doc', 'grid-1', fetch)
+        cache.get('doc', 'grid-2', fetch)
+        cache.invalidate('doc', 'grid-1')
+        cache.get('doc', 'grid-1', fetch)
+        cache.get('doc', 'grid-2', fetch)
+
+        assert calls == [('doc', 'grid-1'), ('doc', 'grid-2'), ('doc', 'grid-1')]
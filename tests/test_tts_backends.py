@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from services.audio_clip import AudioClip
+from services.audio_store import AudioStore
+from services.tts_backends import LocalTTSBackend, TTSBackend, get_tts_backend
+from services.tts_cache import TTSCache
+
+
+class TestLocalTTSBackend:
+    def test_output_is_deterministic_wav(self):
+        """Test that the same text and voice always give the same decodable audio"""
+        backend = LocalTTSBackend()
+        first = b"".join(backend.synthesize("Bonjour, ça va ?", "voice-a"))
+        second = b"".join(backend.synthesize("Bonjour, ça va ?", "voice-a"))
+
+        assert first == second
+        clip = AudioClip.from_bytes(first)
+        assert 0.5 < clip.duration_seconds < 2.0
+        assert b"".join(backend.synthesize("Bonjour, ça va ?", "voice-b")) != first
+
+    def test_longer_text_gives_longer_audio(self):
+        """Test that the synthesized length follows the amount of text"""
+        backend = LocalTTSBackend()
+        short = AudioClip.from_bytes(b"".join(backend.synthesize("Bonjour.", "v")))
+        long = AudioClip.from_bytes(b"".join(backend.synthesize("Bonjour. Je voudrais un café, s'il vous plaît.", "v")))
+
+        assert long.duration_seconds > 3 * short.duration_seconds
+
+    def test_simulated_latency(self):
+        """Test that the first chunk is held back by the configured latency"""
+        backend = LocalTTSBackend(latency_seconds=0.1)
+        start = time.perf_counter()
+        next(iter(backend.synthesize("Bonjour", "v")))
+
+        assert time.perf_counter() - start >= 0.1
+
+    def test_works_with_the_tts_cache(self, tmp_path):
+        """Test that the local backend drives the cache like ElevenLabs would"""
+        directory = str(tmp_path / "audio")
+        cache = TTSCache(directory, AudioStore(directory, str(tmp_path / "index.sqlite3")))
+        backend = get_tts_backend("local")
+        key = cache.make_key(text="Salut", **backend.cache_parts("v"))
+
+        path = cache.get_or_synthesize(key, backend.extension, lambda: backend.synthesize("Salut", "v"))
+
+        assert path.endswith(".wav")
+        assert cache.get_or_synthesize(key, backend.extension, lambda: iter(())) == path
+        assert cache.stats()["hits"] == 1
+
+
+class TestTTSBackend:
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test that a backend missing part of the interface fails when it is created, not on first use"""
+        class NoCacheParts(TTSBackend):
+            def synthesize(self, text, voice_id):
+                yield b""
+
+        with pytest.raises(TypeError):
+            NoCacheParts()
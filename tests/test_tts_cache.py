@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.audio_store import AudioStore
+from services.tts_cache import TTSCache
+
+
+def make_cache(tmp_path, max_bytes=1024 * 1024):
+    directory = str(tmp_path / "audio")
+    return TTSCache(directory=directory, store=AudioStore(directory, str(tmp_path / "index.sqlite3"), max_bytes))
+
+
+class TestTTSCache:
+    def test_repeated_request_is_served_from_disk(self, tmp_path):
+        """Test that a second request for the same key does not synthesize again"""
+        cache = make_cache(tmp_path)
+        calls = []
+
+        def synthesize():
+            calls.append(1)
+            return [b"ID3", b"audio"]
+
+        key = cache.make_key(text="Bonjour", voice_id="v1", model_id="m", output_format="mp3_22050_32")
+        first = cache.get_or_synthesize(key, "mp3", synthesize)
+        second = cache.get_or_synthesize(key, "mp3", synthesize)
+
+        assert first == second == os.path.join(cache.directory, f"{key}.mp3")
+        assert open(first, "rb").read() == b"ID3audio"
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_key_depends_on_every_input(self):
+        """Test that changing the voice or settings gives a different key"""
+        base = dict(text="Bonjour", voice_id="v1", model_id="m", output_format="mp3", voice_settings={"stability": 0.0})
+        key = TTSCache.make_key(**base)
+
+        assert TTSCache.make_key(**dict(base)) == key
+        assert TTSCache.make_key(**dict(base, voice_id="v2")) != key
+        assert TTSCache.make_key(**dict(base, voice_settings={"stability": 0.5})) != key
+
+    def test_concurrent_requests_wait_on_one_synthesis(self, tmp_path):
+        """Test that simultaneous requests for one prompt call the API once"""
+        cache = make_cache(tmp_path)
+        calls = []
+        lock = threading.Lock()
+
+        def synthesize():
+            with lock:
+                calls.append(1)
+            time.sleep(0.05)
+            return [b"audio"]
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            paths = list(executor.map(lambda _: cache.get_or_synthesize("k", "mp3", synthesize), range(6)))
+
+        assert len(calls) == 1
+        assert len(set(paths)) == 1
+
+    def test_failed_synthesis_leaves_nothing_behind(self, tmp_path):
+        """Test that an API error does not leave a partial file that later requests would serve"""
+        cache = make_cache(tmp_path)
+
+        def synthesize():
+            yield b"partial"
+            raise ConnectionError("API down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_synthesize("k", "mp3", synthesize)
+
+        assert os.listdir(cache.directory) == []
+        assert cache.get_or_synthesize("k", "mp3", lambda: []) is None
+
+    def test_stream_yields_chunks_as_they_arrive(self, tmp_path):
+        """Test that streaming passes each chunk on before synthesis finishes and caches the whole file"""
+        cache = make_cache(tmp_path)
+        produced = []
+
+        def synthesize():
+            for chunk in (b"one", b"two", b"three"):
+                produced.append(chunk)
+                yield chunk
+
+        metrics = []
+        stream = cache.stream("k", "mp3", synthesize, on_metrics=metrics.append)
+        assert next(stream) == b"one"
+        assert produced == [b"one"]
+        assert list(stream) == [b"two", b"three"]
+
+        assert open(cache.get("k", "mp3"), "rb").read() == b"onetwothree"
+        assert len(metrics) == 1 and not metrics[0].cached
+        assert metrics[0].bytes == 11
+        assert 0 <= metrics[0].ttfb_seconds <= metrics[0].total_seconds
+        assert list(cache.recent_metrics) == metrics
+
+        assert b"".join(cache.stream("k", "mp3", synthesize)) == b"onetwothree"
+        assert cache.recent_metrics[-1].cached and len(produced) == 3
+
+    def test_abandoned_stream_is_not_cached(self, tmp_path):
+        """Test that a stream closed part way leaves no partial file behind"""
+        cache = make_cache(tmp_path)
+        stream = cache.stream("k", "mp3", lambda: iter([b"one", b"two"]))
+        next(stream)
+        stream.close()
+
+        assert cache.get("k", "mp3") is None
+        assert os.listdir(cache.directory) == []
+
+    def test_waiters_share_one_lock_after_a_failed_synthesis(self, tmp_path):
+        """Test that a failure does not let a waiter and a new caller synthesize the same key at once"""
+        cache = make_cache(tmp_path)
+        active, overlaps, calls = [], [], []
+        lock = threading.Lock()
+
+        def synthesize():
+            with lock:
+                calls.append(1)
+                active.append(1)
+                if len(active) > 1:
+                    overlaps.append(1)
+                attempt = len(calls)
+            try:
+                time.sleep(0.05)
+                if attempt == 1:
+                    raise ConnectionError("API down")
+                yield b"audio"
+            finally:
+                with lock:
+                    active.pop()
+
+        def request(_):
+            try:
+                return cache.get_or_synthesize("k", "mp3", synthesize)
+            except ConnectionError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = [executor.submit(request, i) for i in range(3)]
+            time.sleep(0.06)  # a new caller arrives just after the first synthesis failed
+            later = executor.submit(request, 3)
+            paths = [future.result() for future in first + [later]]
+
+        assert overlaps == []
+        assert len(calls) == 2
+        assert paths.count(cache.path("k", "mp3")) == 3
+        assert cache._key_locks == {}
+        assert sorted(os.listdir(cache.directory)) == ["k.mp3"]
+
+    def test_failed_and_abandoned_streams_are_recorded(self, tmp_path):
+        """Test that metrics are kept for streams that do not finish"""
+        cache = make_cache(tmp_path)
+
+        def failing():
+            yield b"partial"
+            raise ConnectionError("API down")
+
+        with pytest.raises(ConnectionError):
+            list(cache.stream("a", "mp3", failing))
+        stream = cache.stream("b", "mp3", lambda: iter([b"one", b"two"]))
+        next(stream)
+        stream.close()
+
+        failed, abandoned = cache.recent_metrics
+        assert (failed.status, failed.error, failed.bytes) == ("failed", "API down", 7)
+        assert (abandoned.status, abandoned.bytes) == ("abandoned", 3)
+        assert cache.misses == 2
+
+    def test_served_hits_are_counted_and_refresh_the_lru_order(self, tmp_path):
+        """Test that serving a cached file counts a hit and keeps it from being evicted first"""
+        cache = make_cache(tmp_path, max_bytes=25)
+        cache.get_or_synthesize("a", "mp3", lambda: [b"x" * 10])
+        cache.get_or_synthesize("b", "mp3", lambda: [b"y" * 10])
+
+        assert cache.serve("a", "mp3") == cache.path("a", "mp3")
+        assert cache.serve("missing", "mp3") is None
+        cache.get_or_synthesize("c", "mp3", lambda: [b"z" * 10])
+
+        assert cache.get("a", "mp3") and cache.get("c", "mp3")
+        assert cache.get("b", "mp3") is None
+        assert (cache.hits, cache.misses) == (1, 3)
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from services import tts_generator
+from services.audio_store import AudioStore
+from services.tts_backends import LocalTTSBackend
+from services.tts_cache import TTSCache
+from services.tts_server import TTSStreamServer
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    directory = str(tmp_path / "audio")
+    cache = TTSCache(directory, AudioStore(directory, str(tmp_path / "index.sqlite3")))
+    monkeypatch.setattr(tts_generator, "tts_cache", cache)
+    return cache
+
+
+class TestPromptAudioUrl:
+    def test_cached_prompt_is_served_as_a_hit(self, cache):
+        """Test that cached prompts count as hits and refresh their last access"""
+        backend = LocalTTSBackend()
+        path = tts_generator.generate_audio("Bonjour", backend=backend)
+        conn = cache.store._connection()
+        last_access = lambda: conn.execute("SELECT last_access FROM files").fetchone()[0]
+        before = last_access()
+
+        for _ in range(3):
+            assert tts_generator.prompt_audio_url("Bonjour", backend=backend) == path
+
+        assert cache.stats()["hits"] == 3
+        assert last_access() > before
+
+    def test_no_streaming_without_a_public_url(self, cache, monkeypatch):
+        """Test that without TTS_STREAM_PUBLIC_URL the prompt is synthesized to a file instead of a localhost URL"""
+        server = TTSStreamServer(cache=cache, port=0, public_url=None)
+        monkeypatch.setattr(tts_generator, "tts_stream_server", server)
+
+        path = tts_generator.prompt_audio_url("Bonjour", backend=LocalTTSBackend())
+
+        assert path.startswith(cache.directory) and os.path.exists(path)
+        assert server._server is None
+
+    def test_streams_with_a_public_url(self, cache, monkeypatch):
+        """Test that new prompts get a stream URL on the configured public address"""
+        server = TTSStreamServer(cache=cache, host="127.0.0.1", port=0, public_url="https://example.com/audio/")
+        monkeypatch.setattr(tts_generator, "tts_stream_server", server)
+        try:
+            url = tts_generator.prompt_audio_url("Bonjour", backend=LocalTTSBackend())
+        finally:
+            server.stop()
+
+        assert url.startswith("https://example.com/audio/tts/") and url.endswith(".wav")
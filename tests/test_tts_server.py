@@ -0,0 +1,41 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from services.audio_store import AudioStore
+from services.tts_cache import TTSCache
+from services.tts_server import TTSStreamServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    directory = str(tmp_path / "audio")
+    cache = TTSCache(directory, AudioStore(directory, str(tmp_path / "index.sqlite3")))
+    server = TTSStreamServer(cache=cache, host="127.0.0.1", port=0)
+    yield server
+    server.stop()
+
+
+class TestTTSStreamServer:
+    def test_registered_prompt_is_streamed_and_cached(self, server):
+        """Test that the player gets the audio over a chunked response and the file is cached"""
+        url = server.url_for("abc", "mp3", lambda: iter([b"ID3", b"more", b"audio"]))
+
+        with urllib.request.urlopen(url) as response:
+            assert response.headers["Content-Type"] == "audio/mpeg"
+            assert response.headers["Transfer-Encoding"] == "chunked"
+            assert response.read() == b"ID3moreaudio"
+
+        assert open(server.cache.get("abc", "mp3"), "rb").read() == b"ID3moreaudio"
+        assert server.cache.recent_metrics[-1].complete
+
+    def test_unregistered_prompt_is_not_found(self, server):
+        """Test that the endpoint cannot be used to synthesize arbitrary keys"""
+        server.url_for("abc", "mp3", lambda: iter([b"audio"]))
+        base = f"http://localhost:{server.port}/tts/"
+
+        for name in ("other.mp3", "abc.wav"):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(base + name)
+            assert error.value.code == 404
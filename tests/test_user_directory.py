@@ -0,0 +1,50 @@
+from services.table_cache import TableCache
+from services.user_directory import UserDirectory
+
+
+class TestUserDirectory:
+    def _directory(self, tables, calls, **kwargs):
+        def fetch(doc_id, table_id):
+            calls.append(table_id)
+            return [dict(row) for row in tables[table_id]]
+        return UserDirectory('doc', 'users', fetch, cache=TableCache(ttl=60), **kwargs)
+
+    def test_lookup_by_username(self):
+        """Test that users are resolved from the index without re-downloading the table"""
+        calls = []
+        tables = {'users': [
+            {'username': 'alice', 'user_document_id': 'doc-a', 'prompt_table_id': 'grid-a'},
+            {'username': 'bob', 'user_document_id': 'doc-b', 'prompt_table_id': 'grid-b'},
+        ]}
+        directory = self._directory(tables, calls)
+
+        assert directory.get('alice')['user_document_id'] == 'doc-a'
+        assert directory.get('bob')['prompt_table_id'] == 'grid-b'
+        assert len(directory) == 2
+        assert calls == ['users']
+
+    def test_unknown_username_triggers_single_refresh(self):
+        """Test that a miss refreshes the table once and finds newly added users"""
+        calls = []
+        tables = {'users': [{'username': 'alice', 'user_document_id': 'doc-a'}]}
+        directory = self._directory(tables, calls, miss_refresh_interval=60)
+
+        assert directory.get('alice') is not None
+        tables['users'].append({'username': 'carol', 'user_document_id': 'doc-c'})
+
+        assert directory.get('carol')['user_document_id'] == 'doc-c'
+        assert directory.get('nobody') is None
+        assert calls == ['users', 'users']
+
+    def test_removed_users_drop_out_of_index(self):
+        """Test that a refreshed table removes users that no longer exist"""
+        calls = []
+        tables = {'users': [{'username': 'alice'}, {'username': 'bob'}]}
+        directory = self._directory(tables, calls, miss_refresh_interval=0)
+
+        assert 'bob' in directory
+        tables['users'] = [{'username': 'alice'}]
+        directory._cache.invalidate('doc', 'users')
+
+        assert 'bob' not in directory
+        assert len(directory) == 1
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from services.audio_clip import AudioClip
+from services.vad import detect_speech, frame_features
+
+
+def tone(seconds: float, amplitude: int = 8000, frequency: float = 220.0) -> np.ndarray:
+    t = np.arange(int(seconds * 16000)) / 16000
+    return (np.sin(2 * np.pi * frequency * t) * amplitude).astype(np.int16)
+
+
+def hiss(seconds: float, amplitude: int = 30) -> np.ndarray:
+    return (np.random.default_rng(1).standard_normal(int(seconds * 16000)) * amplitude).astype(np.int16)
+
+
+class TestVad:
+    def test_leading_and_trailing_silence_is_trimmed(self):
+        """Test that the trimmed clip spans the speech plus padding only"""
+        clip = AudioClip.from_pcm(np.concatenate([hiss(2), tone(3), hiss(4)]))
+        result = detect_speech(clip)
+
+        assert len(result.segments) == 1
+        start, end = result.segments[0]
+        assert 1.7 <= start <= 2.0
+        assert 5.0 <= end <= 5.3
+        assert abs(result.clip.duration_seconds - (end - start)) < 0.001
+        assert result.clip.offset_seconds == start
+
+    def test_long_pause_splits_segments_short_pause_does_not(self):
+        """Test that gaps under the minimum silence are bridged"""
+        samples = np.concatenate([hiss(1), tone(1), hiss(0.1), tone(1), hiss(1.5), tone(1), hiss(1)])
+        result = detect_speech(AudioClip.from_pcm(samples))
+
+        assert len(result.segments) == 2
+        assert [round(start, 1) for start, _ in result.segments] == [0.8, 4.4]
+        assert abs(result.speech_seconds - 3.9) < 0.05
+
+    def test_silence_only_keeps_original_clip(self):
+        """Test that a clip without speech is returned untouched"""
+        clip = AudioClip.from_pcm(hiss(3))
+        result = detect_speech(clip)
+
+        assert result.segments == []
+        assert result.clip is clip
+
+    def test_zero_pre_roll_does_not_lower_the_noise_floor(self):
+        """Test that digital silence before the take (mic warm-up) does not turn room noise into speech"""
+        take = np.concatenate([hiss(2), tone(3), hiss(2)])
+        without = detect_speech(AudioClip.from_pcm(take))
+        with_zeros = detect_speech(AudioClip.from_pcm(np.concatenate([np.zeros(16000, dtype=np.int16), take])))
+
+        assert len(with_zeros.segments) == 1
+        assert with_zeros.segments[0] == pytest.approx((without.segments[0][0] + 1, without.segments[0][1] + 1))
+
+    def test_digital_silence_only_has_no_speech(self):
+        """Test that an all-zero clip gives no segments"""
+        clip = AudioClip.from_pcm(np.zeros(16000, dtype=np.int16))
+
+        assert detect_speech(clip).segments == []
+
+    def test_zero_crossing_rate_is_high_for_noise(self):
+        """Test that broadband noise crosses zero far more often than a low tone"""
+        _, noise_zcr = frame_features(hiss(0.2, amplitude=2000), 16000)
+        _, tone_zcr = frame_features(tone(0.2), 16000)
+
+        assert noise_zcr.mean() > 0.4
+        assert tone_zcr.mean() < 0.05
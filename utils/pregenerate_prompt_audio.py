@@ -0,0 +1,27 @@
+import argparse
+import os
+import sys
+
+# Ensure the parent directory is in the path so we can import services
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.coda_db import table
+from services.prompt_audio import PROMPT_AUDIO_BATCH_SIZE, PROMPT_AUDIO_PROGRESS_PATH, PROMPT_AUDIO_WORKERS, PromptAudioJob
+from services.tts_generator import generate_audio
+
+# Synthesizes the audio of every prompt without an audio_url and saves the URLs in Coda.
+# Safe to interrupt: rerunning picks up from the progress file.
+#   python utils/pregenerate_prompt_audio.py --workers 3
+
+parser = argparse.ArgumentParser(description="Precompute prompt audio and write the URLs back to Coda")
+parser.add_argument("--workers", type=int, default=PROMPT_AUDIO_WORKERS)
+parser.add_argument("--batch-size", type=int, default=PROMPT_AUDIO_BATCH_SIZE)
+parser.add_argument("--progress", default=PROMPT_AUDIO_PROGRESS_PATH)
+args = parser.parse_args()
+
+job = PromptAudioJob(table, generate_audio, workers=args.workers, batch_size=args.batch_size,
+                     progress_path=args.progress)
+report = job.run()
+print(report.summary())
+for text, error in report.failed.items():
+    print(f"Failed: {text[:60]!r}: {error}")
@@ -0,0 +1,42 @@
+import streamlit as st
+import sys
+import os
+import time
+
+# Ensure the parent directory is in the path so we can import services
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.audio_clip import AudioClip
+from services.transcription_backends import OpenAIWhisperBackend, LocalWhisperBackend
+
+st.title("Transcription Backend Benchmark")
+
+model_size = st.selectbox("Local model", ["tiny", "base", "small", "medium", "large-v3"], index=2)
+compute_type = st.selectbox("Compute type", ["int8", "int8_float32", "float32"])
+beam_size = st.slider("Beam size", 1, 10, 5)
+audio_data = st.audio_input("Upload or record audio")
+
+if audio_data is not None:
+    clip = AudioClip.load(audio_data)
+    st.write(f"Recording: {clip.duration_seconds:.1f} seconds")
+
+    backends = [
+        OpenAIWhisperBackend(),
+        LocalWhisperBackend(model_size=model_size, compute_type=compute_type, beam_size=beam_size)
+    ]
+    for backend in backends:
+        # Load the local model before timing so only transcription is measured
+        if isinstance(backend, LocalWhisperBackend):
+            with st.spinner(f"Loading {model_size} ({compute_type})..."):
+                backend.model
+        start = time.perf_counter()
+        text = backend.transcribe(clip)
+        elapsed = time.perf_counter() - start
+
+        st.subheader(backend.name)
+        st.write(f"{elapsed:.2f} s ({elapsed / max(clip.duration_seconds, 0.01):.2f}x real time)")
+        if getattr(backend, 'last_report', None):
+            st.write(f"Upload: {backend.last_report.summary()}")
+        st.write(text if text is not None else "Transcription failed")
+else:
+    st.info("Please upload or record an audio file.")
@@ -0,0 +1,99 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+
+# Ensure the parent directory is in the path so we can import services
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Times the prompt audio pipeline end to end: the pre-generation job, learners fetching
+# cached prompts, and streamed synthesis of new prompts. With the default local backend
+# it runs entirely offline:
+#   python utils/tts_benchmark.py --prompts 50 --workers 8 --latency 0.3 --realtime-factor 0.2
+
+
+class InMemoryPromptTable:
+    """Stands in for the Coda prompts table: rows to scan and a place for the job to write URLs back."""
+
+    def __init__(self, texts):
+        self.rows = [{'text': text, 'audio_url': ""} for text in texts]
+        self.upserts = 0
+
+    def to_dict(self):
+        return self.rows
+
+    def upsert_rows(self, rows, key_columns=None):
+        self.upserts += 1
+        urls = {row[0].value_storage: row[1].value_storage for row in rows}
+        for row in self.rows:
+            row['audio_url'] = urls.get(row['text'], row['audio_url'])
+
+
+def report(label, count, elapsed, metrics):
+    ttfb = np.array([m.ttfb_seconds for m in metrics if m.ttfb_seconds is not None] or [0.0]) * 1000
+    total = np.array([m.total_seconds for m in metrics] or [0.0]) * 1000
+    print(f"{label}: {count} prompts in {elapsed:.2f} s ({count / elapsed:.1f}/s)")
+    print(f"  first byte p50 {np.percentile(ttfb, 50):.0f} ms, p95 {np.percentile(ttfb, 95):.0f} ms")
+    print(f"  total      p50 {np.percentile(total, 50):.0f} ms, p95 {np.percentile(total, 95):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prompt audio pipeline")
+    parser.add_argument("--backend", default="local")
+    parser.add_argument("--prompts", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.3, help="simulated first-byte latency (local backend)")
+    parser.add_argument("--realtime-factor", type=float, default=0.2, help="simulated synthesis speed (local backend)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # The shared TTS cache reads its location at import, so point it at a scratch directory first
+        os.environ["TTS_CACHE_DIR"] = os.path.join(directory, "audio")
+        os.environ["TTS_CACHE_INDEX_PATH"] = os.path.join(directory, "index.sqlite3")
+
+        from services.prompt_audio import PromptAudioJob
+        from services.tts_backends import LocalTTSBackend, get_tts_backend
+        from services.tts_cache import tts_cache
+        from services.tts_generator import generate_audio, stream_audio
+
+        if args.backend == "local":
+            backend = LocalTTSBackend(latency_seconds=args.latency, realtime_factor=args.realtime_factor)
+        else:
+            backend = get_tts_backend(args.backend)
+
+        texts = [f"Bonjour, je m'appelle Camille et voici la question numéro {i}. Qu'avez-vous fait hier soir ?"
+                 for i in range(args.prompts)]
+
+        # 1. Pre-generation job over a prompts table with no audio
+        table = InMemoryPromptTable(texts)
+        job = PromptAudioJob(table, partial(generate_audio, backend=backend), workers=args.workers,
+                             progress_path=os.path.join(directory, "progress.json"))
+        start = time.perf_counter()
+        result = job.run()
+        report("Pre-generation job", len(texts), time.perf_counter() - start, list(tts_cache.recent_metrics))
+        print(f"  {result.summary()}, {table.upserts} write-backs")
+
+        # 2. Learners fetching prompts that are already cached
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(partial(generate_audio, backend=backend), texts))
+        report("Cached prompts", len(texts), time.perf_counter() - start, list(tts_cache.recent_metrics)[-len(texts):])
+
+        # 3. New prompts streamed to the player while they are synthesized
+        new_texts = [text.replace("question", "nouvelle question") for text in texts]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(lambda text: b"".join(stream_audio(text, backend=backend)), new_texts))
+        report("Streamed synthesis", len(new_texts), time.perf_counter() - start,
+               list(tts_cache.recent_metrics)[-len(new_texts):])
+
+        print(tts_cache.stats())
+
+
+if __name__ == "__main__":
+    main()